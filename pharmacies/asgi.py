@@ -14,3 +14,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pharmacies.settings')
 
 application = get_asgi_application()
+
+# Refuse to start the async API (PHARMACY_API_MODE) without a usable Motor, rather than failing its requests.
+# Then connect the worker to MongoDB before its first request (PHARMACY_MONGO_WARM_UP), once the apps are loaded.
+from pharmacy.mongo import check_api_mode, warm_up_worker  # noqa: E402
+
+check_api_mode()
+warm_up_worker()
@@ -39,11 +39,14 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "rest_framework.authtoken",
     "pharmacy",
     "drf_spectacular",
 ]
 
 MIDDLEWARE = [
+    "pharmacy.middleware.PharmacyMetricsMiddleware",
+    "pharmacy.middleware.PharmacyQueryProfilerMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -77,14 +80,76 @@ WSGI_APPLICATION = "pharmacies.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+
+def optional(cast):
+    """Cast an optional setting, leaving it `None` (the driver default) when it is empty or unset."""
+
+    return lambda value: cast(value) if value not in (None, "") else None
+
+
+def write_concern(value):
+    """Cast a write concern: a number of members (`"1"`) or a tag name (`"majority"`)."""
+
+    return int(value) if value.isdigit() else value
+
+
+# Options of the process-wide PyMongo client djongo creates (and of the Motor clients of the async API);
+# unset options keep the driver defaults. Compressors need their packages (zstandard, python-snappy).
+MONGO_CLIENT = {
+    option: value
+    for option, value in {
+        "host": decouple_config("MONGO_HOST", default="localhost"),
+        "appname": decouple_config("MONGO_APP_NAME", default="pharmacies"),
+        "maxPoolSize": decouple_config("MONGO_MAX_POOL_SIZE", default=None, cast=optional(int)),
+        "minPoolSize": decouple_config("MONGO_MIN_POOL_SIZE", default=None, cast=optional(int)),
+        "maxIdleTimeMS": decouple_config("MONGO_MAX_IDLE_TIME_MS", default=None, cast=optional(int)),
+        "waitQueueTimeoutMS": decouple_config("MONGO_WAIT_QUEUE_TIMEOUT_MS", default=None, cast=optional(int)),
+        "connectTimeoutMS": decouple_config("MONGO_CONNECT_TIMEOUT_MS", default=None, cast=optional(int)),
+        "socketTimeoutMS": decouple_config("MONGO_SOCKET_TIMEOUT_MS", default=None, cast=optional(int)),
+        "serverSelectionTimeoutMS": decouple_config(
+            "MONGO_SERVER_SELECTION_TIMEOUT_MS", default=None, cast=optional(int)
+        ),
+        "compressors": decouple_config("MONGO_COMPRESSORS", default=""),
+        "w": decouple_config("MONGO_W", default=None, cast=optional(write_concern)),
+    }.items()
+    if value not in (None, "")
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "djongo",
         "NAME": decouple_config("MONGO_DB"),
+        "CLIENT": MONGO_CLIENT,
+        # djongo shares one MongoClient per process, which closing the connection at the end of every request
+        # (CONN_MAX_AGE=0) would tear down and reconnect; keep it open for the life of the process by default.
+        "CONN_MAX_AGE": decouple_config("MONGO_CONN_MAX_AGE", default=None, cast=optional(int)),
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": decouple_config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": decouple_config("CACHE_LOCATION", default="pharmacies"),
+        "TIMEOUT": decouple_config("CACHE_TIMEOUT", default=300, cast=int),
+    }
+}
+if CACHES["default"]["BACKEND"].endswith("LocMemCache"):
+    # Least recently used entries are culled once the local-memory cache is full.
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": decouple_config("CACHE_MAX_ENTRIES", default=10000, cast=int)}
+
+# Authentication tokens are always cached in process, see pharmacy.authentication.
+CACHES["auth_tokens"] = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "auth-tokens",
+    "TIMEOUT": decouple_config("AUTH_TOKEN_CACHE_TIMEOUT", default=60, cast=int),
+    "OPTIONS": {"MAX_ENTRIES": decouple_config("AUTH_TOKEN_CACHE_MAX_ENTRIES", default=10000, cast=int)},
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -126,10 +191,15 @@ STATIC_URL = "static/"
 
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "pharmacy.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "pharmacy.pagination.PharmacyPageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.BasicAuthentication",
+        "pharmacy.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
@@ -140,3 +210,83 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+
+# OpenAPI schema generated by the pharmacy_schema command and served from memory (generated per request in DEBUG).
+PHARMACY_SCHEMA_FILE = decouple_config("PHARMACY_SCHEMA_FILE", default=str(BASE_DIR / "openapi.json"))
+
+
+# Pharmacy API
+
+# "async" serves the pharmacy list/detail routes with async views reading through Motor
+# (run under an ASGI server), "sync" with the DRF viewset.
+PHARMACY_API_MODE = decouple_config("PHARMACY_API_MODE", default="sync")
+
+# Backend of the list/retrieve reads: "mongo" reads documents through PyMongo directly,
+# "orm" goes through djongo (kept for parity testing).
+PHARMACY_READ_BACKEND = decouple_config("PHARMACY_READ_BACKEND", default="mongo")
+
+# Read preference of the native list/retrieve/export reads ("primary", "secondaryPreferred", ...). Secondary reads
+# can lag behind writes, so they are never put in the response cache; writes, the reads they depend on and the
+# version checks of conditional requests always use the primary.
+PHARMACY_READ_PREFERENCE = decouple_config("PHARMACY_READ_PREFERENCE", default="primary")
+
+# Record per-route request metrics (exposed on /metrics) and send them in a Server-Timing response header.
+PHARMACY_METRICS = decouple_config("PHARMACY_METRICS", default=True, cast=bool)
+PHARMACY_SERVER_TIMING = decouple_config("PHARMACY_SERVER_TIMING", default=True, cast=bool)
+
+# Explain (with executionStats) the MongoDB commands of requests taking at least this many milliseconds,
+# and a random share of the others, then log them and keep them for the pharmacy_slow_queries command.
+PHARMACY_SLOW_QUERY_MS = decouple_config("PHARMACY_SLOW_QUERY_MS", default=None, cast=optional(int))
+PHARMACY_SLOW_QUERY_SAMPLE_RATE = decouple_config("PHARMACY_SLOW_QUERY_SAMPLE_RATE", default=0.0, cast=float)
+
+# Requests allowed per user as token buckets ("N/period", e.g. "600/min": bursts of N, refilled over the period),
+# for reads and writes separately; unlimited when empty. The buckets are kept in the
+# PHARMACY_THROTTLE_CACHE_ALIAS cache, shared by the processes if it is a shared cache (e.g. Redis).
+PHARMACY_THROTTLE_READ_RATE = decouple_config("PHARMACY_THROTTLE_READ_RATE", default="")
+PHARMACY_THROTTLE_WRITE_RATE = decouple_config("PHARMACY_THROTTLE_WRITE_RATE", default="")
+PHARMACY_THROTTLE_CACHE_ALIAS = "default"
+
+# Maximum number of reads and writes served at once by a process (unlimited when unset); keep their sum within
+# MONGO_MAX_POOL_SIZE. Excess requests wait up to PHARMACY_ADMISSION_TIMEOUT seconds for a slot, then are shed
+# with a 503 asking to retry after PHARMACY_OVERLOAD_RETRY_AFTER seconds.
+PHARMACY_MAX_CONCURRENT_READS = decouple_config("PHARMACY_MAX_CONCURRENT_READS", default=None, cast=optional(int))
+PHARMACY_MAX_CONCURRENT_WRITES = decouple_config("PHARMACY_MAX_CONCURRENT_WRITES", default=None, cast=optional(int))
+PHARMACY_ADMISSION_TIMEOUT = decouple_config("PHARMACY_ADMISSION_TIMEOUT", default=0.1, cast=float)
+PHARMACY_OVERLOAD_RETRY_AFTER = decouple_config("PHARMACY_OVERLOAD_RETRY_AFTER", default=1, cast=int)
+
+# Connect a server worker to MongoDB when its WSGI/ASGI application is loaded, so its first request does not pay for
+# it (management commands never do); an unreachable server is logged without failing the startup. Leave it disabled
+# when the application is loaded before forking (gunicorn --preload).
+PHARMACY_MONGO_WARM_UP = decouple_config("PHARMACY_MONGO_WARM_UP", default=False, cast=bool)
+
+# Seconds a filtered pharmacy list count is cached before it is recomputed.
+PHARMACY_COUNT_CACHE_TIMEOUT = decouple_config("PHARMACY_COUNT_CACHE_TIMEOUT", default=60, cast=int)
+
+# Cache list pages and pharmacy details in the PHARMACY_RESPONSE_CACHE_ALIAS cache.
+PHARMACY_RESPONSE_CACHE = decouple_config("PHARMACY_RESPONSE_CACHE", default=True, cast=bool)
+PHARMACY_RESPONSE_CACHE_ALIAS = "default"
+PHARMACY_RESPONSE_CACHE_TIMEOUT = decouple_config("PHARMACY_RESPONSE_CACHE_TIMEOUT", default=300, cast=int)
+
+# Maximum number of pharmacies accepted by a bulk request, and written per database command.
+PHARMACY_BULK_MAX_ITEMS = decouple_config("PHARMACY_BULK_MAX_ITEMS", default=10000, cast=int)
+PHARMACY_BULK_BATCH_SIZE = decouple_config("PHARMACY_BULK_BATCH_SIZE", default=1000, cast=int)
+
+# Maximum number of ids of a batch lookup (POST /pharmacies/lookup/).
+PHARMACY_LOOKUP_MAX_IDS = decouple_config("PHARMACY_LOOKUP_MAX_IDS", default=200, cast=int)
+
+# Number of pharmacies fetched per database round trip by the streaming export.
+PHARMACY_EXPORT_BATCH_SIZE = decouple_config("PHARMACY_EXPORT_BATCH_SIZE", default=1000, cast=int)
+
+# Accept basic authentication (a password hash check per request) besides token authentication.
+PHARMACY_BASIC_AUTHENTICATION = decouple_config("PHARMACY_BASIC_AUTHENTICATION", default=True, cast=bool)
+
+# Dotted path of the geocoder class (a pharmacy.geocoding.BaseGeocoder) used by the pharmacy_geocode command.
+PHARMACY_GEOCODER = decouple_config("PHARMACY_GEOCODER", default="pharmacy.geocoding.NominatimGeocoder")
+
+# Seconds the change feed lags behind the current time, so writes stamped before they commit are not skipped.
+PHARMACY_CHANGES_DELAY = decouple_config("PHARMACY_CHANGES_DELAY", default=1.0, cast=float)
+
+# Days the tombstones of deleted pharmacies are kept for the change feed; older tokens must sync again. The
+# tombstones are deleted by a TTL index created by the migrations with this retention: update the index (collMod)
+# after changing it.
+PHARMACY_CHANGES_RETENTION_DAYS = decouple_config("PHARMACY_CHANGES_RETENTION_DAYS", default=30, cast=int)
@@ -0,0 +1,32 @@
+"""
+API-only settings of the pharmacies project.
+
+Serve the API with `DJANGO_SETTINGS_MODULE=pharmacies.settings_api`: the pharmacy API
+authenticates every request with basic or token credentials and renders JSON, so the
+admin, sessions, messages and CSRF checks, and the template context processors
+(needed by the admin) are left out of the request path. The pharmacy routes, the token,
+metrics and schema routes, and the browsable API behave as with `pharmacies.settings`.
+
+Manage users with `python manage.py createsuperuser`/`changepassword` instead of the admin.
+"""
+from .settings import *  # noqa: F401, F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+# Apps and middleware only used by the admin and by cookie-authenticated HTML pages.
+UNUSED_APPS = ("django.contrib.admin", "django.contrib.sessions", "django.contrib.messages")
+UNUSED_MIDDLEWARE = (
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in UNUSED_MIDDLEWARE]
+
+ROOT_URLCONF = "pharmacies.urls_api"
+
+# The browsable API and the Swagger/Redoc pages pass their own context, so no context processor is needed.
+TEMPLATES = [{**TEMPLATES[0], "OPTIONS": {**TEMPLATES[0]["OPTIONS"], "context_processors": []}}]
@@ -0,0 +1,26 @@
+"""
+URL configuration of the API: the pharmacy, token, metrics and schema routes.
+
+It is the `ROOT_URLCONF` of the API-only settings (`pharmacies.settings_api`), and
+`pharmacies.urls` adds the admin to it.
+"""
+from django.urls import include, path
+from rest_framework.authtoken.views import obtain_auth_token
+
+from pharmacy.metrics import metrics_view
+from pharmacy.schema import lazy_view, schema_view
+
+urlpatterns = [
+    path("", include("pharmacy.urls")),
+    path("api/token/", obtain_auth_token, name="api-token"),
+    path("metrics", metrics_view, name="metrics"),
+    # drf-spectacular, imported on the first request of its views.
+    path("api/schema/", schema_view, name="schema"),
+    # Optional UI:
+    path(
+        "api/schema/swagger-ui/",
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
+        name="swagger-ui",
+    ),
+    path("api/schema/redoc/", lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"), name="redoc"),
+]
@@ -1,5 +1,22 @@
 from django.apps import AppConfig
+from django.conf import settings
+from pymongo import monitoring
 
 
 class PharmacyConfig(AppConfig):
     name = "pharmacy"
+    listener_registered = False
+    profiler_registered = False
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from .metrics import MongoCommandListener
+        from .profiling import QueryProfiler, is_profiling_enabled
+
+        if settings.PHARMACY_METRICS and not self.listener_registered:
+            # Listeners only apply to the clients created after them, so register before any connection.
+            monitoring.register(MongoCommandListener())
+            PharmacyConfig.listener_registered = True
+        if is_profiling_enabled() and not self.profiler_registered:
+            monitoring.register(QueryProfiler())
+            PharmacyConfig.profiler_registered = True
@@ -0,0 +1,396 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from pymongo.errors import DuplicateKeyError
+from rest_framework import exceptions, status
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .authentication import CachedTokenAuthentication
+from .caching import PharmacyResponseCache
+from .conditional import (
+    PreconditionFailed,
+    evaluate_preconditions,
+    get_if_match_versions,
+    get_list_etag,
+    get_validators,
+    set_validators,
+)
+from .counts import PharmacyCountProvider
+from .mongo import get_async_collection
+from .pagination import PharmacyCursorPagination, PharmacyPageNumberPagination
+from .repositories import NAME_FILTERS_ERROR, AsyncPharmacyRepository
+from .serializers import PharmacyFastSerializer, PharmacySerializer
+from .throttling import PharmacyRateThrottle, admit, get_scope
+
+
+class AsyncPharmacyAPIView(View):
+    """Base of the async (ASGI) pharmacy views.
+
+    They serve the same URLs and payloads as the CRUD actions of `PharmacyViewSet`,
+    but every database call is awaited on the event loop through Motor instead of
+    blocking a worker thread. DRF's request cycle is synchronous, so these are plain
+    Django async views reusing its authenticators, serializer and renderer:
+
+    - Authentication (a password hash check or a token lookup on a cache miss) runs
+      in a thread with `sync_to_async`.
+    - Validation uses `PharmacySerializer` and rendering `PharmacyFastSerializer`,
+      neither of which queries the database.
+    - Requests are throttled by `PharmacyRateThrottle` and admitted under the same
+      concurrency limits, without waiting for a slot so the event loop is never blocked.
+    - Errors are rendered as DRF renders them (`{"detail": ...}` or field errors).
+    - Responses carry the same `ETag`/`Last-Modified` validators and honor the same
+      conditional headers (`If-None-Match`, `If-Modified-Since`, `If-Match`).
+    """
+
+    authentication_classes = [BasicAuthentication, CachedTokenAuthentication]
+    throttle_classes = [PharmacyRateThrottle]
+    renderer_class = api_settings.DEFAULT_RENDERER_CLASSES[0]
+    serializer_class = PharmacySerializer
+    read_serializer_class = PharmacyFastSerializer
+    repository_class = AsyncPharmacyRepository
+    count_provider_class = PharmacyCountProvider
+    response_cache_class = PharmacyResponseCache
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Like DRF views, these views do not authenticate with session cookies, so CSRF checks do not apply.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await self.authenticate(request)
+            self.check_throttles(request)
+            admission = admit(get_scope(request, self), timeout=0)
+            try:
+                return await super().dispatch(request, *args, **kwargs)
+            finally:
+                if admission is not None:
+                    admission.release()
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    def get_authenticators(self):
+        """Instantiate the authenticators, leaving basic authentication out when it is disabled.
+
+        Returns:
+        - list: The authenticators of the view.
+        """
+
+        authenticators = [authentication_class() for authentication_class in self.authentication_classes]
+        if not settings.PHARMACY_BASIC_AUTHENTICATION:
+            authenticators = [
+                authenticator for authenticator in authenticators if not isinstance(authenticator, BasicAuthentication)
+            ]
+        return authenticators
+
+    async def authenticate(self, request):
+        """Authenticate the request with the first authenticator accepting its credentials.
+
+        Returns:
+        - User: The authenticated user.
+
+        Raises:
+        - NotAuthenticated: If no credentials were provided.
+        - AuthenticationFailed: If the credentials are invalid.
+        """
+
+        user = await sync_to_async(self._authenticate)(Request(request))
+        if user is None:
+            raise exceptions.NotAuthenticated()
+        return user
+
+    def _authenticate(self, request):
+        for authenticator in self.get_authenticators():
+            user_auth_tuple = authenticator.authenticate(request)
+            if user_auth_tuple is not None:
+                return user_auth_tuple[0]
+        return None
+
+    def check_throttles(self, request):
+        """Check the request against the throttles of the view.
+
+        Raises:
+        - Throttled: If a throttle rejects the request, with the longest wait of the rejecting throttles.
+        """
+
+        waits = []
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not throttle.allow_request(request, self):
+                waits.append(throttle.wait())
+        if waits:
+            raise exceptions.Throttled(max(waits))
+
+    def handle_exception(self, exc):
+        """Render an API exception as DRF's exception handler does."""
+
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticators = self.get_authenticators()
+            if authenticators:
+                response["WWW-Authenticate"] = authenticators[0].authenticate_header(Request(self.request))
+        if getattr(exc, "wait", None):
+            response["Retry-After"] = "%d" % exc.wait
+        return response
+
+    def render(self, data, status=status.HTTP_200_OK):
+        renderer = self.renderer_class()
+        return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+    def get_data(self, request):
+        """Parse the JSON body of the request.
+
+        Raises:
+        - ParseError: If the body is not valid JSON.
+        """
+
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as error:
+            raise exceptions.ParseError(f"JSON parse error - {error}")
+
+    def get_pk(self, pk):
+        """Convert the primary key of the URL.
+
+        Raises:
+        - NotFound: If the primary key is not an integer.
+        """
+
+        try:
+            return int(pk)
+        except (TypeError, ValueError):
+            raise exceptions.NotFound()
+
+    def get_requested_fields(self, request):
+        """Get the fields requested by the `fields` parameter, like `PharmacyViewSet.get_requested_fields()`.
+
+        Returns:
+        - tuple: The names of the fields to render and the model fields to read, or `(None, None)` for all.
+
+        Raises:
+        - ValidationError: If a requested field does not exist.
+        """
+
+        fields = self.read_serializer_class.parse_fields(request.GET.get("fields"))
+        if fields is None:
+            return None, None
+        return fields, [*self.read_serializer_class.get_sources(fields), "version", "updated_at"]
+
+    def get_read_repository(self):
+        """Get the repository of the list and retrieve reads, on the `PHARMACY_READ_PREFERENCE` members.
+
+        Returns:
+        - AsyncPharmacyRepository: The repository.
+        """
+
+        model = self.repository_class.model
+        return self.repository_class(get_async_collection(model, read_preference=settings.PHARMACY_READ_PREFERENCE))
+
+    def validate(self, data, partial=False):
+        serializer = self.serializer_class(data=data, partial=partial)
+        if not serializer.is_valid():
+            raise exceptions.ValidationError(serializer.errors)
+        return serializer.validated_data
+
+    def get_duplicate_error(self):
+        message = self.serializer_class().error_messages["duplicate_license_number"]
+        return exceptions.ValidationError({"license_number": [message]}, code="unique")
+
+    async def invalidate_response_cache(self, *pks):
+        """Invalidate the responses cached by the synchronous views sharing the cache."""
+
+        if self.response_cache_class is not None and settings.PHARMACY_RESPONSE_CACHE:
+            await self.response_cache_class().ainvalidate(*pks)
+
+
+class AsyncPharmacyListView(AsyncPharmacyAPIView):
+    """List (GET /pharmacies/) and create (POST /pharmacies/) pharmacies asynchronously.
+
+    The list is paginated like `PharmacyViewSet.list`, with the same `name`, `name__startswith`,
+    `q`, `fields`, `page`, `page_size`, `pagination` and `cursor` parameters and the same responses:
+    page numbers with a count by default, or keyset cursor pages without a count.
+    """
+
+    pagination_class = PharmacyPageNumberPagination
+    cursor_pagination_class = PharmacyCursorPagination
+
+    def get_page_number(self, request, count, page_size):
+        """Get the requested page number, resolving `last` to the last page.
+
+        Raises:
+        - NotFound: If the page number is not a positive integer or is past the last page.
+        """
+
+        page_number = request.GET.get(self.pagination_class.page_query_param, "1")
+        last_page = max((count + page_size - 1) // page_size, 1)
+        if page_number in self.pagination_class.last_page_strings:
+            return last_page
+        if not page_number.isdigit() or not 1 <= int(page_number) <= last_page:
+            raise exceptions.NotFound(self.pagination_class.invalid_page_message.format(page_number=page_number))
+        return int(page_number)
+
+    def get_page_link(self, request, page_number):
+        url = request.build_absolute_uri()
+        if page_number == 1:
+            return remove_query_param(url, self.pagination_class.page_query_param)
+        return replace_query_param(url, self.pagination_class.page_query_param, page_number)
+
+    def uses_cursor_pagination(self, request):
+        """Check whether the client asks for cursor pagination, like `PharmacyViewSet.get_pagination_class()`.
+
+        Returns:
+        - bool: `True` with `?pagination=cursor` or a cursor (`?cursor=...`).
+        """
+
+        return (
+            request.GET.get("pagination") == "cursor" or self.cursor_pagination_class.cursor_query_param in request.GET
+        )
+
+    async def get(self, request):
+        name = request.GET.get("name")
+        if name and request.GET.get("name__startswith"):
+            raise exceptions.ValidationError({"name__startswith": [NAME_FILTERS_ERROR]})
+        filters = {"name": name, "name_prefix": request.GET.get("name__startswith"), "search": request.GET.get("q")}
+        fields, sources = self.get_requested_fields(request)
+        repository = self.get_read_repository()
+        if self.uses_cursor_pagination(request):
+            data = await self.get_cursor_page(request, repository.get_documents(**filters, fields=sources))
+        else:
+            data = await self.get_number_page(request, repository, filters, sources)
+        data["results"] = self.read_serializer_class(data["results"], many=True, fields=fields).data
+        etag = get_list_etag(data)
+        return evaluate_preconditions(request, etag) or set_validators(self.render(data), etag)
+
+    async def get_number_page(self, request, repository, filters, sources):
+        """Read a page-number page, with the total count of the documents.
+
+        Returns:
+        - dict: The `count`, `count_exact`, `next` and `previous` links, and the `results` documents.
+
+        Raises:
+        - NotFound: If the page does not exist.
+        """
+
+        page_size = self.pagination_class().get_page_size(Request(request))
+        count, count_exact = await self.count_provider_class().acount(
+            name=filters["name"], documents=repository.get_documents(**filters)
+        )
+        page_number = self.get_page_number(request, count, page_size)
+
+        documents = await repository.find(
+            **filters, fields=sources, skip=(page_number - 1) * page_size, limit=page_size
+        )
+        return {
+            "count": count,
+            "count_exact": count_exact,
+            "next": self.get_page_link(request, page_number + 1) if page_number * page_size < count else None,
+            "previous": self.get_page_link(request, page_number - 1) if page_number > 1 else None,
+            "results": documents,
+        }
+
+    async def get_cursor_page(self, request, documents):
+        """Read a cursor page with a single range query on `id` (or `(name, id)`), without a count.
+
+        Returns:
+        - dict: The `next` and `previous` links and the `results` documents.
+
+        Raises:
+        - NotFound: If the cursor is invalid.
+        """
+
+        paginator = self.cursor_pagination_class()
+        documents = paginator.get_page_queryset(documents, Request(request))
+        page = paginator.set_page(await documents._get_cursor().to_list(length=None))
+        return {"next": paginator.get_next_link(), "previous": paginator.get_previous_link(), "results": page}
+
+    async def post(self, request):
+        values = self.validate(self.get_data(request))
+        try:
+            document = await self.repository_class().insert_one(values)
+        except DuplicateKeyError:
+            raise self.get_duplicate_error()
+
+        await self.count_provider_class().aadjust(document["name"], 1)
+        await self.invalidate_response_cache()
+        response = self.render(self.read_serializer_class(document).data, status=status.HTTP_201_CREATED)
+        return set_validators(response, *get_validators(document))
+
+
+class AsyncPharmacyDetailView(AsyncPharmacyAPIView):
+    """Retrieve, update (PUT/PATCH, both partial) and delete a pharmacy (/pharmacies/{pk}/) asynchronously."""
+
+    async def get(self, request, pk):
+        pk = self.get_pk(pk)
+        fields, sources = self.get_requested_fields(request)
+        repository = self.get_read_repository()
+        if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+            # The version is read from the primary, as a lagging secondary would answer 304 for a changed pharmacy.
+            current = await self.repository_class().get_version(pk)
+            if current is not None:
+                not_modified = evaluate_preconditions(request, *get_validators(current, fields))
+                if not_modified is not None:
+                    return not_modified
+
+        document = await repository.find_one(pk, fields=sources)
+        if document is None:
+            raise exceptions.NotFound()
+        response = self.render(self.read_serializer_class(document, fields=fields).data)
+        return set_validators(response, *get_validators(document, fields))
+
+    async def put(self, request, pk):
+        pk = self.get_pk(pk)
+        repository = self.repository_class()
+        versions = get_if_match_versions(request, pk)
+        serializer = self.serializer_class(data=self.get_data(request), partial=True)
+        if not serializer.is_valid():
+            # A missing pharmacy, then a failed If-Match, are reported before invalid data, as the sync view does.
+            await self.check_version(repository, pk, versions)
+            raise exceptions.ValidationError(serializer.errors)
+
+        try:
+            previous, document = await repository.update_one(
+                pk, dict(serializer.validated_data), expected_versions=versions
+            )
+        except DuplicateKeyError:
+            raise self.get_duplicate_error()
+        if document is None:
+            await self.check_version(repository, pk, versions)
+            # The pharmacy changed (or was deleted) since the update missed it.
+            raise PreconditionFailed() if versions is not None else exceptions.NotFound()
+
+        if document["name"] != previous["name"]:
+            count_provider = self.count_provider_class()
+            await count_provider.aadjust(previous["name"], -1)
+            await count_provider.aadjust(document["name"], 1)
+        await self.invalidate_response_cache(pk)
+        return set_validators(self.render(self.read_serializer_class(document).data), *get_validators(document))
+
+    patch = put
+
+    async def check_version(self, repository, pk, versions):
+        """Check a pharmacy exists and has one of the `If-Match` versions, like `PharmacyViewSet.check_version()`."""
+
+        current = await repository.get_version(pk)
+        if current is None:
+            raise exceptions.NotFound()
+        if versions is not None and current["version"] not in versions:
+            raise PreconditionFailed()
+
+    async def delete(self, request, pk):
+        pk = self.get_pk(pk)
+        document = await self.repository_class().delete_one(pk)
+        if document is None:
+            raise exceptions.NotFound()
+
+        await self.count_provider_class().aadjust(document["name"], -1)
+        await self.invalidate_response_cache(pk)
+        return self.render({"message": "Pharmacy object deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
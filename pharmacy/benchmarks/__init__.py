@@ -0,0 +1 @@
+"""Seeding and load-testing helpers behind the `pharmacy_benchmark` management command."""
@@ -0,0 +1,86 @@
+import os
+import statistics
+import subprocess
+import sys
+
+# Code run in a fresh interpreter to time the import of a module (and of the URLconf).
+IMPORT_SCRIPT = """
+import sys
+from time import perf_counter
+
+start = perf_counter()
+__import__(sys.argv[1])
+if sys.argv[2] == "1":
+    from django.conf import settings
+    __import__(settings.ROOT_URLCONF)
+print(perf_counter() - start)
+"""
+
+
+def parse_import_times(lines):
+    """Parse the report of `python -X importtime`.
+
+    Parameters:
+    - lines (iterable): The lines written to stderr.
+
+    Returns:
+    - list: A `(module, self_us, cumulative_us)` tuple per imported module, in import order.
+    """
+
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # The header line.
+            continue
+        imports.append((module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def group_by_package(imports):
+    """Sum the self import time of the modules of every top-level package.
+
+    Parameters:
+    - imports (list): The `(module, self_us, cumulative_us)` tuples of `parse_import_times()`.
+
+    Returns:
+    - list: `(package, self_us, modules)` tuples, slowest first.
+    """
+
+    packages = {}
+    for module, self_us, _ in imports:
+        package = module.partition(".")[0]
+        total, count = packages.get(package, (0, 0))
+        packages[package] = (total + self_us, count + 1)
+    return sorted(((package, total, count) for package, (total, count) in packages.items()), key=lambda row: -row[1])
+
+
+def measure_imports(module, include_urls=False, runs=3):
+    """Measure the import of a module in fresh interpreters, as a worker boots.
+
+    Parameters:
+    - module (str): The module to import, e.g. `"pharmacies.wsgi"`.
+    - include_urls (bool): Also import the `ROOT_URLCONF`, as the first request of a worker does.
+    - runs (int): The number of interpreters to time; the imports of the last one are reported.
+
+    Returns:
+    - dict: The `wall_ms` median, the `wall_runs_ms` of every run and the `imports` of the last run.
+
+    Raises:
+    - RuntimeError: If the import fails.
+    """
+
+    command = [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT, module, "1" if include_urls else "0"]
+    walls = []
+    for _ in range(runs):
+        result = subprocess.run(command, capture_output=True, text=True, env=dict(os.environ))
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "Import failed.")
+        walls.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return {
+        "wall_ms": statistics.median(walls),
+        "wall_runs_ms": walls,
+        "imports": parse_import_times(result.stderr.splitlines()),
+    }
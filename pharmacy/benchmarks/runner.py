@@ -0,0 +1,192 @@
+import math
+import random
+from time import perf_counter
+
+from django.urls import reverse
+
+from .seeding import build_pharmacy_data
+
+
+def percentile(values, percent):
+    """Compute a percentile with linear interpolation between the closest ranks.
+
+    Parameters:
+    - values (list): The sorted values.
+    - percent (float): The percentile, between 0 and 100.
+
+    Returns:
+    - float: The percentile of the values.
+    """
+
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * percent / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def summarize(latencies, elapsed, errors):
+    """Summarize the latencies of a scenario.
+
+    Parameters:
+    - latencies (list): The latency of every request, in seconds.
+    - elapsed (float): The wall time of all the requests, in seconds.
+    - errors (int): The number of requests with an unexpected status code.
+
+    Returns:
+    - dict: The number of requests and errors, the throughput (req/s) and the latency percentiles (ms).
+    """
+
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "min": round(latencies[0], 3) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p90": round(percentile(latencies, 90), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+    }
+
+
+class BenchmarkRunner:
+    """Run the pharmacy API scenarios through an in-process API client.
+
+    Every scenario sends `requests` requests after `warmup` untimed ones and
+    reports its latency percentiles and throughput. Requests go through the full
+    Django stack (middleware, authentication, views, serializers and database)
+    without a network hop, so results compare the code paths rather than servers.
+
+    Parameters:
+    - client (APIClient): An authenticated API client.
+    - ids (list): The primary keys of the seeded pharmacies.
+    - names (list): The names of the seeded pharmacies.
+    - total (int): The number of pharmacies in the collection.
+    - requests (int): The number of timed requests per scenario.
+    - page_size (int): The page size of the list scenarios.
+    - warmup (int): The number of untimed requests per scenario.
+    - seed (int): The seed of the random pharmacy choices.
+    """
+
+    scenarios = (
+        "list",
+        "list_deep",
+        "list_name",
+        "list_name_deep",
+        "list_fields",
+        "retrieve",
+        "create",
+        "update",
+    )
+
+    def __init__(self, client, ids, names, total, requests=200, page_size=10, warmup=5, seed=0):
+        self.client = client
+        self.ids = ids
+        self.names = names
+        self.total = total
+        self.requests = requests
+        self.page_size = page_size
+        self.warmup = warmup
+        self.random = random.Random(seed)
+
+    def get_last_page(self, count):
+        return max(math.ceil(count / self.page_size), 1)
+
+    def get_list_url(self, page=1, name=None, fields=None):
+        url = f"{reverse('pharmacy-list')}?page={page}&page_size={self.page_size}"
+        if name:
+            url += f"&name={name}"
+        if fields:
+            url += f"&fields={fields}"
+        return url
+
+    def get_detail_url(self):
+        return reverse("pharmacy-detail", kwargs={"pk": self.random.choice(self.ids)})
+
+    def list(self):
+        return self.client.get(self.get_list_url()), 200
+
+    def list_deep(self):
+        return self.client.get(self.get_list_url(page=self.get_last_page(self.total))), 200
+
+    def list_name(self):
+        return self.client.get(self.get_list_url(name=self.names[0])), 200
+
+    def list_name_deep(self):
+        page = self.get_last_page(math.ceil(len(self.ids) / len(self.names)))
+        return self.client.get(self.get_list_url(page=page, name=self.names[0])), 200
+
+    def list_fields(self):
+        return self.client.get(self.get_list_url(fields="id,name")), 200
+
+    def retrieve(self):
+        return self.client.get(self.get_detail_url()), 200
+
+    def create(self):
+        return self.client.post(reverse("pharmacy-list"), build_pharmacy_data(self.names[-1]), format="json"), 201
+
+    def update(self):
+        data = {"phone_number": f"555-{self.random.randrange(10000):04d}"}
+        return self.client.put(self.get_detail_url(), data, format="json"), 200
+
+    def run_scenario(self, name):
+        """Run a scenario.
+
+        Returns:
+        - dict: The summary of the scenario (see `summarize()`).
+        """
+
+        send = getattr(self, name)
+        for _ in range(self.warmup):
+            send()
+
+        latencies = []
+        errors = 0
+        start = perf_counter()
+        for _ in range(self.requests):
+            request_start = perf_counter()
+            response, expected_status = send()
+            latencies.append(perf_counter() - request_start)
+            errors += response.status_code != expected_status
+        return summarize(latencies, perf_counter() - start, errors)
+
+    def run(self, scenarios=None):
+        """Run scenarios in order.
+
+        Parameters:
+        - scenarios (list): The scenarios to run, all of them by default.
+
+        Returns:
+        - dict: The summary of every scenario by name.
+        """
+
+        return {name: self.run_scenario(name) for name in scenarios or self.scenarios}
+
+
+def compare(results, baseline, threshold=10.0):
+    """Compare the scenarios of a run with a baseline run.
+
+    Parameters:
+    - results (dict): The scenario summaries of the run.
+    - baseline (dict): The scenario summaries of the baseline run.
+    - threshold (float): The p50/p95 latency increase, in percent, reported as a regression.
+
+    Returns:
+    - list: A `(scenario, metric, baseline, current, change_percent, regression)` row per compared metric.
+    """
+
+    rows = []
+    for name, summary in results.items():
+        if name not in baseline:
+            continue
+        for metric in ("p50", "p95"):
+            before = baseline[name]["latency_ms"][metric]
+            after = summary["latency_ms"][metric]
+            change = (after - before) / before * 100 if before else 0.0
+            rows.append((name, metric, before, after, round(change, 1), change > threshold))
+    return rows
@@ -0,0 +1,107 @@
+from itertools import cycle
+from uuid import uuid4
+
+from django.conf import settings
+
+from pharmacy.caching import PharmacyResponseCache
+from pharmacy.counts import PharmacyCountProvider
+from pharmacy.repositories import PharmacyRepository
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+# Prefix of the license numbers of benchmark pharmacies, used to delete them after a run.
+LICENSE_NUMBER_PREFIX = "benchmark-"
+
+# Number of distinct Faker records generated and cycled through by the seeder.
+SAMPLE_SIZE = 1000
+
+
+def get_benchmark_names(count):
+    """Get the pool of names given to seeded pharmacies.
+
+    Parameters:
+    - count (int): The number of distinct names.
+
+    Returns:
+    - list: The names, so that filtering by one of them matches about `size / count` pharmacies.
+    """
+
+    return [f"Benchmark Pharmacy {index}" for index in range(count)]
+
+
+def build_pharmacy_data(name=None):
+    """Build the data of a benchmark pharmacy from `PharmacyFactory`.
+
+    Parameters:
+    - name (str): The name of the pharmacy, the factory's name by default.
+
+    Returns:
+    - dict: The pharmacy fields, with a unique benchmark license number.
+    """
+
+    pharmacy = PharmacyFactory.build()
+    return {
+        "name": name or pharmacy.name,
+        "address": pharmacy.address,
+        # Faker phone numbers may have extensions longer than the field.
+        "phone_number": pharmacy.phone_number[:20],
+        "license_number": f"{LICENSE_NUMBER_PREFIX}{uuid4().hex}",
+    }
+
+
+def seed_pharmacies(count, names, batch_size=None, repository=None):
+    """Insert benchmark pharmacies with bulk writes.
+
+    Generating Faker data is far slower than inserting it, so a sample of
+    `SAMPLE_SIZE` factory records is built once and cycled through, each copy
+    with its own license number and a name from `names`.
+
+    Parameters:
+    - count (int): The number of pharmacies to insert.
+    - names (list): The names given to the pharmacies in turn.
+    - batch_size (int): The number of pharmacies per `insert_many`, `PHARMACY_BULK_BATCH_SIZE` by default.
+    - repository (PharmacyRepository): The repository to insert through.
+
+    Returns:
+    - list: The primary keys of the inserted pharmacies.
+    """
+
+    repository = repository or PharmacyRepository()
+    batch_size = batch_size or settings.PHARMACY_BULK_BATCH_SIZE
+    samples = cycle([build_pharmacy_data() for _ in range(min(count, SAMPLE_SIZE))])
+    name_cycle = cycle(names)
+    prefix = f"{LICENSE_NUMBER_PREFIX}{uuid4().hex[:8]}-"
+
+    ids = []
+    for start in range(0, count, batch_size):
+        documents = [
+            dict(next(samples), name=next(name_cycle), license_number=f"{prefix}{index}")
+            for index in range(start, min(start + batch_size, count))
+        ]
+        ids.extend(result["id"] for result in repository.insert_many(documents) if result["status"] == "created")
+
+    invalidate_caches(names)
+    return ids
+
+
+def delete_benchmark_pharmacies(names=(), repository=None):
+    """Delete every benchmark pharmacy.
+
+    Parameters:
+    - names (iterable): The names of the seeded pharmacies, whose cached counts are dropped.
+    - repository (PharmacyRepository): The repository to delete through.
+
+    Returns:
+    - int: The number of deleted pharmacies.
+    """
+
+    repository = repository or PharmacyRepository()
+    result = repository.collection.delete_many({"license_number": {"$regex": f"^{LICENSE_NUMBER_PREFIX}"}})
+    invalidate_caches(names)
+    return result.deleted_count
+
+
+def invalidate_caches(names):
+    count_provider = PharmacyCountProvider()
+    for name in set(names):
+        count_provider.invalidate(name)
+    PharmacyResponseCache().invalidate()
@@ -0,0 +1,75 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Code run in a fresh interpreter, as a worker of a settings module, to time requests and report its memory.
+STACK_SCRIPT = """
+import json
+import resource
+import sys
+from time import perf_counter
+
+import django
+
+django.setup()
+
+from django.test import Client, override_settings
+
+auth_header, requests, warmup, urls = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4:]
+client = Client(HTTP_AUTHORIZATION=auth_header)
+latencies = {}
+with override_settings(ALLOWED_HOSTS=["testserver"]):
+    for url in urls:
+        for _ in range(warmup):
+            client.get(url)
+        latencies[url] = []
+        for _ in range(requests):
+            start = perf_counter()
+            response = client.get(url)
+            latencies[url].append(perf_counter() - start)
+            if response.status_code != 200:
+                sys.exit(f"GET {url} failed with status {response.status_code}.")
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"latencies": latencies, "rss_kb": rss // 1024 if sys.platform == "darwin" else rss}))
+"""
+
+
+def measure_stack(settings_module, urls, auth_header, requests=500, warmup=20):
+    """Measure requests served by a worker running a settings module, in a fresh interpreter.
+
+    The requests go through the Django test client, so they cross the whole handler
+    (middleware, URL resolution, view and rendering) of the settings module without a
+    network hop.
+
+    Parameters:
+    - settings_module (str): The settings module of the worker, e.g. `"pharmacies.settings_api"`.
+    - urls (list): The URLs to `GET`, which must answer `200`.
+    - auth_header (str): The `Authorization` header of the requests.
+    - requests (int): The number of timed requests per URL.
+    - warmup (int): The number of untimed requests per URL, sent first.
+
+    Returns:
+    - dict: The `latency_ms` (`median_ms` and `mean_ms`) by URL, and the peak `rss_kb` of the worker.
+
+    Raises:
+    - RuntimeError: If the worker fails or a request does not answer `200`.
+    """
+
+    command = [sys.executable, "-c", STACK_SCRIPT, auth_header, str(requests), str(warmup), *urls]
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    result = subprocess.run(command, capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "The worker failed.")
+    measures = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "latency_ms": {
+            url: {
+                "median_ms": round(statistics.median(latencies) * 1000, 3),
+                "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+            }
+            for url, latencies in measures["latencies"].items()
+        },
+        "rss_kb": measures["rss_kb"],
+    }
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import Counter
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .renderers import EncodedJSON, ORJSONRenderer
+
+
+class PharmacyResponseCache:
+    """Cache of serialized pharmacy API payloads.
+
+    - Detail payloads are cached by primary key, already encoded as JSON with their
+      ETag and last-modified timestamp, and dropped when that pharmacy changes.
+    - List pages are cached by `(name, page, page_size)` under a list generation that
+      is bumped on every write, which invalidates all list pages at once without
+      having to know their keys. Their ETag is cached with them.
+
+    Payloads live in the `PHARMACY_RESPONSE_CACHE_ALIAS` cache for
+    `PHARMACY_RESPONSE_CACHE_TIMEOUT` seconds, and hit/miss counters are kept per process.
+    """
+
+    key_prefix = "pharmacy:response:"
+    stats = Counter()
+    stats_lock = threading.Lock()
+
+    def __init__(self, alias=None, timeout=None):
+        self.cache = caches[alias or settings.PHARMACY_RESPONSE_CACHE_ALIAS]
+        self.timeout = settings.PHARMACY_RESPONSE_CACHE_TIMEOUT if timeout is None else timeout
+
+    @classmethod
+    def record(cls, kind, hit):
+        with cls.stats_lock:
+            cls.stats[(kind, "hits" if hit else "misses")] += 1
+
+    @classmethod
+    def get_stats(cls):
+        """Get the hit/miss counters of this process.
+
+        Returns:
+        - dict: The hits and misses of the detail and list caches.
+        """
+
+        return {
+            kind: {result: cls.stats[(kind, result)] for result in ("hits", "misses")} for kind in ("detail", "list")
+        }
+
+    @classmethod
+    def reset_stats(cls):
+        with cls.stats_lock:
+            cls.stats.clear()
+
+    def get_detail_key(self, pk):
+        return f"{self.key_prefix}detail:{pk}"
+
+    def get_list_generation_key(self):
+        return f"{self.key_prefix}list-generation"
+
+    def get_list_generation(self):
+        # A missing (or evicted) generation restarts from the current time, so it can
+        # never collide with the generation of list pages that are still cached.
+        return self.cache.get_or_set(self.get_list_generation_key(), time.time_ns(), None)
+
+    def get_list_key(self, **params):
+        params_hash = md5(repr(sorted(params.items())).encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}list:{self.get_list_generation()}:{params_hash}"
+
+    def _get(self, kind, key):
+        data = self.cache.get(key)
+        self.record(kind, data is not None)
+        return data
+
+    def get_detail(self, pk):
+        """Get the cached JSON body of a pharmacy, or `None` on a miss.
+
+        Returns:
+        - tuple: The encoded payload (an `EncodedJSON` rendered as is by `ORJSONRenderer`),
+          its ETag and its last-modified timestamp.
+        """
+
+        entry = self._get("detail", self.get_detail_key(pk))
+        if entry is None:
+            return None
+        body, etag, last_modified = entry
+        return EncodedJSON(body), etag, last_modified
+
+    def set_detail(self, pk, data, etag=None, last_modified=None):
+        entry = (ORJSONRenderer().render(data), etag, last_modified)
+        self.cache.set(self.get_detail_key(pk), entry, self.timeout)
+
+    def get_list(self, **params):
+        """Get the cached payload of a list page, or `None` on a miss.
+
+        Parameters:
+        - **params: The parameters identifying the page (`name`, `page`, `page_size`, ...).
+
+        Returns:
+        - tuple: The payload and its ETag.
+        """
+
+        return self._get("list", self.get_list_key(**params))
+
+    def set_list(self, data, etag=None, **params):
+        self.cache.set(self.get_list_key(**params), (data, etag), self.timeout)
+
+    def invalidate(self, *pks):
+        """Invalidate the payloads affected by a write.
+
+        Parameters:
+        - *pks (int): The primary keys of the updated or deleted pharmacies, if any.
+        """
+
+        if pks:
+            self.cache.delete_many([self.get_detail_key(pk) for pk in pks])
+        try:
+            self.cache.incr(self.get_list_generation_key())
+        except ValueError:
+            self.cache.set(self.get_list_generation_key(), time.time_ns(), None)
+
+    async def ainvalidate(self, *pks):
+        """Asynchronous version of `invalidate()`."""
+
+        if pks:
+            await self.cache.adelete_many([self.get_detail_key(pk) for pk in pks])
+        try:
+            await self.cache.aincr(self.get_list_generation_key())
+        except ValueError:
+            await self.cache.aset(self.get_list_generation_key(), time.time_ns(), None)
@@ -0,0 +1,49 @@
+import calendar
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class ChangesExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "The change token is older than the retained deletions; sync again without `since`."
+    default_code = "changes_expired"
+
+
+def encode_change_token(time, pk):
+    """Encode a position of the change feed as an opaque token.
+
+    Parameters:
+    - time (datetime): The time of the change, naive in UTC as read from MongoDB.
+    - pk (int): The primary key of the changed pharmacy.
+
+    Returns:
+    - str: The URL-safe token.
+    """
+
+    milliseconds = calendar.timegm(time.utctimetuple()) * 1000 + time.microsecond // 1000
+    return urlsafe_b64encode(f"{milliseconds}.{pk}".encode()).decode().rstrip("=")
+
+
+def decode_change_token(token):
+    """Decode a change token.
+
+    Parameters:
+    - token (str): A token from `encode_change_token()`.
+
+    Returns:
+    - tuple: The time (naive in UTC) and primary key of the position.
+
+    Raises:
+    - ValueError: If the token is not valid.
+    """
+
+    try:
+        milliseconds, _, pk = urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode().partition(".")
+        return EPOCH + timedelta(milliseconds=int(milliseconds)), int(pk)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Invalid change token: {token}")
@@ -0,0 +1,21 @@
+from django.core.checks import Error, register
+from django.core.exceptions import ImproperlyConfigured
+
+from .mongo import check_api_mode
+
+
+@register()
+def check_async_api(app_configs, **kwargs):
+    """Report a `PHARMACY_API_MODE=async` setting that the installed Motor cannot serve."""
+
+    try:
+        check_api_mode()
+    except ImproperlyConfigured as error:
+        return [
+            Error(
+                str(error),
+                hint="Run the async API on Python 3.10 or older, or set PHARMACY_API_MODE=sync.",
+                id="pharmacy.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,130 @@
+import calendar
+from hashlib import md5
+
+import orjson
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import ORJSON_OPTIONS
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The pharmacy was modified since the If-Match version."
+    default_code = "precondition_failed"
+
+
+def get_value(instance, name):
+    return instance[name] if isinstance(instance, dict) else getattr(instance, name)
+
+
+def get_detail_etag(pk, version, fields=None):
+    """Get the strong ETag of a pharmacy representation, `"<pk>.<version>"` (`"<pk>.<version>.<f1>-<f2>"` if sparse).
+
+    Parameters:
+    - pk (int): The primary key of the pharmacy.
+    - version (int): The version of the pharmacy.
+    - fields (list): The rendered fields, all of them by default.
+
+    Returns:
+    - str: The quoted ETag.
+    """
+
+    parts = [str(pk), str(version)]
+    if fields:
+        # Not commas, which separate the ETags of conditional headers.
+        parts.append("-".join(fields))
+    return quote_etag(".".join(parts))
+
+
+def get_list_etag(data):
+    """Get the weak ETag of a list page from a hash of its content.
+
+    Returns:
+    - str: The quoted weak ETag.
+    """
+
+    return "W/" + quote_etag(
+        md5(orjson.dumps(data, default=JSONRenderer.encoder_class().default, option=ORJSON_OPTIONS)).hexdigest()
+    )
+
+
+def get_timestamp(value):
+    """Convert a datetime, naive in UTC as read from MongoDB or aware, to a POSIX timestamp (in seconds)."""
+
+    return calendar.timegm(value.utctimetuple()) if value is not None else None
+
+
+def get_validators(instance, fields=None):
+    """Get the ETag and last-modified timestamp of a pharmacy from its `version` and `updated_at`.
+
+    Parameters:
+    - instance (dict | Pharmacy): The pharmacy document or object.
+    - fields (list): The rendered fields, all of them by default.
+
+    Returns:
+    - tuple: The ETag and the last-modified timestamp.
+    """
+
+    etag = get_detail_etag(get_value(instance, "id"), get_value(instance, "version"), fields)
+    return etag, get_timestamp(get_value(instance, "updated_at"))
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def evaluate_preconditions(request, etag, last_modified=None):
+    """Evaluate the conditional headers of a read (`If-None-Match`, `If-Modified-Since`).
+
+    Parameters:
+    - request (Request): The request.
+    - etag (str): The current ETag of the resource.
+    - last_modified (int): The current last-modified timestamp of the resource.
+
+    Returns:
+    - HttpResponse: A `304 Not Modified` response carrying the validators, or `None` to serve the resource.
+    """
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def get_if_match_versions(request, pk):
+    """Get the versions of a pharmacy accepted by the `If-Match` header of a write.
+
+    Both full and sparse (`?fields=`) ETags of the pharmacy match its version.
+
+    Parameters:
+    - request (Request): The request.
+    - pk (int): The primary key of the pharmacy.
+
+    Returns:
+    - set: The accepted versions, or `None` if any version is accepted (no header or `*`).
+    """
+
+    header = request.META.get("HTTP_IF_MATCH")
+    if not header:
+        return None
+    etags = parse_etags(header)
+    if etags == ["*"]:
+        return None
+
+    versions = set()
+    for etag in etags:
+        if etag.startswith("W/"):
+            # Weak ETags never match for writes (RFC 9110, 13.1.1).
+            continue
+        etag_pk, _, rest = etag.strip('"').partition(".")
+        version = rest.partition(".")[0]
+        if etag_pk == str(pk) and version.isdigit():
+            versions.add(int(version))
+    return versions
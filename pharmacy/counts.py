@@ -0,0 +1,130 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .mongo import get_async_collection, get_collection
+from .repositories import PharmacyDocumentSet
+
+
+class PharmacyCountProvider:
+    """Cheap total counts for pharmacy list pages.
+
+    - Unfiltered lists use `estimated_document_count`, which reads the collection
+      metadata instead of scanning documents, so the count is reported as estimated.
+    - Lists filtered by name use an exact `count_documents` that is cached per name
+      for `PHARMACY_COUNT_CACHE_TIMEOUT` seconds and adjusted on writes.
+    - Other filtered lists (searches, name prefixes) use an exact `count_documents`
+      that is cached per query for `PHARMACY_COUNT_CACHE_TIMEOUT` seconds; writes do
+      not adjust it.
+    """
+
+    cache_key_prefix = "pharmacy:count:name:"
+    query_cache_key_prefix = "pharmacy:count:query:"
+
+    def __init__(self, timeout=None):
+        self.timeout = settings.PHARMACY_COUNT_CACHE_TIMEOUT if timeout is None else timeout
+
+    def get_cache_key(self, name):
+        return self.cache_key_prefix + md5(name.encode("utf-8")).hexdigest()
+
+    def get_query_cache_key(self, documents):
+        query = repr((documents.query, documents.collation))
+        return self.query_cache_key_prefix + md5(query.encode("utf-8")).hexdigest()
+
+    def is_query_filtered(self, name, documents):
+        """Check whether the listed documents are filtered by more than their name.
+
+        Parameters:
+        - name (str): The exact name filter of the list.
+        - documents (PharmacyDocumentSet | QuerySet): The listed documents, if known.
+
+        Returns:
+        - bool: `True` if the count must be computed from the query of `documents`.
+        """
+
+        return isinstance(documents, PharmacyDocumentSet) and documents.query != ({"name": name} if name else {})
+
+    def count(self, name=None, documents=None):
+        """Count the pharmacies, optionally filtered by name.
+
+        Parameters:
+        - name (str): The exact name to filter by, or `None` for all pharmacies.
+        - documents (PharmacyDocumentSet | QuerySet): The listed documents. When they are filtered
+          by more than the name (e.g. a search), their exact count is returned.
+
+        Returns:
+        - tuple: The count and whether it is exact (`True`) or estimated (`False`).
+        """
+
+        if self.is_query_filtered(name, documents):
+            key = self.get_query_cache_key(documents)
+            count = cache.get(key)
+            if count is None:
+                count = documents.count()
+                cache.set(key, count, self.timeout)
+            return count, True
+
+        if not name:
+            return get_collection().estimated_document_count(), False
+
+        key = self.get_cache_key(name)
+        count = cache.get(key)
+        if count is None:
+            count = get_collection().count_documents({"name": name})
+            cache.set(key, count, self.timeout)
+        return count, True
+
+    async def acount(self, name=None, documents=None):
+        """Asynchronous version of `count()` reading through Motor.
+
+        Parameters:
+        - name (str): The exact name to filter by, or `None` for all pharmacies.
+        - documents (PharmacyDocumentSet): The listed documents, over the Motor collection.
+        """
+
+        if self.is_query_filtered(name, documents):
+            key = self.get_query_cache_key(documents)
+            count = await cache.aget(key)
+            if count is None:
+                count = await documents.count()
+                await cache.aset(key, count, self.timeout)
+            return count, True
+
+        if not name:
+            return await get_async_collection().estimated_document_count(), False
+
+        key = self.get_cache_key(name)
+        count = await cache.aget(key)
+        if count is None:
+            count = await get_async_collection().count_documents({"name": name})
+            await cache.aset(key, count, self.timeout)
+        return count, True
+
+    def adjust(self, name, delta):
+        """Adjust the cached count of a name after pharmacies were created or deleted.
+
+        Nothing is done when the count is not cached, the next read computes it.
+
+        Parameters:
+        - name (str): The name of the created or deleted pharmacies.
+        - delta (int): The number of created (positive) or deleted (negative) pharmacies.
+        """
+
+        try:
+            cache.incr(self.get_cache_key(name), delta)
+        except ValueError:
+            pass
+
+    async def aadjust(self, name, delta):
+        """Asynchronous version of `adjust()`."""
+
+        try:
+            await cache.aincr(self.get_cache_key(name), delta)
+        except ValueError:
+            pass
+
+    def invalidate(self, name):
+        """Drop the cached count of a name."""
+
+        cache.delete(self.get_cache_key(name))
@@ -0,0 +1,47 @@
+from django.utils import timezone
+from djongo.models import DateTimeField, JSONField
+
+
+def bson_now():
+    """Get the current time truncated to milliseconds, the precision of BSON dates.
+
+    Returns:
+    - datetime: The current aware datetime, equal to the value MongoDB stores for it.
+    """
+
+    now = timezone.now()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+class PointField(JSONField):
+    """A GeoJSON point, `{"type": "Point", "coordinates": [longitude, latitude]}`.
+
+    The point is stored as an embedded document rather than encoded JSON, so a
+    `2dsphere` index can cover it and `$geoNear` can query it. Unlike djongo's
+    `JSONField` it accepts `None` for documents without a location.
+    """
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        return super().get_prep_value(value)
+
+    def to_python(self, value):
+        if value is None:
+            return None
+        return super().to_python(value)
+
+
+class BSONDateTimeField(DateTimeField):
+    """A `DateTimeField` whose `auto_now`/`auto_now_add` values are truncated to milliseconds.
+
+    MongoDB stores dates with millisecond precision, so without the truncation a saved
+    pharmacy would render a different `updated_at` than the same pharmacy read back.
+    """
+
+    def pre_save(self, model_instance, add):
+        if self.auto_now or (self.auto_now_add and add):
+            value = bson_now()
+            setattr(model_instance, self.attname, value)
+            return value
+        return super().pre_save(model_instance, add)
@@ -0,0 +1,101 @@
+import json
+import time
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class GeocodingError(Exception):
+    """The geocoding service failed to answer (as opposed to not finding the address)."""
+
+
+class BaseGeocoder:
+    """Base class of the geocoders turning pharmacy addresses into GeoJSON points.
+
+    Subclasses implement `geocode()`. The geocoder used by the backfill command is
+    set by the `PHARMACY_GEOCODER` setting (a dotted path), so tests and local runs
+    can plug in a geocoder that does not call any external service.
+    """
+
+    def geocode(self, address):
+        """Geocode an address.
+
+        Parameters:
+        - address (str): The address to geocode.
+
+        Returns:
+        - tuple: The `(longitude, latitude)` of the address in degrees, or `None` if it was not found.
+
+        Raises:
+        - GeocodingError: If the geocoding service failed.
+        """
+
+        raise NotImplementedError("Subclasses of BaseGeocoder must implement geocode().")
+
+    def to_point(self, address):
+        """Geocode an address into a GeoJSON point.
+
+        Returns:
+        - dict: The GeoJSON point of the address, or `None` if it was not found.
+        """
+
+        coordinates = self.geocode(address)
+        if coordinates is None:
+            return None
+        longitude, latitude = coordinates
+        return {"type": "Point", "coordinates": [float(longitude), float(latitude)]}
+
+
+class NominatimGeocoder(BaseGeocoder):
+    """Geocoder using the OpenStreetMap Nominatim search API.
+
+    The public instance allows one request per second from an identified client,
+    so requests are spaced by `min_interval` seconds and send `user_agent`.
+    """
+
+    url = "https://nominatim.openstreetmap.org/search"
+    user_agent = "pharmacies-api-geocoder"
+    timeout = 10
+    min_interval = 1.0
+
+    def __init__(self):
+        self.last_request = None
+
+    def wait(self):
+        if self.last_request is not None:
+            delay = self.min_interval - (time.monotonic() - self.last_request)
+            if delay > 0:
+                time.sleep(delay)
+        self.last_request = time.monotonic()
+
+    def geocode(self, address):
+        self.wait()
+        request = Request(
+            f"{self.url}?{urlencode({'q': address, 'format': 'json', 'limit': 1})}",
+            headers={"User-Agent": self.user_agent},
+        )
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                results = json.load(response)
+        except (URLError, OSError, ValueError) as error:
+            raise GeocodingError(f"Cannot geocode {address!r}: {error}") from error
+
+        if not results:
+            return None
+        return float(results[0]["lon"]), float(results[0]["lat"])
+
+
+def get_geocoder(path=None):
+    """Instantiate the configured geocoder.
+
+    Parameters:
+    - path (str): The dotted path of the geocoder class, the `PHARMACY_GEOCODER` setting by default.
+
+    Returns:
+    - BaseGeocoder: The geocoder.
+    """
+
+    return import_string(path or settings.PHARMACY_GEOCODER)()
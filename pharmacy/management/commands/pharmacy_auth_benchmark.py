@@ -0,0 +1,69 @@
+from base64 import b64encode
+from time import perf_counter
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from pharmacy.models import Pharmacy
+
+
+class Command(BaseCommand):
+    help = "Compare the requests per second of GET /pharmacies/{pk}/ with basic and token authentication."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Number of requests per authentication scheme.")
+
+    def handle(self, *args, **options):
+        password = uuid4().hex
+        user = User.objects.create_user(username=f"benchmark-{uuid4().hex[:12]}", password=password)
+        token = Token.objects.create(user=user)
+        pharmacy = Pharmacy.objects.create(
+            name="Benchmark Pharmacy",
+            address="123 Main St",
+            phone_number="123-456-7890",
+            license_number=f"benchmark-{uuid4().hex}",
+        )
+        auth_headers = {
+            "basic": "Basic {}".format(b64encode(f"{user.username}:{password}".encode("utf-8")).decode("utf-8")),
+            "token": f"Token {token.key}",
+        }
+        try:
+            with override_settings(ALLOWED_HOSTS=["testserver"], PHARMACY_BASIC_AUTHENTICATION=True):
+                url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+                results = {
+                    scheme: self.measure(url, header, options["requests"]) for scheme, header in auth_headers.items()
+                }
+        finally:
+            token.delete()
+            user.delete()
+            pharmacy.delete()
+
+        for scheme, requests_per_second in results.items():
+            self.stdout.write(
+                f"{scheme}: {requests_per_second:.1f} req/s ({1000 / requests_per_second:.2f} ms/request)"
+            )
+        self.stdout.write(f"token/basic: {results['token'] / results['basic']:.1f}x")
+
+    def measure(self, url, auth_header, requests):
+        """Measure the requests per second of a URL with an authorization header.
+
+        Returns:
+        - float: The requests per second.
+        """
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=auth_header)
+        # The first request warms up the caches (e.g. the token cache) like a long-running worker.
+        client.get(url)
+
+        start = perf_counter()
+        for _ in range(requests):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f"GET {url} failed with status {response.status_code}.")
+        return requests / (perf_counter() - start)
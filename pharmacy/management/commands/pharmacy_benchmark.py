@@ -0,0 +1,152 @@
+import json
+import platform
+from datetime import datetime, timezone
+from time import perf_counter
+from uuid import uuid4
+
+import django
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from pharmacy.benchmarks.runner import BenchmarkRunner, compare
+from pharmacy.benchmarks.seeding import delete_benchmark_pharmacies, get_benchmark_names, seed_pharmacies
+from pharmacy.mongo import get_collection
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark pharmacies, measure the latency percentiles and throughput of the pharmacy API "
+        "(list, retrieve, create, update) and optionally save the results as JSON or compare them with a baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=10000, help="Number of pharmacies to seed (e.g. 10000).")
+        parser.add_argument("--names", type=int, default=100, help="Number of distinct names of the seeded pharmacies.")
+        parser.add_argument("--requests", type=int, default=200, help="Number of timed requests per scenario.")
+        parser.add_argument("--page-size", type=int, default=10, help="Page size of the list scenarios.")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=BenchmarkRunner.scenarios,
+            help="Scenario to run; repeat to run several (all by default).",
+        )
+        parser.add_argument("--output", help="Path of the JSON file to write the results to.")
+        parser.add_argument("--compare", help="Path of a JSON results file to compare the run with.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Latency increase (percent) reported as a regression by --compare.",
+        )
+        parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="Keep the response cache enabled (disabled by default to measure the database path).",
+        )
+        parser.add_argument(
+            "--mongomock",
+            action="store_true",
+            help="Run against an in-memory mongomock database instead of the configured MongoDB server.",
+        )
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded pharmacies after the run.")
+
+    def handle(self, *args, **options):
+        if options["size"] < 1 or options["names"] < 1 or options["requests"] < 1:
+            raise CommandError("--size, --names and --requests must be positive.")
+        baseline = self.load_results(options["compare"]) if options["compare"] else None
+        if options["mongomock"]:
+            self.use_mongomock()
+
+        names = get_benchmark_names(min(options["names"], options["size"]))
+        start = perf_counter()
+        ids = seed_pharmacies(options["size"], names)
+        seed_seconds = perf_counter() - start
+        self.stdout.write(f"Seeded {len(ids)} pharmacies in {seed_seconds:.1f}s.")
+
+        user = User.objects.create_user(username=f"benchmark-{uuid4().hex[:12]}", password=uuid4().hex)
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        try:
+            with override_settings(ALLOWED_HOSTS=["testserver"], PHARMACY_RESPONSE_CACHE=options["response_cache"]):
+                runner = BenchmarkRunner(
+                    client,
+                    ids,
+                    names,
+                    total=get_collection().count_documents({}),
+                    requests=options["requests"],
+                    page_size=options["page_size"],
+                )
+                scenarios = runner.run(options["scenario"])
+        finally:
+            token.delete()
+            user.delete()
+            if not options["keep"]:
+                delete_benchmark_pharmacies(names)
+
+        results = {
+            "meta": {
+                "date": datetime.now(timezone.utc).isoformat(),
+                "size": options["size"],
+                "names": len(names),
+                "requests": options["requests"],
+                "page_size": options["page_size"],
+                "response_cache": options["response_cache"],
+                "mongomock": options["mongomock"],
+                "seed_seconds": round(seed_seconds, 3),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "scenarios": scenarios,
+        }
+        self.write_summary(scenarios)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+        if baseline is not None:
+            self.write_comparison(scenarios, baseline["scenarios"], options["threshold"])
+
+    def use_mongomock(self):
+        """Point djongo at a fresh in-memory mongomock database and migrate it."""
+
+        try:
+            import mongomock
+        except ImportError:
+            raise CommandError("--mongomock requires the mongomock package (pip install mongomock).")
+        import djongo.database
+
+        connections.close_all()
+        djongo.database.clients.clear()
+        djongo.database.MongoClient = mongomock.MongoClient
+        call_command("migrate", verbosity=0)
+
+    def load_results(self, path):
+        try:
+            with open(path) as results:
+                return json.load(results)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Cannot read the results to compare with: {error}")
+
+    def write_summary(self, scenarios):
+        self.stdout.write(
+            f"{'scenario':<16}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}"
+        )
+        for name, summary in scenarios.items():
+            latency = summary["latency_ms"]
+            self.stdout.write(
+                f"{name:<16}{summary['throughput']:>10.1f}{latency['p50']:>10.2f}{latency['p90']:>10.2f}"
+                f"{latency['p99']:>10.2f}{latency['max']:>10.2f}{summary['errors']:>8}"
+            )
+
+    def write_comparison(self, scenarios, baseline, threshold):
+        rows = compare(scenarios, baseline, threshold)
+        self.stdout.write("Comparison with the baseline:")
+        for name, metric, before, after, change, regression in rows:
+            line = f"  {name} {metric}: {before:.2f} -> {after:.2f} ms ({change:+.1f}%)"
+            self.stdout.write(self.style.ERROR(f"{line} REGRESSION") if regression else line)
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pharmacy.caching import PharmacyResponseCache
+from pharmacy.geocoding import GeocodingError, get_geocoder
+from pharmacy.repositories import PharmacyRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the location of the pharmacies without one by geocoding their address in batches "
+        "with the PHARMACY_GEOCODER geocoder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Number of pharmacies written per command.")
+        parser.add_argument("--limit", type=int, help="Maximum number of pharmacies to geocode.")
+        parser.add_argument("--geocoder", help="Dotted path of the geocoder class (PHARMACY_GEOCODER by default).")
+        parser.add_argument("--dry-run", action="store_true", help="Geocode the addresses without saving them.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1 or (options["limit"] is not None and options["limit"] < 1):
+            raise CommandError("--batch-size and --limit must be positive.")
+        try:
+            geocoder = get_geocoder(options["geocoder"])
+        except ImportError as error:
+            raise CommandError(f"Cannot load the geocoder: {error}")
+
+        repository = PharmacyRepository()
+        remaining = options["limit"]
+        after = 0
+        geocoded = not_found = failed = 0
+        while remaining is None or remaining > 0:
+            batch_size = options["batch_size"] if remaining is None else min(options["batch_size"], remaining)
+            documents = repository.find_without_location(after=after, limit=batch_size)
+            if not documents:
+                break
+            after = documents[-1]["id"]
+            if remaining is not None:
+                remaining -= len(documents)
+
+            locations = {}
+            for document in documents:
+                try:
+                    location = geocoder.to_point(document["address"])
+                except GeocodingError as error:
+                    failed += 1
+                    self.stderr.write(f"Pharmacy {document['id']}: {error}")
+                    continue
+                if location is None:
+                    not_found += 1
+                else:
+                    locations[document["id"]] = location
+
+            geocoded += len(locations)
+            if locations and not options["dry_run"]:
+                repository.set_locations(locations)
+                if settings.PHARMACY_RESPONSE_CACHE:
+                    PharmacyResponseCache().invalidate(*locations)
+
+        action = "Geocoded (dry run)" if options["dry_run"] else "Geocoded"
+        self.stdout.write(f"{action} {geocoded} pharmacies, {not_found} addresses not found, {failed} failed.")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pharmacy.benchmarks.imports import group_by_package, measure_imports
+
+
+class Command(BaseCommand):
+    help = "Measure the import time of the WSGI application (python -X importtime), as a worker cold start pays it."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", default="pharmacies.wsgi", help="Module to import.")
+        parser.add_argument(
+            "--urls", action="store_true", help="Also import the URLconf, as the first request of a worker does."
+        )
+        parser.add_argument("--runs", type=int, default=3, help="Number of fresh interpreters to time.")
+        parser.add_argument("--top", type=int, default=15, help="Number of packages and modules to report.")
+
+    def handle(self, *args, **options):
+        try:
+            result = measure_imports(options["module"], include_urls=options["urls"], runs=options["runs"])
+        except RuntimeError as error:
+            raise CommandError(f"Could not import {options['module']}: {error}")
+
+        imports = result["imports"]
+        runs = ", ".join(f"{wall:.1f}" for wall in result["wall_runs_ms"])
+        self.stdout.write(
+            f"import {options['module']}{' + URLconf' if options['urls'] else ''}: "
+            f"{result['wall_ms']:.1f} ms median ({runs} ms), {len(imports)} modules, "
+            f"{sum(self_us for _, self_us, _ in imports) / 1000:.1f} ms in module bodies"
+        )
+
+        self.stdout.write("Slowest packages (self time):")
+        for package, self_us, count in group_by_package(imports)[: options["top"]]:
+            self.stdout.write(f"  {package}: {self_us / 1000:.1f} ms, {count} modules")
+
+        self.stdout.write("Slowest modules (cumulative time):")
+        for module, _, cumulative_us in sorted(imports, key=lambda row: -row[2])[: options["top"]]:
+            self.stdout.write(f"  {module}: {cumulative_us / 1000:.1f} ms")
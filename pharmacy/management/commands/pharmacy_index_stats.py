@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from pharmacy.mongo import get_collection
+
+
+class Command(BaseCommand):
+    help = "Report how many operations used each index of the pharmacies collection ($indexStats)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--unused",
+            action="store_true",
+            help="Only report indexes that were not used since the server started.",
+        )
+
+    def handle(self, *args, **options):
+        collection = get_collection()
+        stats = sorted(collection.aggregate([{"$indexStats": {}}]), key=lambda index: index["name"])
+        if options["unused"]:
+            stats = [index for index in stats if not index["accesses"]["ops"]]
+
+        self.stdout.write(f"Index usage of the {collection.name} collection:")
+        for index in stats:
+            key = ", ".join(f"{field}: {direction}" for field, direction in index["key"].items())
+            accesses = index["accesses"]
+            self.stdout.write(
+                f"  {index['name']} ({key}): {accesses['ops']} ops since {accesses['since']:%Y-%m-%d %H:%M:%S}"
+            )
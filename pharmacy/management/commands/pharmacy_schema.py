@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pharmacy.schema import generate_schema
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema once into PHARMACY_SCHEMA_FILE, which GET /api/schema/ serves from memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Schema file to write, PHARMACY_SCHEMA_FILE by default.")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only check the schema file is up to date, failing if it is missing or outdated.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["file"] or settings.PHARMACY_SCHEMA_FILE
+        schema = generate_schema()
+        if options["check"]:
+            try:
+                with open(path, "rb") as schema_file:
+                    current = schema_file.read()
+            except FileNotFoundError:
+                raise CommandError(f"The schema file {path} does not exist, run `manage.py pharmacy_schema`.")
+            if current != schema:
+                raise CommandError(f"The schema file {path} is outdated, run `manage.py pharmacy_schema`.")
+            self.stdout.write(f"The schema file {path} is up to date.")
+            return
+
+        with open(path, "wb") as schema_file:
+            schema_file.write(schema)
+        self.stdout.write(f"Wrote the OpenAPI schema to {path} ({len(schema)} bytes).")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from pharmacy.profiling import get_slow_query_collection, get_top_offenders
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the captured slow or sampled MongoDB queries grouped by shape, "
+        "collection scans and in-memory sorts first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=10, help="Number of query shapes to report.")
+        parser.add_argument(
+            "--flagged", action="store_true", help="Only report the shapes with a COLLSCAN or SORT stage."
+        )
+        parser.add_argument("--clear", action="store_true", help="Delete the captured queries once reported.")
+
+    def handle(self, *args, **options):
+        collection = get_slow_query_collection()
+        offenders = get_top_offenders(collection, options["limit"], options["flagged"])
+
+        self.stdout.write(f"Top {len(offenders)} captured query shapes:")
+        for offender in offenders:
+            flags = ", ".join(offender["flags"]) or "none"
+            self.stdout.write(
+                f"  {offender['shape'][:8]} x{offender['count']}: max {offender['max_ms']:.1f} ms, "
+                f"avg {offender['avg_ms']:.1f} ms, {offender['docs_examined']} docs examined, flags: {flags}"
+            )
+            self.stdout.write(f"    view: {offender['view']}")
+            if offender["sql"]:
+                self.stdout.write(f"    sql: {offender['sql']}")
+            self.stdout.write(f"    command: {offender['command']}")
+
+        if options["clear"]:
+            deleted = collection.delete_many({}).deleted_count
+            self.stdout.write(f"Deleted {deleted} captured queries.")
@@ -0,0 +1,72 @@
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from pharmacy.benchmarks.stacks import measure_stack
+from pharmacy.models import Pharmacy
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-request latency and the memory of workers running the full settings (pharmacies.settings) "
+        "and the API-only settings (pharmacies.settings_api)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stack",
+            action="append",
+            help="Settings module to measure; repeat to compare several (pharmacies.settings and "
+            "pharmacies.settings_api by default). The first one is the baseline.",
+        )
+        parser.add_argument("--requests", type=int, default=500, help="Number of timed requests per URL.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be positive.")
+        stacks = options["stack"] or ["pharmacies.settings", "pharmacies.settings_api"]
+
+        user = User.objects.create_user(username=f"benchmark-{uuid4().hex[:12]}", password=uuid4().hex)
+        token = Token.objects.create(user=user)
+        pharmacy = Pharmacy.objects.create(
+            name="Benchmark Pharmacy",
+            address="123 Main St",
+            phone_number="123-456-7890",
+            license_number=f"benchmark-{uuid4().hex}",
+        )
+        # The cache statistics do not query the database, so they measure the overhead of the stack alone.
+        urls = {
+            "overhead": reverse("pharmacy-cache-stats"),
+            "retrieve": reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}),
+        }
+        try:
+            results = {}
+            for stack in stacks:
+                try:
+                    results[stack] = measure_stack(
+                        stack, list(urls.values()), f"Token {token.key}", requests=options["requests"]
+                    )
+                except RuntimeError as error:
+                    raise CommandError(f"Could not measure {stack}: {error}")
+        finally:
+            token.delete()
+            user.delete()
+            pharmacy.delete()
+
+        baseline = results[stacks[0]]
+        self.stdout.write(f"{'stack':<28}{'scenario':<12}{'median ms':>11}{'mean ms':>10}{'change':>9}")
+        for stack, result in results.items():
+            for scenario, url in urls.items():
+                latency = result["latency_ms"][url]
+                before = baseline["latency_ms"][url]["median_ms"]
+                change = (latency["median_ms"] - before) / before * 100 if before else 0.0
+                self.stdout.write(
+                    f"{stack:<28}{scenario:<12}{latency['median_ms']:>11.3f}{latency['mean_ms']:>10.3f}"
+                    f"{change:>+8.1f}%"
+                )
+        for stack, result in results.items():
+            change = (result["rss_kb"] - baseline["rss_kb"]) / 1024
+            self.stdout.write(f"{stack}: {result['rss_kb'] / 1024:.1f} MiB peak RSS ({change:+.1f} MiB)")
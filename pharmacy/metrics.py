@@ -0,0 +1,215 @@
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.http import HttpResponse
+from pymongo import monitoring
+
+# Upper bounds of the histogram buckets.
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COMMAND_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# The metrics of the request being served in the current thread or task.
+current_request = ContextVar("pharmacy_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """The time spent by a request in MongoDB and in serializers, accumulated while it is served."""
+
+    __slots__ = ("start", "mongo_commands", "mongo_seconds", "serializer_seconds")
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.mongo_commands = 0
+        self.mongo_seconds = 0.0
+        self.serializer_seconds = 0.0
+
+    def get_elapsed(self):
+        return perf_counter() - self.start
+
+
+class Histogram:
+    """A Prometheus histogram with labels, kept in process memory.
+
+    Parameters:
+    - name (str): The metric name.
+    - description (str): The help text of the metric.
+    - buckets (tuple): The sorted upper bounds of the buckets.
+    - label_names (tuple): The names of the labels.
+    """
+
+    def __init__(self, name, description, buckets, label_names=("route", "method")):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.label_names = label_names
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        """Record a value.
+
+        Parameters:
+        - labels (tuple): The label values, in the order of `label_names`.
+        - value (float): The observed value.
+        """
+
+        with self.lock:
+            sample = self.samples.get(labels)
+            if sample is None:
+                # The count of every bucket (and of +Inf), then the sum of the values.
+                sample = self.samples[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            sample[bisect_left(self.buckets, value)] += 1
+            sample[-1] += value
+
+    def expose(self):
+        """Render the histogram in the Prometheus text format.
+
+        Returns:
+        - list: The lines of the histogram.
+        """
+
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            samples = sorted((labels, list(sample)) for labels, sample in self.samples.items())
+        for labels, sample in samples:
+            labels = list(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), sample):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels([*labels, ('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {sample[-1]}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+        return lines
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+
+def format_labels(labels):
+    """Format `(name, value)` label pairs as `{name="value",...}`, escaping the values."""
+
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class RequestMetricsRegistry:
+    """The request metrics of the serving process, by route (URL name) and method."""
+
+    def __init__(self):
+        self.duration = Histogram(
+            "pharmacy_request_duration_seconds",
+            "Time to serve a request, up to its response headers.",
+            DURATION_BUCKETS,
+        )
+        self.mongo_commands = Histogram(
+            "pharmacy_request_mongo_commands", "MongoDB commands sent while serving a request.", COMMAND_BUCKETS
+        )
+        self.mongo_duration = Histogram(
+            "pharmacy_request_mongo_duration_seconds",
+            "Time spent in MongoDB commands while serving a request.",
+            DURATION_BUCKETS,
+        )
+        self.serializer_duration = Histogram(
+            "pharmacy_request_serializer_duration_seconds",
+            "Time spent serializing and encoding the response data of a request.",
+            DURATION_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "pharmacy_response_size_bytes", "Size of the response body of a request.", SIZE_BUCKETS
+        )
+        self.histograms = [
+            self.duration,
+            self.mongo_commands,
+            self.mongo_duration,
+            self.serializer_duration,
+            self.response_size,
+        ]
+
+    def observe(self, route, method, metrics, duration):
+        """Record the metrics of a served request, but its response size.
+
+        Parameters:
+        - route (str): The URL name of the request, e.g. `"pharmacy-list"`.
+        - method (str): The HTTP method.
+        - metrics (RequestMetrics): The metrics accumulated while serving the request.
+        - duration (float): The time to serve the request, in seconds.
+        """
+
+        labels = (route, method)
+        self.duration.observe(labels, duration)
+        self.mongo_commands.observe(labels, metrics.mongo_commands)
+        self.mongo_duration.observe(labels, metrics.mongo_seconds)
+        self.serializer_duration.observe(labels, metrics.serializer_seconds)
+
+    def observe_size(self, route, method, size):
+        self.response_size.observe((route, method), size)
+
+    def expose(self):
+        """Render every metric in the Prometheus text format.
+
+        Returns:
+        - str: The exposition.
+        """
+
+        return "\n".join(line for histogram in self.histograms for line in histogram.expose()) + "\n"
+
+    def clear(self):
+        for histogram in self.histograms:
+            histogram.clear()
+
+
+registry = RequestMetricsRegistry()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Adds every MongoDB command, and its duration, to the metrics of the request that sent it.
+
+    PyMongo calls listeners in the thread that runs the command, so commands run by
+    Motor's thread pool (the async views) are not attributed to their request.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.record(event)
+
+    def failed(self, event):
+        self.record(event)
+
+    def record(self, event):
+        metrics = current_request.get()
+        if metrics is not None:
+            metrics.mongo_commands += 1
+            metrics.mongo_seconds += event.duration_micros / 1_000_000
+
+
+@contextmanager
+def track_serializer():
+    """Add the time spent in the block, but in MongoDB commands, to the serializer time of the current request."""
+
+    metrics = current_request.get()
+    if metrics is None:
+        yield
+        return
+
+    start = perf_counter()
+    mongo_seconds = metrics.mongo_seconds
+    try:
+        yield
+    finally:
+        metrics.serializer_seconds += perf_counter() - start - (metrics.mongo_seconds - mongo_seconds)
+
+
+def metrics_view(request):
+    """Expose the request metrics of the serving process in the Prometheus text format (GET /metrics)."""
+
+    return HttpResponse(registry.expose(), content_type="text/plain; version=0.0.4; charset=utf-8")
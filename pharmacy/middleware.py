@@ -0,0 +1,141 @@
+import asyncio
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .metrics import RequestMetrics, current_request, registry
+from .profiling import QueryProfile, current_profile, get_view_name, is_profiling_enabled
+
+
+class PharmacyMetricsMiddleware:
+    """Record the latency, MongoDB commands, serializer time and response size of every request.
+
+    The metrics are recorded by route (the URL name, e.g. `pharmacy-list`) and method
+    in the process registry exposed on `/metrics`, and sent to the client in a
+    `Server-Timing` header (`db`, `serialize` and `total` durations in milliseconds)
+    unless `PHARMACY_SERVER_TIMING` is disabled. Put it first in `MIDDLEWARE` so that
+    the total covers the whole middleware stack.
+
+    Streamed responses (e.g. exports) are timed up to their headers and their size is
+    recorded once the stream is consumed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PHARMACY_METRICS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Mark the instance as a coroutine function so that Django awaits it, like `MiddlewareMixin` does.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.process_response(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.process_response(request, response, metrics)
+
+    def get_route(self, request):
+        """Get the route label of a request: its URL name, `unmatched` if no URL pattern matched it."""
+
+        resolver_match = getattr(request, "resolver_match", None)
+        return resolver_match.view_name if resolver_match is not None else "unmatched"
+
+    def process_response(self, request, response, metrics):
+        route = self.get_route(request)
+        duration = metrics.get_elapsed()
+        registry.observe(route, request.method, metrics, duration)
+
+        if response.streaming:
+            response.streaming_content = self.count_streamed_bytes(response.streaming_content, route, request.method)
+        else:
+            registry.observe_size(route, request.method, len(response.content))
+
+        if settings.PHARMACY_SERVER_TIMING:
+            response["Server-Timing"] = (
+                f'db;dur={metrics.mongo_seconds * 1000:.2f};desc="{metrics.mongo_commands} commands", '
+                f"serialize;dur={metrics.serializer_seconds * 1000:.2f}, total;dur={duration * 1000:.2f}"
+            )
+        return response
+
+    def count_streamed_bytes(self, chunks, route, method):
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        finally:
+            registry.observe_size(route, method, size)
+
+
+class PharmacyQueryProfilerMiddleware:
+    """Attribute the MongoDB commands of every request to its view and to the SQL djongo received.
+
+    `QueryProfiler` only considers the commands of the requests this middleware profiles,
+    and records with each captured command the view (and viewset action) that sent it and,
+    for the commands djongo generated, the SQL statement it translated. It is only loaded
+    when slow query capture is enabled (`PHARMACY_SLOW_QUERY_MS` or
+    `PHARMACY_SLOW_QUERY_SAMPLE_RATE`).
+
+    The async views query MongoDB with Motor rather than the ORM, so no SQL is recorded for them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not is_profiling_enabled():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        profile = QueryProfile()
+        token = current_profile.set(profile)
+        try:
+            with connection.execute_wrapper(self.record_sql(profile)):
+                return self.get_response(request)
+        finally:
+            current_profile.reset(token)
+
+    async def __acall__(self, request):
+        token = current_profile.set(QueryProfile())
+        try:
+            return await self.get_response(request)
+        finally:
+            current_profile.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.view = get_view_name(view_func)
+
+    @staticmethod
+    def record_sql(profile):
+        def wrapper(execute, sql, params, many, context):
+            profile.sql = sql
+            return execute(sql, params, many, context)
+
+        return wrapper
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pharmacy", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pharmacy",
+            index=models.Index(fields=["name", "id"], name="pharmacy_name_id_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="pharmacy",
+            constraint=models.UniqueConstraint(fields=("license_number",), name="pharmacy_license_number_uniq"),
+        ),
+    ]
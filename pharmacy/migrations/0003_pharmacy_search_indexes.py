@@ -0,0 +1,41 @@
+from django.db import migrations
+from pymongo import ASCENDING, TEXT
+
+# djongo cannot declare text or collation indexes, so they are created through PyMongo.
+TEXT_INDEX_NAME = "pharmacy_name_address_text"
+NAME_CASE_INSENSITIVE_INDEX_NAME = "pharmacy_name_ci_idx"
+
+
+def get_collection(apps, schema_editor):
+    schema_editor.connection.ensure_connection()
+    return schema_editor.connection.connection[apps.get_model("pharmacy", "Pharmacy")._meta.db_table]
+
+
+def create_search_indexes(apps, schema_editor):
+    collection = get_collection(apps, schema_editor)
+    collection.create_index(
+        [("name", TEXT), ("address", TEXT)],
+        name=TEXT_INDEX_NAME,
+        weights={"name": 5, "address": 1},
+    )
+    collection.create_index(
+        [("name", ASCENDING), ("id", ASCENDING)],
+        name=NAME_CASE_INSENSITIVE_INDEX_NAME,
+        collation={"locale": "en", "strength": 2},
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    collection = get_collection(apps, schema_editor)
+    collection.drop_index(TEXT_INDEX_NAME)
+    collection.drop_index(NAME_CASE_INSENSITIVE_INDEX_NAME)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pharmacy", "0002_pharmacy_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+from pymongo import GEOSPHERE
+
+import pharmacy.fields
+
+# djongo has no column type for the field nor geospatial indexes, so the existing documents
+# get a null location and the index is created through PyMongo.
+LOCATION_INDEX_NAME = "pharmacy_location_2dsphere"
+
+
+def get_collection(apps, schema_editor):
+    schema_editor.connection.ensure_connection()
+    return schema_editor.connection.connection[apps.get_model("pharmacy", "Pharmacy")._meta.db_table]
+
+
+def add_location(apps, schema_editor):
+    collection = get_collection(apps, schema_editor)
+    collection.update_many({"location": {"$exists": False}}, {"$set": {"location": None}})
+    # A 2dsphere index skips documents whose location is null, so pharmacies without one can still be stored.
+    collection.create_index([("location", GEOSPHERE)], name=LOCATION_INDEX_NAME)
+
+
+def remove_location(apps, schema_editor):
+    collection = get_collection(apps, schema_editor)
+    collection.drop_index(LOCATION_INDEX_NAME)
+    collection.update_many({}, {"$unset": {"location": ""}})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pharmacy", "0003_pharmacy_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pharmacy",
+            name="location",
+            field=pharmacy.fields.PointField(blank=True, null=True),
+        ),
+        migrations.RunPython(add_location, remove_location),
+    ]
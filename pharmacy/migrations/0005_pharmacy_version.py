@@ -0,0 +1,30 @@
+# Generated by Django 4.1.13 on 2026-10-18 16:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+import pharmacy.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pharmacy", "0004_pharmacy_location"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pharmacy",
+            name="updated_at",
+            field=pharmacy.fields.BSONDateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="pharmacy",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name="pharmacy",
+            index=models.Index(fields=["id", "version", "updated_at"], name="pharmacy_id_version_idx"),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.13 on 2026-10-18 15:54
+
+from django.db import migrations, models
+
+import pharmacy.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pharmacy", "0005_pharmacy_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PharmacyTombstone",
+            fields=[
+                ("pharmacy_id", models.IntegerField(primary_key=True, serialize=False)),
+                ("deleted_at", pharmacy.fields.BSONDateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="pharmacy",
+            index=models.Index(fields=["updated_at", "id"], name="pharmacy_updated_at_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="pharmacytombstone",
+            index=models.Index(fields=["deleted_at", "pharmacy_id"], name="tombstone_deleted_at_id_idx"),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import migrations
+
+# MongoDB deletes the tombstones past their retention in the background, so deletes do not prune them. A TTL index
+# holds a single field, so it cannot be the (deleted_at, pharmacy_id) index the change feed reads.
+TOMBSTONE_TTL_INDEX_NAME = "tombstone_deleted_at_ttl"
+
+
+def get_collection(apps, schema_editor):
+    schema_editor.connection.ensure_connection()
+    return schema_editor.connection.connection[apps.get_model("pharmacy", "PharmacyTombstone")._meta.db_table]
+
+
+def add_ttl_index(apps, schema_editor):
+    collection = get_collection(apps, schema_editor)
+    collection.create_index(
+        "deleted_at",
+        name=TOMBSTONE_TTL_INDEX_NAME,
+        expireAfterSeconds=settings.PHARMACY_CHANGES_RETENTION_DAYS * 24 * 3600,
+    )
+
+
+def remove_ttl_index(apps, schema_editor):
+    get_collection(apps, schema_editor).drop_index(TOMBSTONE_TTL_INDEX_NAME)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pharmacy", "0006_pharmacy_changes"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_ttl_index, remove_ttl_index),
+    ]
@@ -1,8 +1,38 @@
 from djongo import models
 
+from .fields import BSONDateTimeField, PointField
+
 
 class Pharmacy(models.Model):
     name = models.CharField(max_length=100)
     address = models.CharField(max_length=300)
     phone_number = models.CharField(max_length=20)
     license_number = models.CharField(max_length=50)
+    location = PointField(null=True, blank=True)
+    updated_at = BSONDateTimeField(auto_now=True)
+    # Incremented by every write, for ETags and optimistic concurrency.
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["license_number"], name="pharmacy_license_number_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["name", "id"], name="pharmacy_name_id_idx"),
+            # Covers the version lookups of conditional requests, which then skip reading the documents.
+            models.Index(fields=["id", "version", "updated_at"], name="pharmacy_id_version_idx"),
+            # Orders and bounds the change feed, which pages on (updated_at, id).
+            models.Index(fields=["updated_at", "id"], name="pharmacy_updated_at_id_idx"),
+        ]
+
+
+class PharmacyTombstone(models.Model):
+    """The record of a deleted pharmacy, which the change feed reports until it is pruned."""
+
+    pharmacy_id = models.IntegerField(primary_key=True)
+    deleted_at = BSONDateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "pharmacy_id"], name="tombstone_deleted_at_id_idx"),
+        ]
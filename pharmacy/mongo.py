@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
+
+from .models import Pharmacy
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# Motor clients are bound to the event loop they were created in.
+async_clients = WeakKeyDictionary()
+
+
+def get_database(using=DEFAULT_DB_ALIAS):
+    """Get the PyMongo database behind a djongo connection.
+
+    djongo keeps a single pooled `MongoClient` per database for the whole process,
+    so going through the connection reuses that pool instead of opening a new one.
+
+    Parameters:
+    - using (str): The alias of the database connection.
+
+    Returns:
+    - pymongo.database.Database: The database of the connection.
+    """
+
+    connection = connections[using]
+    connection.ensure_connection()
+    return connection.connection
+
+
+def warm_up(using=DEFAULT_DB_ALIAS):
+    """Create the process's client of a database and open its first connection.
+
+    PyMongo then opens the connections of `minPoolSize` in the background, so the
+    first requests of a worker do not wait for server selection and handshakes.
+
+    Parameters:
+    - using (str): The alias of the database connection.
+    """
+
+    get_database(using).command("ping")
+
+
+def warm_up_worker(using=DEFAULT_DB_ALIAS):
+    """Warm up the client of a server worker when `PHARMACY_MONGO_WARM_UP` is enabled.
+
+    It is called by the WSGI and ASGI entrypoints, not when the app is loaded, so
+    management commands never wait for the server. An unreachable server is logged
+    rather than failing the startup.
+
+    Parameters:
+    - using (str): The alias of the database connection.
+    """
+
+    if not settings.PHARMACY_MONGO_WARM_UP:
+        return
+    try:
+        warm_up(using)
+    except (DatabaseError, PyMongoError) as error:
+        logger.warning("MongoDB warm-up failed: %s", error)
+
+
+def is_primary_read_preference(read_preference):
+    """Check whether a read preference reads from the primary, so its reads are never stale.
+
+    Parameters:
+    - read_preference (str): The read preference mode, or `None` for the client's (the primary).
+
+    Returns:
+    - bool: `True` for `"primary"` or no read preference.
+    """
+
+    return not read_preference or read_preference == "primary"
+
+
+def with_read_preference(collection, read_preference=None):
+    """Get a collection reading from the members of a read preference.
+
+    Parameters:
+    - collection (Collection): A PyMongo or Motor collection.
+    - read_preference (str): The read preference mode, e.g. `"secondaryPreferred"`; the client's by default.
+
+    Returns:
+    - Collection: The collection with the read preference.
+    """
+
+    if is_primary_read_preference(read_preference):
+        return collection
+    return collection.with_options(
+        read_preference=make_read_preference(read_pref_mode_from_name(read_preference), None)
+    )
+
+
+def get_collection(model=Pharmacy, using=DEFAULT_DB_ALIAS, read_preference=None):
+    """Get the PyMongo collection that stores a model's documents.
+
+    Parameters:
+    - model (Model): The model class, `Pharmacy` by default.
+    - using (str): The alias of the database connection.
+    - read_preference (str): The read preference mode of the collection, the client's by default.
+
+    Returns:
+    - pymongo.collection.Collection: The collection of the model.
+    """
+
+    return with_read_preference(get_database(using)[model._meta.db_table], read_preference)
+
+
+def import_motor():
+    """Import Motor's asyncio API, which only the async views need.
+
+    Returns:
+    - module: The `motor.motor_asyncio` module.
+
+    Raises:
+    - ImproperlyConfigured: If Motor is missing or cannot be imported.
+    """
+
+    try:
+        from motor import motor_asyncio
+    except (ImportError, AttributeError) as error:
+        # Motor 2.x, the line supporting PyMongo 3, uses asyncio.coroutine, which Python 3.11 removed.
+        raise ImproperlyConfigured(
+            f"PHARMACY_API_MODE=async requires Motor, which cannot be imported ({error}). "
+            "Motor 2.x (required by PyMongo 3) runs on Python 3.10 or older."
+        ) from error
+    return motor_asyncio
+
+
+def check_api_mode():
+    """Check the async views can run, if `PHARMACY_API_MODE` is `"async"`.
+
+    Raises:
+    - ImproperlyConfigured: If Motor cannot be imported.
+    """
+
+    if settings.PHARMACY_API_MODE == "async":
+        import_motor()
+
+
+def get_async_client(using=DEFAULT_DB_ALIAS):
+    """Get the Motor client of a database for the running event loop.
+
+    A single pooled client is created per event loop, so all the requests served
+    by an ASGI worker share its connection pool. It is configured with the same
+    `CLIENT` options djongo passes to its `MongoClient`.
+
+    Parameters:
+    - using (str): The alias of the database connection.
+
+    Returns:
+    - motor.motor_asyncio.AsyncIOMotorClient: The client of the running event loop.
+    """
+
+    # Motor is only needed by the async API, so the synchronous API does not depend on it.
+    motor_asyncio = import_motor()
+
+    loop = asyncio.get_running_loop()
+    clients = async_clients.setdefault(loop, {})
+    if using not in clients:
+        clients[using] = motor_asyncio.AsyncIOMotorClient(
+            **connections[using].settings_dict.get("CLIENT", {}), io_loop=loop
+        )
+    return clients[using]
+
+
+def get_async_collection(model=Pharmacy, using=DEFAULT_DB_ALIAS, read_preference=None):
+    """Get the Motor collection that stores a model's documents.
+
+    Parameters:
+    - model (Model): The model class, `Pharmacy` by default.
+    - using (str): The alias of the database connection.
+    - read_preference (str): The read preference mode of the collection, the client's by default.
+
+    Returns:
+    - motor.motor_asyncio.AsyncIOMotorCollection: The collection of the model.
+    """
+
+    collection = get_async_client(using)[connections[using].settings_dict["NAME"]][model._meta.db_table]
+    return with_read_preference(collection, read_preference)
+
+
+def is_duplicate_key_error(error):
+    """Check whether an error was caused by a MongoDB duplicate key error.
+
+    djongo wraps PyMongo errors in its own database errors, so the whole chain of
+    causes is inspected.
+
+    Parameters:
+    - error (Exception): The raised error.
+
+    Returns:
+    - bool: `True` if the error or one of its causes is a duplicate key error.
+    """
+
+    while error is not None:
+        if isinstance(error, DuplicateKeyError):
+            return True
+        if isinstance(error, BulkWriteError) and any(
+            write_error["code"] == DUPLICATE_KEY_ERROR_CODE for write_error in error.details.get("writeErrors", [])
+        ):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
@@ -0,0 +1,177 @@
+from collections import OrderedDict
+
+from django.core.paginator import Paginator
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+class PharmacyPageNumberPagination(PageNumberPagination):
+    """Page-number pagination that takes its total count from the view's count provider.
+
+    Views that define `get_count_provider()` get their `count` from it instead of a
+    `COUNT(*)` over the queryset, and the response tells whether that count is exact
+    or estimated. Other views fall back to the exact queryset count.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        self.count_exact = True
+        get_count_provider = getattr(view, "get_count_provider", None)
+        if get_count_provider is not None:
+            self.count, self.count_exact = get_count_provider().count(
+                name=request.query_params.get("name"), documents=queryset
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        """Build the Django paginator, seeding its count when it is already known."""
+
+        paginator = Paginator(object_list, per_page)
+        if self.count is not None:
+            paginator.count = self.count
+        return paginator
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.page.paginator.count),
+                    ("count_exact", self.count_exact),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_exact"] = {
+            "type": "boolean",
+            "example": True,
+        }
+        return response_schema
+
+
+class PharmacyCursorPagination(CursorPagination):
+    """Keyset pagination for pharmacies.
+
+    Every page is a single range query on the primary key (`id > position` or
+    `id < position` when paging backwards) limited to `page_size + 1` rows, so
+    the cost of a page does not depend on how deep it is and no `count()` is
+    ever issued. When the list is filtered by `name` the results are ordered
+    by `(name, id)` so the compound index on those fields serves the query.
+
+    The cursors returned in `next`/`previous` are opaque tokens that encode
+    the boundary `id` of the current page and the paging direction.
+    """
+
+    ordering = ("id",)
+    position_field = "id"
+
+    def get_ordering(self, request, queryset, view):
+        """Get the ordering of the paginated queryset.
+
+        Returns:
+        - tuple: `("name", "id")` when filtering by name, `("id",)` otherwise.
+        """
+
+        if request.query_params.get("name"):
+            return ("name", self.position_field)
+        return self.ordering
+
+    def decode_cursor(self, request):
+        """Decode the request cursor and validate its position as an integer id."""
+
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+
+        try:
+            position = int(cursor.position) if cursor.position is not None else None
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Narrow a queryset (or document set) to the rows of the requested page and the one following it.
+
+        The rows are then read by `paginate_queryset()`, or awaited by the async views
+        over a Motor document set, and handed to `set_page()`.
+
+        Returns:
+        - QuerySet | PharmacyDocumentSet: The range of the page, or `None` if pagination is disabled.
+
+        Raises:
+        - NotFound: If the cursor is invalid.
+        """
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.cursor = self.decode_cursor(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        position = self.cursor.position if self.cursor is not None else None
+
+        if self.cursor is not None and self.cursor.reverse:
+            queryset = queryset.order_by(*["-" + field for field in self.ordering])
+            if position is not None:
+                queryset = queryset.filter(**{f"{self.position_field}__lt": position})
+        else:
+            queryset = queryset.order_by(*self.ordering)
+            if position is not None:
+                queryset = queryset.filter(**{f"{self.position_field}__gt": position})
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        """Set the page from the rows read from `get_page_queryset()`.
+
+        Returns:
+        - list: The rows of the page, in order.
+        """
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        # Paging forwards from a position means there is something behind us,
+        # and paging backwards from a position means there is something ahead.
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        return self.page
+
+    def _get_boundary_position(self, index):
+        return self._get_position_from_instance(self.page[index], (self.position_field,))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_boundary_position(-1) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=str(position)))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_boundary_position(0) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=str(position)))
@@ -0,0 +1,407 @@
+import json
+import logging
+import queue
+import random
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from hashlib import md5
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from pymongo import DESCENDING, monitoring
+from pymongo.errors import PyMongoError
+
+from .models import Pharmacy
+from .mongo import get_database
+
+logger = logging.getLogger(__name__)
+
+# Commands whose plan can be explained; explaining a write does not apply it.
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+
+# Plan stages flagged as offenders: full collection scans and in-memory (blocking) sorts.
+FLAGGED_STAGES = {"COLLSCAN", "SORT"}
+
+# Collections whose commands are captured. The others (e.g. the token lookups of the authentication) can carry
+# credentials in their values, and are never captured.
+PROFILED_COLLECTIONS = {Pharmacy._meta.db_table}
+
+# Command fields that belong to the session, the connection or the write rather than to the query.
+SESSION_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"}
+
+# Collection the captured queries are stored in, kept for a week by a TTL index.
+SLOW_QUERY_COLLECTION = "pharmacy_slow_queries"
+SLOW_QUERY_RETENTION_SECONDS = 7 * 24 * 3600
+
+# The profiled request being served in the current thread or task.
+current_profile = ContextVar("pharmacy_query_profile", default=None)
+
+
+class QueryProfile:
+    """The origin of the MongoDB commands of a request: its view and the last SQL djongo received."""
+
+    __slots__ = ("view", "sql", "commands")
+
+    def __init__(self, view=None):
+        self.view = view
+        self.sql = None
+        # The started commands by request id, until they succeed or fail.
+        self.commands = {}
+
+    def take_sql(self, collection):
+        """Get the SQL that produced a command on a collection, if djongo translated it.
+
+        djongo sends the commands of a statement (on its table) right after receiving it;
+        each statement is attributed to the first command on its table only, so commands
+        the repositories send natively afterwards are not attributed to it.
+        """
+
+        if self.sql is None or f'"{collection}"' not in self.sql:
+            return None
+        sql, self.sql = self.sql, None
+        return sql
+
+
+def get_explain_command(command):
+    """Get the query of a command, without its session and connection fields, to explain it.
+
+    Parameters:
+    - command (dict): The command sent to MongoDB.
+
+    Returns:
+    - dict: The command to pass to `explain`.
+    """
+
+    return {name: value for name, value in command.items() if not name.startswith("$") and name not in SESSION_FIELDS}
+
+
+def get_query_shape(command_name, command):
+    """Get the shape of a query: its command with every literal value replaced by `"?"`.
+
+    Queries that only differ by their values have the same shape, so offenders are grouped by shape.
+
+    Parameters:
+    - command_name (str): The command name, e.g. `"find"`.
+    - command (dict): The command to explain.
+
+    Returns:
+    - str: The shape, as JSON.
+    """
+
+    def shape(value, key=None):
+        if isinstance(value, dict):
+            return {name: shape(item, name) for name, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            if key in ("$in", "$nin", "$all"):
+                return ["?"]
+            return [shape(item) for item in value]
+        return "?"
+
+    parts = {command_name: command.get(command_name)}
+    for name in ("filter", "query", "pipeline", "sort", "q", "updates", "deletes"):
+        if name in command:
+            parts[name] = command[name] if name == "sort" else shape(command[name])
+    return json.dumps(parts, default=str)
+
+
+def get_plan_stages(explain):
+    """Get every stage name of an explain output, whatever its shape (find, aggregate, sharded...).
+
+    Parameters:
+    - explain (dict): The output of `explain`.
+
+    Returns:
+    - list: The stage names, e.g. `["FETCH", "IXSCAN"]`.
+    """
+
+    stages = []
+    if isinstance(explain, dict):
+        if isinstance(explain.get("stage"), str):
+            stages.append(explain["stage"])
+        for name, value in explain.items():
+            if name != "rejectedPlans":
+                stages.extend(get_plan_stages(value))
+    elif isinstance(explain, list):
+        for value in explain:
+            stages.extend(get_plan_stages(value))
+    return stages
+
+
+def find_execution_stats(explain):
+    """Find the `executionStats` of an explain output.
+
+    Returns:
+    - dict: The execution statistics, or an empty dict.
+    """
+
+    if isinstance(explain, dict):
+        if isinstance(explain.get("executionStats"), dict):
+            return explain["executionStats"]
+        values = explain.values()
+    elif isinstance(explain, list):
+        values = explain
+    else:
+        return {}
+    for value in values:
+        stats = find_execution_stats(value)
+        if stats:
+            return stats
+    return {}
+
+
+def get_slow_query_collection(using=DEFAULT_DB_ALIAS):
+    """Get the collection of the captured queries.
+
+    Parameters:
+    - using (str): The alias of the database connection.
+
+    Returns:
+    - pymongo.collection.Collection: The `pharmacy_slow_queries` collection.
+    """
+
+    return get_database(using)[SLOW_QUERY_COLLECTION]
+
+
+class SlowQueryRecorder:
+    """Explain captured commands with `executionStats` and store them, in a background thread.
+
+    Explaining runs the query again, so it never delays the request that sent it:
+    captures are queued (and dropped when `queue_size` are pending) and a daemon thread
+    explains them, logs them (a warning for flagged plans) and stores them in the
+    `pharmacy_slow_queries` collection read by the `pharmacy_slow_queries` command.
+
+    Parameters:
+    - using (str): The alias of the database connection.
+    - queue_size (int): The maximum number of pending captures.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, queue_size=100):
+        self.using = using
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.lock = threading.Lock()
+        self.collection_ready = False
+
+    def submit(self, capture):
+        """Queue a captured command to explain, dropping it if too many are pending.
+
+        Returns:
+        - bool: Whether the capture was queued.
+        """
+
+        try:
+            self.queue.put_nowait(capture)
+        except queue.Full:
+            return False
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name="pharmacy-slow-queries", daemon=True)
+                self.thread.start()
+        return True
+
+    def join(self):
+        """Wait until every queued capture is processed."""
+
+        self.queue.join()
+
+    def run(self):
+        while True:
+            capture = self.queue.get()
+            try:
+                self.process(capture)
+            except Exception:
+                logger.exception("Could not explain the captured %s command.", capture["command_name"])
+            finally:
+                self.queue.task_done()
+
+    def get_collection(self):
+        collection = get_slow_query_collection(self.using)
+        if not self.collection_ready:
+            collection.create_index("captured_at", expireAfterSeconds=SLOW_QUERY_RETENTION_SECONDS)
+            self.collection_ready = True
+        return collection
+
+    def explain(self, database, command):
+        return get_database(self.using).client[database].command({"explain": command, "verbosity": "executionStats"})
+
+    def process(self, capture):
+        """Explain a captured command, then log and store it.
+
+        Parameters:
+        - capture (dict): The capture built by `QueryProfiler`.
+
+        Returns:
+        - dict: The stored record.
+        """
+
+        command = get_explain_command(capture["command"])
+        try:
+            explain = self.explain(capture["database"], command)
+        except PyMongoError as error:
+            explain = {"error": str(error)}
+        stages = get_plan_stages(explain)
+        stats = find_execution_stats(explain)
+        # Only the shape of the command is logged and stored, never its literal values.
+        shape = get_query_shape(capture["command_name"], command)
+        record = {
+            "captured_at": datetime.now(timezone.utc),
+            "reason": capture["reason"],
+            "view": capture["view"],
+            "sql": capture["sql"],
+            "database": capture["database"],
+            "collection": command.get(capture["command_name"]),
+            "command_name": capture["command_name"],
+            "command": shape,
+            "shape": md5(shape.encode("utf-8")).hexdigest(),
+            "duration_ms": capture["duration_ms"],
+            "stages": stages,
+            "flags": sorted(FLAGGED_STAGES.intersection(stages)),
+            "docs_examined": stats.get("totalDocsExamined"),
+            "keys_examined": stats.get("totalKeysExamined"),
+            "returned": stats.get("nReturned"),
+        }
+        log = logger.warning if record["flags"] else logger.info
+        log(
+            "%s query (%s, %.1f ms%s) from %s: SQL %s -> %s",
+            "Flagged" if record["flags"] else "Captured",
+            record["reason"],
+            record["duration_ms"],
+            f", {'/'.join(record['flags'])}" if record["flags"] else "",
+            record["view"],
+            record["sql"],
+            record["command"],
+        )
+        self.get_collection().insert_one(dict(record))
+        return record
+
+
+recorder = SlowQueryRecorder()
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """Capture the MongoDB commands of profiled requests that are slow, or sampled.
+
+    A command is captured when it takes at least `PHARMACY_SLOW_QUERY_MS` milliseconds,
+    or at random with the `PHARMACY_SLOW_QUERY_SAMPLE_RATE` probability (to catch plans
+    that are only fast on small collections), and handed to `recorder` to be explained.
+    Only the commands on `PROFILED_COLLECTIONS` of requests profiled by
+    `PharmacyQueryProfilerMiddleware` are considered, never those of the recorder itself.
+    """
+
+    def __init__(self, recorder=recorder):
+        self.recorder = recorder
+
+    def started(self, event):
+        profile = current_profile.get()
+        if profile is None or event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if collection not in PROFILED_COLLECTIONS:
+            return
+        profile.commands[event.request_id] = (
+            event.database_name,
+            event.command_name,
+            dict(event.command),
+            profile.take_sql(collection),
+        )
+
+    def succeeded(self, event):
+        self.finish(event)
+
+    def failed(self, event):
+        self.finish(event)
+
+    def finish(self, event):
+        profile = current_profile.get()
+        if profile is None:
+            return
+        started = profile.commands.pop(event.request_id, None)
+        if started is None:
+            return
+
+        duration_ms = event.duration_micros / 1000
+        threshold = settings.PHARMACY_SLOW_QUERY_MS
+        if threshold is not None and duration_ms >= threshold:
+            reason = "slow"
+        elif random.random() < settings.PHARMACY_SLOW_QUERY_SAMPLE_RATE:
+            reason = "sample"
+        else:
+            return
+
+        database, command_name, command, sql = started
+        self.recorder.submit(
+            {
+                "reason": reason,
+                "view": profile.view,
+                "sql": sql,
+                "database": database,
+                "command_name": command_name,
+                "command": command,
+                "duration_ms": duration_ms,
+            }
+        )
+
+
+def is_profiling_enabled():
+    return settings.PHARMACY_SLOW_QUERY_MS is not None or settings.PHARMACY_SLOW_QUERY_SAMPLE_RATE > 0
+
+
+def get_view_name(view_func):
+    """Get the name of the view (and viewset action) serving a request, e.g. `PharmacyViewSet.list`.
+
+    Parameters:
+    - view_func (callable): The view function resolved for the request.
+
+    Returns:
+    - str: The dotted name of the view.
+    """
+
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__qualname__}"
+    name = f"{view_class.__module__}.{view_class.__qualname__}"
+    actions = getattr(view_func, "actions", None)
+    return f"{name}.{'/'.join(sorted(set(actions.values())))}" if actions else name
+
+
+def get_top_offenders(collection, limit=10, flagged=False):
+    """Group the captured queries by shape, worst first.
+
+    Parameters:
+    - collection (Collection): The collection of the captured queries.
+    - limit (int): The maximum number of groups.
+    - flagged (bool): Whether to only group the captured queries with a flagged stage.
+
+    Returns:
+    - list: A dict per shape with its `count`, `max_ms`, `avg_ms`, `flags`, `view`, `sql`, `command`
+      (of its slowest capture) and `docs_examined` (max), flagged shapes first, then by total time.
+    """
+
+    groups = {}
+    query = {"flags": {"$ne": []}} if flagged else {}
+    for record in collection.find(query, {"_id": False}).sort("captured_at", DESCENDING):
+        group = groups.get(record["shape"])
+        if group is None:
+            group = groups[record["shape"]] = {
+                "shape": record["shape"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "flags": set(),
+                "docs_examined": 0,
+            }
+        group["count"] += 1
+        group["total_ms"] += record["duration_ms"]
+        group["flags"].update(record["flags"])
+        group["docs_examined"] = max(group["docs_examined"], record.get("docs_examined") or 0)
+        if record["duration_ms"] >= group["max_ms"]:
+            group.update(
+                max_ms=record["duration_ms"], view=record["view"], sql=record["sql"], command=record["command"]
+            )
+
+    offenders = sorted(groups.values(), key=lambda group: (not group["flags"], -group["total_ms"]))[:limit]
+    for group in offenders:
+        group["avg_ms"] = group["total_ms"] / group["count"]
+        group["flags"] = sorted(group["flags"])
+    return offenders
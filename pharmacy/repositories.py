@@ -0,0 +1,845 @@
+import heapq
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .fields import bson_now
+from .models import Pharmacy, PharmacyTombstone
+from .mongo import get_async_collection, get_collection
+
+LOOKUP_OPERATORS = {
+    "exact": None,
+    "gt": "$gt",
+    "gte": "$gte",
+    "lt": "$lt",
+    "lte": "$lte",
+    "in": "$in",
+}
+
+# Collation of the `pharmacy_name_ci_idx` index; case-insensitive queries must use it to be served by the index.
+CASE_INSENSITIVE_COLLATION = {"locale": "en", "strength": 2}
+
+# A prefix match runs under a case-insensitive collation, which would also apply to an exact name match.
+NAME_FILTERS_ERROR = "`name` and `name__startswith` cannot be combined."
+
+# Under a collation U+FFFF sorts after every character, so `[prefix, prefix + U+FFFF)` holds the strings
+# starting with the prefix and a prefix search is an index range scan instead of a regex.
+COLLATION_MAX_CHARACTER = "\uffff"
+
+
+def get_change_query(time_field, id_field, since=None, until=None):
+    """Get the query of the changes after a position of the change feed, as a range on a `(time, id)` index.
+
+    Parameters:
+    - time_field (str): The field holding the time of the change.
+    - id_field (str): The field holding the primary key of the pharmacy.
+    - since (tuple): The `(time, id)` position to read after, from the start by default.
+    - until (datetime): The time of the last changes to read, all of them by default.
+
+    Returns:
+    - dict: The query.
+    """
+
+    time_range = {}
+    query = {}
+    if since is not None:
+        time, pk = since
+        time_range["$gte"] = time
+        query["$or"] = [{time_field: {"$gt": time}}, {id_field: {"$gt": pk}}]
+    if until is not None:
+        time_range["$lte"] = until
+    if time_range:
+        query[time_field] = time_range
+    return query
+
+
+class PharmacyDocumentSet:
+    """A lazy, queryset-like set of pharmacy documents read directly through PyMongo.
+
+    It supports the subset of the `QuerySet` API used by the views and paginators
+    (`filter`, `order_by`, `get`, `count`, slicing and iteration) and yields plain
+    dicts holding only the projected model fields, which serializers render as they
+    render model instances. `search()` adds a text search ordered by relevance.
+
+    Building the query does not touch the collection, so a set over a Motor
+    collection can build the query and its cursor for the async views.
+    """
+
+    model = Pharmacy
+
+    def __init__(self, collection, query=None, sort=None, projection=None, skip=0, limit=None, collation=None):
+        self.collection = collection
+        self.query = query or {}
+        self.sort = sort or []
+        self.projection = projection or self.get_default_projection()
+        self.skip = skip
+        self.limit = limit
+        self.collation = collation
+        self._result_cache = None
+
+    @classmethod
+    def get_default_projection(cls):
+        projection = {field.attname: True for field in cls.model._meta.concrete_fields}
+        projection["_id"] = False
+        return projection
+
+    def _clone(self, **kwargs):
+        params = {
+            "query": dict(self.query),
+            "sort": list(self.sort),
+            "projection": dict(self.projection),
+            "skip": self.skip,
+            "limit": self.limit,
+            "collation": self.collation,
+        }
+        params.update(kwargs)
+        return self.__class__(self.collection, **params)
+
+    def _to_python(self, field_name, value):
+        field = self.model._meta.get_field(field_name)
+        if isinstance(value, (list, tuple, set)):
+            return [field.to_python(item) for item in value]
+        return field.to_python(value)
+
+    def _get_field_name(self, name):
+        return self.model._meta.pk.attname if name == "pk" else name
+
+    @property
+    def ordered(self):
+        return bool(self.sort)
+
+    def filter(self, **lookups):
+        """Narrow the set with Django-style lookups (`field`, `field__gt`, `field__in`, ...).
+
+        `field__istartswith` is a case-insensitive prefix match run as a range query
+        under `CASE_INSENSITIVE_COLLATION`, which applies to the whole query. It cannot
+        be combined with other lookups of the same field, which would be overwritten by
+        the range or made case-insensitive by the collation.
+
+        Raises:
+        - ValueError: If a lookup is not supported, or combines `istartswith` with another lookup of its field.
+        - ValidationError: If a value is not valid for its field.
+        """
+
+        query = dict(self.query)
+        collation = self.collation
+        for lookup, value in lookups.items():
+            field_name, _, operator = lookup.partition("__")
+            field_name = self._get_field_name(field_name)
+            if field_name in query and (operator == "istartswith" or collation == CASE_INSENSITIVE_COLLATION):
+                raise ValueError(f"Unsupported lookup: {lookup} cannot be combined with another lookup of its field")
+            if operator == "istartswith":
+                value = self._to_python(field_name, value)
+                query[field_name] = {"$gte": value, "$lt": value + COLLATION_MAX_CHARACTER}
+                collation = CASE_INSENSITIVE_COLLATION
+                continue
+            if (operator or "exact") not in LOOKUP_OPERATORS:
+                raise ValueError(f"Unsupported lookup: {lookup}")
+
+            value = self._to_python(field_name, value)
+            mongo_operator = LOOKUP_OPERATORS[operator or "exact"]
+            if mongo_operator is None:
+                query[field_name] = value
+            else:
+                condition = query.get(field_name)
+                if not isinstance(condition, dict):
+                    condition = {} if condition is None else {"$eq": condition}
+                condition[mongo_operator] = value
+                query[field_name] = condition
+        return self._clone(query=query, collation=collation)
+
+    def search(self, text):
+        """Narrow the set to the documents matching a text search of their name and address.
+
+        The search uses the `pharmacy_name_address_text` index and the documents are
+        ordered by relevance (then id).
+
+        Parameters:
+        - text (str): The words to search, with MongoDB `$text` syntax (phrases in quotes, `-excluded` words).
+
+        Returns:
+        - PharmacyDocumentSet: The matching documents, ordered by relevance.
+        """
+
+        score = {"$meta": "textScore"}
+        return self._clone(
+            query=dict(self.query, **{"$text": {"$search": text}}),
+            projection=dict(self.projection, score=score),
+            sort=[("score", score), ("id", ASCENDING)],
+        )
+
+    def order_by(self, *fields):
+        sort = []
+        for field in fields:
+            direction = DESCENDING if field.startswith("-") else ASCENDING
+            sort.append((self._get_field_name(field.lstrip("-")), direction))
+        return self._clone(sort=sort)
+
+    def get(self, **lookups):
+        """Get the single document matching the lookups.
+
+        Raises:
+        - Pharmacy.DoesNotExist: If no document matches the lookups.
+        """
+
+        documents = self.filter(**lookups)
+        document = self.collection.find_one(documents.query, documents.projection, collation=documents.collation)
+        if document is None:
+            raise self.model.DoesNotExist(f"{self.model._meta.object_name} matching query does not exist.")
+        return document
+
+    def count(self):
+        return self.collection.count_documents(self.query, collation=self.collation)
+
+    def values(self, *fields):
+        """Restrict the projection of the documents to the given fields.
+
+        Returns:
+        - PharmacyDocumentSet: The documents holding only the given fields.
+        """
+
+        projection = {self._get_field_name(field): True for field in fields}
+        projection["_id"] = False
+        # Keep the text score, which the relevance ordering of a search needs.
+        projection.update({field: value for field, value in self.projection.items() if isinstance(value, dict)})
+        return self._clone(projection=projection)
+
+    def _get_cursor(self):
+        cursor = self.collection.find(self.query, self.projection, collation=self.collation)
+        if self.sort:
+            cursor = cursor.sort(self.sort)
+        if self.skip:
+            cursor = cursor.skip(self.skip)
+        if self.limit is not None:
+            cursor = cursor.limit(self.limit)
+        return cursor
+
+    def iterator(self, chunk_size=None):
+        """Iterate over the documents through a server-side cursor without caching them.
+
+        Parameters:
+        - chunk_size (int): The number of documents fetched per round trip.
+
+        Returns:
+        - pymongo.cursor.Cursor: The cursor of the documents.
+        """
+
+        cursor = self._get_cursor()
+        if chunk_size:
+            cursor = cursor.batch_size(chunk_size)
+        return cursor
+
+    def _fetch_all(self):
+        if self._result_cache is None:
+            self._result_cache = list(self._get_cursor())
+        return self._result_cache
+
+    def __iter__(self):
+        return iter(self._fetch_all())
+
+    def __len__(self):
+        return len(self._fetch_all())
+
+    def __getitem__(self, key):
+        if self._result_cache is not None:
+            return self._result_cache[key]
+        if isinstance(key, int):
+            return self[key : key + 1]._fetch_all()[0]
+        if key.step is not None or (key.start or 0) < 0 or (key.stop is not None and key.stop < 0):
+            raise ValueError("Only non-negative slices without a step are supported.")
+
+        start = self.skip + (key.start or 0)
+        limit = None if key.stop is None else max(key.stop - (key.start or 0), 0)
+        if self.limit is not None:
+            remaining = max(self.limit - (key.start or 0), 0)
+            limit = remaining if limit is None else min(limit, remaining)
+        return self._clone(skip=start, limit=limit)
+
+
+class PharmacyRepository:
+    """Native PyMongo access to pharmacy documents.
+
+    Reads skip djongo's SQL-to-Mongo translation and go straight to the collection
+    through the process-wide pooled `MongoClient`, returning plain dicts in the same
+    `id` order as the ORM. Bulk writes are sent as single `insert_many`/`bulk_write`
+    commands and keep djongo's auto-increment ids.
+    """
+
+    schema_collection_name = "__schema__"
+
+    model = Pharmacy
+    tombstone_model = PharmacyTombstone
+    document_set_class = PharmacyDocumentSet
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else get_collection(self.model)
+
+    @property
+    def tombstones(self):
+        return self.collection.database[self.tombstone_model._meta.db_table]
+
+    @classmethod
+    def get_tombstone_retention_start(cls, now):
+        """Get the time before which tombstones are pruned by their TTL index (see `PHARMACY_CHANGES_RETENTION_DAYS`)."""
+
+        return now - timedelta(days=settings.PHARMACY_CHANGES_RETENTION_DAYS)
+
+    @classmethod
+    def get_default_values(cls):
+        """Get the default values of the model fields, stored in inserted documents that lack them.
+
+        Returns:
+        - dict: The default value of every field but the primary key (the current time for `auto_now` fields).
+        """
+
+        now = bson_now()
+        return {
+            field.attname: now if getattr(field, "auto_now", False) else field.get_default()
+            for field in cls.model._meta.concrete_fields
+            if not field.primary_key
+        }
+
+    @classmethod
+    def get_update(cls, values):
+        """Get the update document setting fields, which also bumps the `version` and `updated_at` of the pharmacy.
+
+        Parameters:
+        - values (dict): The fields to set.
+
+        Returns:
+        - dict: The update document.
+        """
+
+        return {"$set": dict(values, updated_at=bson_now()), "$inc": {"version": 1}}
+
+    def all(self):
+        """Get all pharmacy documents ordered by id.
+
+        Returns:
+        - PharmacyDocumentSet: The lazy set of all pharmacy documents.
+        """
+
+        return self.document_set_class(self.collection).order_by("id")
+
+    def find(self, name=None, name_prefix=None, search=None, fields=None):
+        """Find pharmacy documents, optionally filtered by name or searched.
+
+        Parameters:
+        - name (str): The exact name to filter by.
+        - name_prefix (str): A case-insensitive prefix of the name; the documents are ordered by name and id.
+        - search (str): Words to search in the name and address; the documents are ordered by relevance.
+        - fields (list): The only fields to read (the projection), all of them by default.
+
+        Returns:
+        - PharmacyDocumentSet: The lazy set of matching pharmacy documents, ordered by id by default.
+
+        Raises:
+        - ValueError: If both `name` and `name_prefix` are given.
+        """
+
+        if name and name_prefix:
+            raise ValueError(NAME_FILTERS_ERROR)
+        documents = self.all()
+        if name:
+            documents = documents.filter(name=name)
+        if name_prefix:
+            documents = documents.filter(name__istartswith=name_prefix).order_by("name", "id")
+        if search:
+            documents = documents.search(search)
+        if fields:
+            documents = documents.values(*fields)
+        return documents
+
+    def near(self, longitude, latitude, max_distance, limit):
+        """Find the pharmacies closest to a point with `$geoNear` on the `pharmacy_location_2dsphere` index.
+
+        Parameters:
+        - longitude (float): The longitude of the point, in degrees.
+        - latitude (float): The latitude of the point, in degrees.
+        - max_distance (float): The maximum distance from the point, in meters.
+        - limit (int): The maximum number of pharmacies.
+
+        Returns:
+        - list: The pharmacy documents ordered by distance, each with its `distance` from the point in meters.
+        """
+
+        projection = self.document_set_class.get_default_projection()
+        projection["distance"] = True
+        pipeline = [
+            {
+                "$geoNear": {
+                    "near": {"type": "Point", "coordinates": [longitude, latitude]},
+                    "distanceField": "distance",
+                    "maxDistance": max_distance,
+                    "spherical": True,
+                    "key": "location",
+                }
+            },
+            {"$limit": limit},
+            {"$project": projection},
+        ]
+        return list(self.collection.aggregate(pipeline))
+
+    def find_without_location(self, after=0, limit=100):
+        """Find the next pharmacies without a location, for the geocoding backfill.
+
+        Parameters:
+        - after (int): Only find the pharmacies with a greater primary key.
+        - limit (int): The maximum number of pharmacies.
+
+        Returns:
+        - list: The `id` and `address` of the pharmacies, ordered by id.
+        """
+
+        return list(
+            self.collection.find({"location": None, "id": {"$gt": after}}, {"_id": False, "id": True, "address": True})
+            .sort("id", ASCENDING)
+            .limit(limit)
+        )
+
+    def set_locations(self, locations):
+        """Set the location of pharmacies in a single `bulk_write` command.
+
+        Parameters:
+        - locations (dict): The GeoJSON point of every pharmacy, by primary key.
+
+        Returns:
+        - int: The number of updated pharmacies.
+        """
+
+        if not locations:
+            return 0
+        result = self.collection.bulk_write(
+            [UpdateOne({"id": pk}, self.get_update({"location": location})) for pk, location in locations.items()],
+            ordered=False,
+        )
+        return result.modified_count
+
+    def get_version(self, pk):
+        """Get the version of a pharmacy without reading the document, through the `pharmacy_id_version_idx` index.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+
+        Returns:
+        - dict: The `id`, `version` and `updated_at` of the pharmacy, or `None` if it does not exist.
+        """
+
+        return self.collection.find_one({"id": pk}, {"_id": False, "id": True, "version": True, "updated_at": True})
+
+    def find_one(self, pk, fields=None):
+        """Find a pharmacy document by primary key.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+        - fields (list): The only fields to read, all of them by default.
+
+        Returns:
+        - dict: The pharmacy document, or `None` if it does not exist.
+        """
+
+        documents = self.all()
+        if fields:
+            documents = documents.values(*fields)
+        try:
+            return documents.get(pk=pk)
+        except (self.model.DoesNotExist, ValidationError):
+            return None
+
+    def find_many(self, pks, fields=None):
+        """Find pharmacy documents by primary key with a single `$in` query on the `id` index.
+
+        The cursor's first batch holds every found document, so the lookup is a single round trip.
+
+        Parameters:
+        - pks (list): The primary keys of the pharmacies.
+        - fields (list): The only fields to read, all of them by default; `id` is always read.
+
+        Returns:
+        - dict: The found documents by primary key; missing pharmacies are left out.
+        """
+
+        pks = set(pks)
+        documents = self.all().filter(pk__in=list(pks))
+        if fields:
+            documents = documents.values("id", *fields)
+        return {document["id"]: document for document in documents.iterator(chunk_size=len(pks))}
+
+    @classmethod
+    def get_version_query(cls, pk, expected_versions=None):
+        """Get the query matching a pharmacy, if it has one of the expected versions.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+        - expected_versions (set): The accepted versions, any version by default.
+
+        Returns:
+        - dict: The query.
+        """
+
+        query = {"id": pk}
+        if expected_versions is not None:
+            query["version"] = {"$in": sorted(expected_versions)}
+        return query
+
+    def update_one(self, pk, values, expected_versions=None):
+        """Update the fields of a document in a single atomic command, bumping its version.
+
+        The expected versions are checked by the same command, so a concurrent write in
+        between cannot be overwritten.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+        - values (dict): The fields to set.
+        - expected_versions (set): Only update the document if it has one of these versions.
+
+        Returns:
+        - tuple: The documents before and after the update, or `(None, None)` if it does not exist
+          (or has none of `expected_versions`).
+
+        Raises:
+        - DuplicateKeyError: If a unique index rejects the update.
+        """
+
+        query = self.get_version_query(pk, expected_versions)
+        update = self.get_update(values)
+        previous = self.collection.find_one_and_update(
+            query,
+            update,
+            projection=self.document_set_class.get_default_projection(),
+            return_document=ReturnDocument.BEFORE,
+        )
+        if previous is None:
+            return None, None
+        return previous, dict(previous, **update["$set"], version=previous["version"] + 1)
+
+    def delete_one(self, pk):
+        """Delete a document in a single command, recording its deletion for the change feed.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+
+        Returns:
+        - dict: The `id` and `name` of the deleted document, or `None` if it does not exist.
+        """
+
+        document = self.collection.find_one_and_delete({"id": pk}, projection={"_id": False, "id": True, "name": True})
+        if document is not None:
+            self.add_tombstone(pk)
+        return document
+
+    def add_tombstone(self, pk):
+        """Record the deletion of a pharmacy for the change feed.
+
+        The tombstones past their retention are deleted by MongoDB, with the TTL index on
+        `deleted_at`, rather than pruned by every delete.
+
+        Parameters:
+        - pk (int): The primary key of the deleted pharmacy.
+        """
+
+        now = bson_now()
+        self.tombstones.replace_one({"pharmacy_id": pk}, {"pharmacy_id": pk, "deleted_at": now}, upsert=True)
+
+    def changes(self, since=None, until=None, limit=100):
+        """Find the pharmacies written or deleted after a position of the change feed.
+
+        The feed is ordered by time, then id. Pharmacies are read by `(updated_at, id)` on the
+        `pharmacy_updated_at_id_idx` index and tombstones by `(deleted_at, pharmacy_id)` on the
+        `tombstone_deleted_at_id_idx` index, each with a range query of at most `limit` documents,
+        and the two are merged, so the cost depends on the number of changes, not of pharmacies.
+
+        Parameters:
+        - since (tuple): The `(time, id)` position to read after, from the start by default.
+        - until (datetime): The time of the last changes to read, all of them by default.
+        - limit (int): The maximum number of changes.
+
+        Returns:
+        - list: A `(time, id, document)` tuple per change in feed order, whose document is `None` for a deletion.
+        """
+
+        order = [("updated_at", ASCENDING), ("id", ASCENDING)]
+        documents = (
+            self.collection.find(
+                get_change_query("updated_at", "id", since, until), self.document_set_class.get_default_projection()
+            )
+            .sort(order)
+            .limit(limit)
+        )
+        tombstones = (
+            self.tombstones.find(get_change_query("deleted_at", "pharmacy_id", since, until), {"_id": False})
+            .sort([("deleted_at", ASCENDING), ("pharmacy_id", ASCENDING)])
+            .limit(limit)
+        )
+        changes = heapq.merge(
+            ((document["updated_at"], document["id"], document) for document in documents),
+            ((tombstone["deleted_at"], tombstone["pharmacy_id"], None) for tombstone in tombstones),
+            key=lambda change: change[:2],
+        )
+        return list(islice(changes, limit))
+
+    def allocate_ids(self, count):
+        """Reserve consecutive primary keys from djongo's auto-increment counter.
+
+        Parameters:
+        - count (int): The number of primary keys to reserve.
+
+        Returns:
+        - list: The reserved primary keys.
+        """
+
+        auto = self.collection.database[self.schema_collection_name].find_one_and_update(
+            {"name": self.collection.name, "auto": {"$exists": True}},
+            {"$inc": {"auto.seq": count}},
+            return_document=ReturnDocument.AFTER,
+        )
+        last_id = auto["auto"]["seq"]
+        return list(range(last_id - count + 1, last_id + 1))
+
+    def _get_write_errors(self, error):
+        return {write_error["index"]: write_error for write_error in error.details.get("writeErrors", [])}
+
+    def insert_many(self, documents):
+        """Insert documents with new primary keys in a single unordered command.
+
+        Parameters:
+        - documents (list): The documents to insert, without primary keys; missing fields get their default.
+
+        Returns:
+        - list: A result per document, `{"status": "created", "id": pk}` or
+          `{"status": "failed", "error": write_error}` in the order of `documents`.
+        """
+
+        if not documents:
+            return []
+
+        ids = self.allocate_ids(len(documents))
+        defaults = self.get_default_values()
+        write_errors = {}
+        try:
+            self.collection.insert_many(
+                [{**defaults, **document, "id": pk} for document, pk in zip(documents, ids)], ordered=False
+            )
+        except BulkWriteError as error:
+            write_errors = self._get_write_errors(error)
+
+        return [
+            {"status": "failed", "error": write_errors[index]}
+            if index in write_errors
+            else {"status": "created", "id": pk}
+            for index, pk in enumerate(ids)
+        ]
+
+    def upsert_many(self, documents):
+        """Update the documents whose license number exists and insert the others.
+
+        Parameters:
+        - documents (list): The documents to upsert, without primary keys.
+
+        Returns:
+        - list: A result per document in the order of `documents`: `{"status": "created", "id": pk}`,
+          `{"status": "updated", "id": pk, "previous_name": name}` or `{"status": "failed", "error": write_error}`.
+        """
+
+        license_numbers = [document["license_number"] for document in documents]
+        existing = {
+            document["license_number"]: document
+            for document in self.collection.find(
+                {"license_number": {"$in": license_numbers}},
+                {"_id": False, "id": True, "name": True, "license_number": True},
+            )
+        }
+        updates = [index for index, document in enumerate(documents) if document["license_number"] in existing]
+        inserts = [index for index, document in enumerate(documents) if document["license_number"] not in existing]
+        results = [None] * len(documents)
+
+        if updates:
+            write_errors = {}
+            try:
+                self.collection.bulk_write(
+                    [
+                        UpdateOne(
+                            {"license_number": documents[index]["license_number"]}, self.get_update(documents[index])
+                        )
+                        for index in updates
+                    ],
+                    ordered=False,
+                )
+            except BulkWriteError as error:
+                write_errors = self._get_write_errors(error)
+            for position, index in enumerate(updates):
+                current = existing[documents[index]["license_number"]]
+                results[index] = (
+                    {"status": "failed", "error": write_errors[position]}
+                    if position in write_errors
+                    else {"status": "updated", "id": current["id"], "previous_name": current["name"]}
+                )
+
+        for index, result in zip(inserts, self.insert_many([documents[index] for index in inserts])):
+            results[index] = result
+        return results
+
+
+class AsyncPharmacyRepository:
+    """Native Motor access to pharmacy documents for the async views.
+
+    It mirrors the reads and single-document writes of `PharmacyRepository`
+    (documents as plain dicts, djongo's auto-increment ids) with awaitable methods
+    that run on the event loop's pooled Motor client.
+    """
+
+    schema_collection_name = PharmacyRepository.schema_collection_name
+
+    model = Pharmacy
+    tombstone_model = PharmacyTombstone
+    document_set_class = PharmacyDocumentSet
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else get_async_collection(self.model)
+        self.projection = self.document_set_class.get_default_projection()
+
+    @property
+    def tombstones(self):
+        return self.collection.database[self.tombstone_model._meta.db_table]
+
+    async def find(self, name=None, name_prefix=None, search=None, fields=None, skip=0, limit=None):
+        """Find pharmacy documents like `PharmacyRepository.find()`.
+
+        Parameters:
+        - name (str): The exact name to filter by.
+        - name_prefix (str): A case-insensitive prefix of the name.
+        - search (str): Words to search in the name and address.
+        - fields (list): The only fields to read, all of them by default.
+        - skip (int): The number of documents to skip.
+        - limit (int): The maximum number of documents to return.
+
+        Returns:
+        - list: The matching pharmacy documents.
+        """
+
+        documents = self.get_documents(name=name, name_prefix=name_prefix, search=search, fields=fields)
+        documents = documents[skip : None if limit is None else skip + limit]
+        return await documents._get_cursor().to_list(length=limit)
+
+    def get_documents(self, name=None, name_prefix=None, search=None, fields=None):
+        """Get the lazy set of matching documents of `PharmacyRepository.find()` over the Motor collection.
+
+        Document sets only build queries and cursors, whose API Motor shares with PyMongo,
+        so their `count()` and cursors are awaitable here.
+
+        Returns:
+        - PharmacyDocumentSet: The matching documents.
+        """
+
+        return PharmacyRepository(self.collection).find(
+            name=name, name_prefix=name_prefix, search=search, fields=fields
+        )
+
+    async def find_one(self, pk, fields=None):
+        """Find a pharmacy document by primary key.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+        - fields (list): The only fields to read, all of them by default.
+
+        Returns:
+        - dict: The pharmacy document, or `None` if it does not exist.
+        """
+
+        projection = self.projection
+        if fields:
+            projection = dict.fromkeys(fields, True)
+            projection["_id"] = False
+        return await self.collection.find_one({"id": pk}, projection)
+
+    async def allocate_id(self):
+        """Reserve a primary key from djongo's auto-increment counter.
+
+        Returns:
+        - int: The reserved primary key.
+        """
+
+        auto = await self.collection.database[self.schema_collection_name].find_one_and_update(
+            {"name": self.collection.name, "auto": {"$exists": True}},
+            {"$inc": {"auto.seq": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        return auto["auto"]["seq"]
+
+    async def insert_one(self, document):
+        """Insert a document with a new primary key.
+
+        Parameters:
+        - document (dict): The document to insert, without primary key; missing fields get their default.
+
+        Returns:
+        - dict: The inserted document, with its primary key.
+
+        Raises:
+        - DuplicateKeyError: If a unique index rejects the document.
+        """
+
+        document = {**PharmacyRepository.get_default_values(), **document, "id": await self.allocate_id()}
+        await self.collection.insert_one(dict(document))
+        return document
+
+    async def get_version(self, pk):
+        """Get the version of a pharmacy without reading the document, like `PharmacyRepository.get_version()`.
+
+        Returns:
+        - dict: The `id`, `version` and `updated_at` of the pharmacy, or `None` if it does not exist.
+        """
+
+        return await self.collection.find_one(
+            {"id": pk}, {"_id": False, "id": True, "version": True, "updated_at": True}
+        )
+
+    async def update_one(self, pk, values, expected_versions=None):
+        """Update the fields of a document, bumping its version.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+        - values (dict): The fields to set.
+        - expected_versions (set): Only update the document if it has one of these versions.
+
+        Returns:
+        - tuple: The documents before and after the update, or `(None, None)` if it does not exist
+          (or has none of `expected_versions`).
+
+        Raises:
+        - DuplicateKeyError: If a unique index rejects the update.
+        """
+
+        query = PharmacyRepository.get_version_query(pk, expected_versions)
+        update = PharmacyRepository.get_update(values)
+        previous = await self.collection.find_one_and_update(
+            query, update, projection=self.projection, return_document=ReturnDocument.BEFORE
+        )
+        if previous is None:
+            return None, None
+        return previous, dict(previous, **update["$set"], version=previous["version"] + 1)
+
+    async def add_tombstone(self, pk):
+        """Record the deletion of a pharmacy for the change feed, like `PharmacyRepository.add_tombstone()`."""
+
+        now = bson_now()
+        await self.tombstones.replace_one({"pharmacy_id": pk}, {"pharmacy_id": pk, "deleted_at": now}, upsert=True)
+
+    async def delete_one(self, pk):
+        """Delete a document, recording its deletion for the change feed.
+
+        Parameters:
+        - pk (int): The primary key of the pharmacy.
+
+        Returns:
+        - dict: The deleted document, or `None` if it does not exist.
+        """
+
+        document = await self.collection.find_one_and_delete({"id": pk}, projection=self.projection)
+        if document is not None:
+            await self.add_tombstone(pk)
+        return document
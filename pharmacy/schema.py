@@ -0,0 +1,99 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CONTENT_TYPE = "application/vnd.oai.openapi+json"
+
+# The schema served by the process, by file path, read (or generated) once.
+schemas = {}
+schemas_lock = threading.Lock()
+
+
+def generate_schema():
+    """Generate the OpenAPI schema of the API by introspecting its views and serializers.
+
+    Returns:
+    - bytes: The schema, as JSON.
+    """
+
+    # drf-spectacular is only imported to generate the schema, not when the worker boots.
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def get_schema(path=None):
+    """Get the precomputed OpenAPI schema, read from its file once per process.
+
+    Without the file (see the `pharmacy_schema` command), the schema is generated on
+    the first call and kept in memory instead.
+
+    Parameters:
+    - path (str): The schema file, `PHARMACY_SCHEMA_FILE` by default.
+
+    Returns:
+    - bytes: The schema, as JSON.
+    """
+
+    path = str(path or settings.PHARMACY_SCHEMA_FILE)
+    schema = schemas.get(path)
+    if schema is not None:
+        return schema
+
+    with schemas_lock:
+        if path not in schemas:
+            try:
+                with open(path, "rb") as schema_file:
+                    schemas[path] = schema_file.read()
+            except FileNotFoundError:
+                logger.warning("OpenAPI schema file %s not found, generating the schema.", path)
+                schemas[path] = generate_schema()
+        return schemas[path]
+
+
+def lazy_view(view_path, **initkwargs):
+    """Get a view function importing its class-based view on its first request.
+
+    Parameters:
+    - view_path (str): The dotted path of the view class.
+    - **initkwargs: The arguments of `as_view()`.
+
+    Returns:
+    - callable: The view function.
+    """
+
+    view = None
+
+    @csrf_exempt
+    def lazy(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return lazy
+
+
+dynamic_schema_view = lazy_view("drf_spectacular.views.SpectacularAPIView")
+
+
+@require_safe
+def schema_view(request, *args, **kwargs):
+    """Serve the OpenAPI schema (GET /api/schema/) from memory.
+
+    The schema is the precomputed `PHARMACY_SCHEMA_FILE`; in `DEBUG` it is generated
+    on every request instead, so it follows code changes.
+    """
+
+    if settings.DEBUG:
+        return dynamic_schema_view(request, *args, **kwargs)
+    return HttpResponse(get_schema(), content_type=SCHEMA_CONTENT_TYPE)
@@ -1,6 +1,70 @@
+from datetime import timezone
+
+from django.conf import settings
+from django.db import DatabaseError
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.settings import api_settings
 
+from .changes import decode_change_token
+from .metrics import track_serializer
 from .models import Pharmacy
+from .mongo import is_duplicate_key_error
+
+
+@extend_schema_field(
+    {
+        "type": "object",
+        "properties": {
+            "type": {"type": "string", "enum": ["Point"]},
+            "coordinates": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2},
+        },
+        "required": ["type", "coordinates"],
+        "example": {"type": "Point", "coordinates": [31.2357, 30.0444]},
+    }
+)
+class GeoJSONPointField(serializers.Field):
+    """A GeoJSON point: `{"type": "Point", "coordinates": [longitude, latitude]}`.
+
+    Coordinates are in degrees, longitude first as in GeoJSON and MongoDB.
+    """
+
+    default_error_messages = {
+        "invalid": 'Enter a GeoJSON point: {{"type": "Point", "coordinates": [longitude, latitude]}}.',
+        "longitude": "Ensure the longitude is between -180 and 180.",
+        "latitude": "Ensure the latitude is between -90 and 90.",
+    }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, dict) or data.get("type") != "Point":
+            self.fail("invalid")
+        coordinates = data.get("coordinates")
+        if (
+            not isinstance(coordinates, (list, tuple))
+            or len(coordinates) != 2
+            or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in coordinates)
+        ):
+            self.fail("invalid")
+
+        longitude, latitude = (float(value) for value in coordinates)
+        if not -180 <= longitude <= 180:
+            self.fail("longitude")
+        if not -90 <= latitude <= 90:
+            self.fail("latitude")
+        return {"type": "Point", "coordinates": [longitude, latitude]}
+
+    def to_representation(self, value):
+        return {"type": value["type"], "coordinates": list(value["coordinates"])}
+
+
+class UTCDateTimeField(serializers.DateTimeField):
+    """A datetime field rendering naive datetimes, as PyMongo reads them, as UTC."""
+
+    def to_representation(self, value):
+        if value and not isinstance(value, str) and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return super().to_representation(value)
 
 
 class PharmacySerializer(serializers.ModelSerializer):
@@ -12,9 +76,255 @@ class PharmacySerializer(serializers.ModelSerializer):
     - name (string): Name of the pharmacy.
     - address (string): Address of the pharmacy.
     - phone_number (string): Phone number of the pharmacy.
-    - license_number (string): License number of the pharmacy.
+    - license_number (string): License number of the pharmacy (unique).
+    - location (object): GeoJSON point of the pharmacy, `{"type": "Point", "coordinates": [longitude, latitude]}`,
+      or null.
+    - updated_at (string): Date and time of the last change (read-only).
+    - version (integer): Version of the pharmacy, incremented by every change (read-only).
     """
 
+    location = GeoJSONPointField(required=False, allow_null=True)
+    updated_at = UTCDateTimeField(read_only=True)
+
+    default_error_messages = {
+        "duplicate_license_number": "pharmacy with this license number already exists.",
+    }
+
     class Meta:
         model = Pharmacy
-        fields = "__all__"
+        fields = ["id", "name", "address", "phone_number", "license_number", "location", "updated_at", "version"]
+        read_only_fields = ["version"]
+
+    def save(self, **kwargs):
+        """Save the pharmacy, reporting a duplicate license number as a validation error.
+
+        Uniqueness is enforced by the unique index on `license_number` at write time
+        instead of an extra lookup query before every write.
+
+        Raises:
+        - ValidationError: If another pharmacy has the same license number.
+        """
+
+        try:
+            return super().save(**kwargs)
+        except DatabaseError as error:
+            if not is_duplicate_key_error(error):
+                raise
+            raise serializers.ValidationError(
+                {"license_number": [self.error_messages["duplicate_license_number"]]}, code="unique"
+            )
+
+
+class PharmacyBulkListSerializer(serializers.ListSerializer):
+    """List serializer that validates every item on its own.
+
+    Invalid items do not fail the whole list: `validated_data` holds `None` in their
+    place and `item_errors` holds the errors of every item (`{}` for valid items).
+    The list itself must still be a list within `max_length` items.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages["not_a_list"].format(input_type=type(data).__name__)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="not_a_list")
+
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages["max_length"].format(max_length=self.max_length)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="max_length")
+
+        validated_items = []
+        self.item_errors = []
+        for item in data:
+            try:
+                validated_items.append(self.child.run_validation(item))
+                self.item_errors.append({})
+            except serializers.ValidationError as exc:
+                validated_items.append(None)
+                self.item_errors.append(exc.detail)
+        return validated_items
+
+
+class PharmacyBulkSerializer(PharmacySerializer):
+    """Serializer for bulk writes of Pharmacy objects, use it with `many=True`."""
+
+    class Meta(PharmacySerializer.Meta):
+        list_serializer_class = PharmacyBulkListSerializer
+
+
+class PharmacyFastSerializer:
+    """Read-only serializer rendering pharmacies exactly as `PharmacySerializer` does, but faster.
+
+    `PharmacySerializer` builds its field objects and a `ReturnDict` for every
+    instance. This serializer resolves the fields of `PharmacySerializer` once per
+    process into `(name, source, to_representation)` mappings and renders each
+    instance as a plain dict with those mappings. It accepts model instances,
+    `.values()` rows and raw Mongo documents.
+
+    Use it like a DRF serializer for reads: `PharmacyFastSerializer(page, many=True).data`,
+    and pass `fields` (see `parse_fields()`) to render only some of the fields.
+    """
+
+    serializer_class = PharmacySerializer
+    field_mapping = None
+
+    # Fields whose representation only depends on the value type.
+    fast_representations = {
+        serializers.CharField: str,
+        serializers.IntegerField: int,
+    }
+
+    def __init__(self, instance=None, many=False, fields=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.fields = fields
+        self.rendered_fields = self.get_field_mapping()
+        if fields is not None:
+            self.rendered_fields = [field for field in self.rendered_fields if field[0] in fields]
+
+    @classmethod
+    def get_field_mapping(cls):
+        """Get the read fields of `serializer_class`, resolved once per process.
+
+        Returns:
+        - list: A `(name, source, to_representation)` tuple per field; `source` is `None`
+          for fields that need the full DRF `get_attribute()` lookup.
+        """
+
+        if cls.field_mapping is None:
+            mapping = []
+            for field in cls.serializer_class()._readable_fields:
+                to_representation = cls.fast_representations.get(type(field))
+                if to_representation is not None and len(field.source_attrs) == 1:
+                    mapping.append((field.field_name, field.source_attrs[0], to_representation))
+                else:
+                    mapping.append((field.field_name, None, field))
+            cls.field_mapping = mapping
+        return cls.field_mapping
+
+    @classmethod
+    def parse_fields(cls, value):
+        """Parse a comma-separated list of field names, e.g. the `fields` query parameter.
+
+        Parameters:
+        - value (str): The field names, e.g. `"id,name"`.
+
+        Returns:
+        - list: The field names in the order of `serializer_class`, or `None` for all the fields.
+
+        Raises:
+        - ValidationError: If a field does not exist.
+        """
+
+        if not value:
+            return None
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        names = [name for name, _, _ in cls.get_field_mapping()]
+        unknown = requested.difference(names)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": [f"Unknown fields: {', '.join(sorted(unknown))}. Choose from: {', '.join(names)}."]},
+                code="invalid",
+            )
+        return [name for name in names if name in requested] or None
+
+    @classmethod
+    def get_sources(cls, fields):
+        """Get the model fields to read to render some fields, e.g. as a query projection.
+
+        The primary key is always included: pagination cursors and cache keys need it.
+
+        Parameters:
+        - fields (list): The field names to render.
+
+        Returns:
+        - list: The model field names.
+        """
+
+        sources = []
+        for name, source, to_representation in cls.get_field_mapping():
+            if name in fields:
+                sources.append(source or to_representation.source_attrs[0])
+        pk_name = cls.serializer_class.Meta.model._meta.pk.attname
+        return sources if pk_name in sources else [pk_name, *sources]
+
+    def to_representation(self, instance):
+        representation = {}
+        is_mapping = isinstance(instance, dict)
+        for name, source, to_representation in self.rendered_fields:
+            if source is None:
+                try:
+                    value = to_representation.get_attribute(instance)
+                except SkipField:
+                    continue
+                representation[name] = None if value is None else to_representation.to_representation(value)
+                continue
+            if is_mapping:
+                if source not in instance:
+                    # Like DRF skips the fields that are not required, rows without a field omit it.
+                    continue
+                value = instance[source]
+            else:
+                value = getattr(instance, source)
+            representation[name] = None if value is None else to_representation(value)
+        return representation
+
+    @property
+    def data(self):
+        with track_serializer():
+            if self.many:
+                return [self.to_representation(instance) for instance in self.instance]
+            return self.to_representation(self.instance)
+
+
+class PharmacyNearbyQuerySerializer(serializers.Serializer):
+    """Query parameters of the nearby pharmacies search.
+
+    **Fields:**
+
+    - lat (number): Latitude of the searched point, in degrees.
+    - lng (number): Longitude of the searched point, in degrees.
+    - radius (number): Maximum distance from the point, in meters (default 5000, up to 100000).
+    - limit (integer): Maximum number of pharmacies (default 10, up to 100).
+    """
+
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0, max_value=100000, default=5000)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class PharmacyLookupSerializer(serializers.Serializer):
+    """Body of a batch lookup of pharmacies by id.
+
+    **Fields:**
+
+    - ids (list): The ids of the pharmacies, up to `PHARMACY_LOOKUP_MAX_IDS`.
+    """
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate_ids(self, value):
+        if len(value) > settings.PHARMACY_LOOKUP_MAX_IDS:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {settings.PHARMACY_LOOKUP_MAX_IDS} elements."
+            )
+        return value
+
+
+class PharmacyChangesQuerySerializer(serializers.Serializer):
+    """Query parameters of the pharmacy change feed.
+
+    **Fields:**
+
+    - since (string): The `next` token of a previous page, to read the changes after it (from the start by default).
+    - limit (integer): Maximum number of changes (default 100, up to 1000).
+    """
+
+    since = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+
+    def validate_since(self, value):
+        try:
+            return decode_change_token(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid change token.")
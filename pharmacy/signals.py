@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import CachedTokenAuthentication
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Stop accepting a deleted token from the token cache of this process."""
+
+    CachedTokenAuthentication.invalidate(instance.key)
@@ -1,6 +1,7 @@
 from base64 import b64encode
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APITestCase
 
 
@@ -10,6 +11,7 @@ class AuthenticatedTestCase(APITestCase):
 
     def setUp(self):
         super().setUp()
+        cache.clear()
         User.objects.create_user(username=self.username, password=self.password)
         self.auth_header = "Basic {}".format(
             b64encode(f"{self.username}:{self.password}".encode("utf-8")).decode("utf-8")
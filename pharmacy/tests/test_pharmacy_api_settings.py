@@ -0,0 +1,91 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacies import settings_api
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+api_settings = override_settings(
+    INSTALLED_APPS=settings_api.INSTALLED_APPS,
+    MIDDLEWARE=settings_api.MIDDLEWARE,
+    ROOT_URLCONF=settings_api.ROOT_URLCONF,
+    TEMPLATES=settings_api.TEMPLATES,
+)
+
+
+class TestPharmacyAPISettings(AuthenticatedTestCase):
+    def get_responses(self, pharmacy):
+        urls = [
+            reverse("pharmacy-list"),
+            reverse("pharmacy-list") + "?pagination=cursor&fields=id,name",
+            reverse("pharmacy-detail", args=[pharmacy.pk]),
+            reverse("pharmacy-detail", args=[999]),
+        ]
+        return [
+            (response.status_code, response.content, response.get("ETag")) for response in map(self.client.get, urls)
+        ]
+
+    def test_profile(self):
+        """
+        Test the API-only profile leaves out the admin, sessions, messages and CSRF.
+        """
+        for name in ("django.contrib.admin", "django.contrib.sessions", "django.contrib.messages"):
+            self.assertNotIn(name, settings_api.INSTALLED_APPS)
+        self.assertNotIn("django.middleware.csrf.CsrfViewMiddleware", settings_api.MIDDLEWARE)
+        self.assertIn("pharmacy.middleware.PharmacyMetricsMiddleware", settings_api.MIDDLEWARE)
+        self.assertEqual(settings_api.TEMPLATES[0]["OPTIONS"]["context_processors"], [])
+
+    @override_settings(PHARMACY_RESPONSE_CACHE=False)
+    def test_same_responses(self):
+        """
+        Test the pharmacy API answers the same with the API-only profile as with the full settings.
+        """
+        pharmacy = PharmacyFactory()
+        expected = self.get_responses(pharmacy)
+        with api_settings:
+            self.assertEqual(self.get_responses(pharmacy), expected)
+
+    @api_settings
+    def test_writes(self):
+        """
+        Test the pharmacy writes, the token route and the browsable API work with the API-only profile.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", args=[pharmacy.pk])
+        response = self.client.patch(url, {"name": "Renamed"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Set-Cookie", response)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+
+        self.client.credentials()
+        response = self.client.post(reverse("api-token"), {"username": self.username, "password": self.password})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.json()['token']}")
+        response = self.client.get(reverse("pharmacy-list"), HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Pharmacy")
+        self.assertEqual(self.client.get("/admin/").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stack_benchmark(self):
+        """
+        Test the benchmark compares the latency and memory of the stacks with the first one.
+        """
+
+        def measure_stack(stack, urls, auth_header, requests):
+            median = 2.0 if stack == "pharmacies.settings" else 1.5
+            return {
+                "latency_ms": {url: {"median_ms": median, "mean_ms": median} for url in urls},
+                "rss_kb": 61440 if stack == "pharmacies.settings" else 59392,
+            }
+
+        out = StringIO()
+        with patch("pharmacy.management.commands.pharmacy_stack_benchmark.measure_stack", side_effect=measure_stack):
+            call_command("pharmacy_stack_benchmark", requests=10, stdout=out)
+        self.assertIn("pharmacies.settings_api     overhead          1.500     1.500   -25.0%", out.getvalue())
+        self.assertIn("pharmacies.settings_api: 58.0 MiB peak RSS (-2.0 MiB)", out.getvalue())
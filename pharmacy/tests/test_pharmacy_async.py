@@ -0,0 +1,218 @@
+from unittest import skipIf
+from unittest.mock import ANY
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+
+from pharmacy.models import Pharmacy, PharmacyTombstone
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+from pharmacy.throttling import get_limiter
+from pharmacy.urls import get_urlpatterns
+
+from . import test_pharmacy_list_cursor
+from .authenticated_test_case import AuthenticatedTestCase
+
+try:
+    import motor.motor_asyncio
+except (ImportError, AttributeError):
+    # Motor 2.x (the line supporting PyMongo 3) does not import on Python 3.11+.
+    motor = None
+
+urlpatterns = [path("", include(get_urlpatterns("async")))]
+
+
+@skipIf(motor is None, "Motor is not available.")
+@override_settings(ROOT_URLCONF=__name__)
+class TestPharmacyAsyncAPI(AuthenticatedTestCase):
+    def request(self, method, url, data=None):
+        # Django 4.1's async client sends its extra keyword arguments as raw header names.
+        if method == "get":
+            return self.async_client.get(url, authorization=self.auth_header)
+        return getattr(self.async_client, method)(
+            url, data, content_type="application/json", authorization=self.auth_header
+        )
+
+    async def test_list(self):
+        """
+        Test the async list has the same paginated payload as the sync list.
+        """
+        factories = [await sync_to_async(PharmacyFactory)() for _ in range(12)]
+        response = await self.request("get", reverse("pharmacy-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Server-Timing", response)
+        data = response.json()
+        self.assertEqual(data["count"], 12)
+        self.assertIsNone(data["previous"])
+        self.assertEqual(data["next"], "http://testserver/pharmacies/?page=2")
+        self.assertEqual([item["id"] for item in data["results"]], [factory.pk for factory in factories[:10]])
+
+        response = await self.request("get", data["next"])
+        data = response.json()
+        self.assertIsNone(data["next"])
+        self.assertEqual(data["previous"], "http://testserver/pharmacies/")
+        self.assertEqual([item["id"] for item in data["results"]], [factory.pk for factory in factories[10:]])
+
+    async def test_list_filter_by_name(self):
+        """
+        Test the async list filters by name with an exact count.
+        """
+        pharmacy = await sync_to_async(PharmacyFactory)(name="Async Pharmacy")
+        await sync_to_async(PharmacyFactory)(name="Other Pharmacy")
+        response = await self.request("get", reverse("pharmacy-list") + "?name=Async Pharmacy")
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertTrue(data["count_exact"])
+        self.assertEqual(data["results"][0]["id"], pharmacy.pk)
+
+    async def test_list_search(self):
+        """
+        Test the async list supports the search parameters.
+        """
+        pharmacy = await sync_to_async(PharmacyFactory)(name="Nile Pharmacy")
+        await sync_to_async(PharmacyFactory)(name="Delta Pharmacy")
+        for query in ("?q=nile", "?name__startswith=NI"):
+            data = (await self.request("get", reverse("pharmacy-list") + query)).json()
+            self.assertEqual(data["count"], 1)
+            self.assertEqual(data["results"][0]["id"], pharmacy.pk)
+        response = await self.request("get", reverse("pharmacy-list") + "?name=Nile%20Pharmacy&name__startswith=NI")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_fields(self):
+        """
+        Test the async list and retrieve render only the requested fields.
+        """
+        pharmacy = await sync_to_async(PharmacyFactory)()
+        data = (await self.request("get", reverse("pharmacy-list") + "?fields=name,id")).json()
+        self.assertEqual(data["results"], [{"id": pharmacy.pk, "name": pharmacy.name}])
+
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        response = await self.request("get", url + "?fields=address")
+        self.assertEqual(response.json(), {"address": pharmacy.address})
+        response = await self.request("get", url + "?fields=unknown")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_list_invalid_page(self):
+        """
+        Test the async list rejects a page past the last one.
+        """
+        response = await self.request("get", reverse("pharmacy-list") + "?page=5")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_unauthenticated(self):
+        """
+        Test the async views require authentication.
+        """
+        response = await self.async_client.get(reverse("pharmacy-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response.headers)
+
+    async def test_create_retrieve_update_delete(self):
+        """
+        Test the async create, retrieve, update and delete round trip.
+        """
+        data = {
+            "name": "Async Pharmacy",
+            "address": "1 Async St",
+            "phone_number": "555-000-1111",
+            "license_number": "ASYNC-1",
+        }
+        response = await self.request("post", reverse("pharmacy-list"), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        pk = response.json()["id"]
+        self.assertEqual(response.json(), dict(data, id=pk, location=None, updated_at=ANY, version=1))
+        created = response.json()
+        self.assertTrue(await sync_to_async(Pharmacy.objects.filter(pk=pk).count)())
+
+        url = reverse("pharmacy-detail", kwargs={"pk": pk})
+        response = await self.request("get", url)
+        self.assertEqual(response.json(), created)
+
+        response = await self.request("patch", url, {"name": "Renamed Pharmacy"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(), dict(data, id=pk, location=None, name="Renamed Pharmacy", updated_at=ANY, version=2)
+        )
+
+        response = await self.request("delete", url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = await self.request("get", url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(await sync_to_async(PharmacyTombstone.objects.filter(pk=pk).count)(), 1)
+
+    async def test_create_invalid_and_duplicate(self):
+        """
+        Test the async create reports invalid data and duplicate license numbers.
+        """
+        pharmacy = await sync_to_async(PharmacyFactory)()
+        response = await self.request("post", reverse("pharmacy-list"), {"name": "Missing fields"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("license_number", response.json())
+
+        data = {"name": "Copy", "address": "1 St", "phone_number": "555", "license_number": pharmacy.license_number}
+        response = await self.request("post", reverse("pharmacy-list"), data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("license_number", response.json())
+
+    async def test_conditional_requests(self):
+        """
+        Test the async views send ETags, answer If-None-Match with 304 and check If-Match.
+        """
+        pharmacy = await sync_to_async(PharmacyFactory)()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        response = await self.request("get", url)
+        self.assertEqual(response["ETag"], f'"{pharmacy.pk}.1"')
+        response = await self.async_client.get(url, authorization=self.auth_header, if_none_match=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = await self.async_client.put(
+            url, {"name": "Stale"}, content_type="application/json", authorization=self.auth_header, if_match='"0.0"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = await self.async_client.put(
+            url,
+            {"name": "Fresh"},
+            content_type="application/json",
+            authorization=self.auth_header,
+            if_match=f'"{pharmacy.pk}.1"',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], f'"{pharmacy.pk}.2"')
+
+    async def test_update_missing(self):
+        """
+        Test updating a missing pharmacy returns 404 even with invalid data.
+        """
+        url = reverse("pharmacy-detail", kwargs={"pk": 999})
+        response = await self.request("put", url, {"name": "x" * 200})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(PHARMACY_THROTTLE_WRITE_RATE="1/min", PHARMACY_MAX_CONCURRENT_READS=1)
+    async def test_throttling(self):
+        """
+        Test the async views are throttled and shed reads beyond the concurrency limit without waiting.
+        """
+        url = reverse("pharmacy-detail", kwargs={"pk": 999})
+        response = await self.request("put", url, {"name": "Renamed"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = await self.request("put", url, {"name": "Renamed"})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "60")
+
+        limiter = get_limiter("read")
+        self.assertTrue(limiter.acquire())
+        try:
+            response = await self.request("get", url)
+        finally:
+            limiter.release()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+        response = await self.request("get", url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@skipIf(motor is None, "Motor is not available.")
+@override_settings(ROOT_URLCONF=__name__)
+class TestPharmacyAsyncCursorListAPI(test_pharmacy_list_cursor.TestPharmacyCursorListAPI):
+    """The cursor pagination tests of the synchronous list, against the async list."""
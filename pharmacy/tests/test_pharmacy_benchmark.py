@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+
+from pharmacy.benchmarks.runner import compare, percentile
+from pharmacy.benchmarks.seeding import get_benchmark_names, seed_pharmacies
+from pharmacy.models import Pharmacy
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyBenchmark(AuthenticatedTestCase):
+    def test_seed_pharmacies(self):
+        """
+        Test the seeder inserts pharmacies spread over the benchmark names.
+        """
+        names = get_benchmark_names(3)
+        ids = seed_pharmacies(7, names, batch_size=2)
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(Pharmacy.objects.filter(name=names[0]).count(), 3)
+
+    def test_percentile(self):
+        """
+        Test percentiles interpolate between the closest ranks.
+        """
+        values = [1.0, 2.0, 3.0, 4.0]
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 50), 2.5)
+        self.assertEqual(percentile(values, 100), 4.0)
+
+    def test_compare_reports_regressions(self):
+        """
+        Test the comparison flags latency increases above the threshold.
+        """
+        baseline = {"list": {"latency_ms": {"p50": 10.0, "p95": 20.0}}}
+        results = {"list": {"latency_ms": {"p50": 12.0, "p95": 21.0}}, "create": {"latency_ms": {}}}
+        rows = compare(results, baseline, threshold=10.0)
+        self.assertEqual(rows, [("list", "p50", 10.0, 12.0, 20.0, True), ("list", "p95", 20.0, 21.0, 5.0, False)])
+
+    def test_benchmark_command(self):
+        """
+        Test the benchmark command runs every scenario, writes JSON results and removes the seeded pharmacies.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            out = StringIO()
+            call_command("pharmacy_benchmark", size=25, names=5, requests=3, output=path, stdout=out)
+            with open(path) as results_file:
+                results = json.load(results_file)
+
+            call_command(
+                "pharmacy_benchmark", size=25, names=5, requests=3, scenario=["retrieve"], compare=path, stdout=out
+            )
+
+        self.assertEqual(results["meta"]["size"], 25)
+        for summary in results["scenarios"].values():
+            self.assertEqual(summary["requests"], 3)
+            self.assertEqual(summary["errors"], 0)
+            self.assertGreater(summary["throughput"], 0)
+        self.assertEqual(
+            list(results["scenarios"]),
+            ["list", "list_deep", "list_name", "list_name_deep", "list_fields", "retrieve", "create", "update"],
+        )
+        self.assertIn("retrieve p50", out.getvalue())
+        self.assertEqual(Pharmacy.objects.count(), 0)
@@ -0,0 +1,122 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.models import Pharmacy
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyBulkAPI(AuthenticatedTestCase):
+    def build_items(self, count):
+        return [
+            {
+                "name": pharmacy.name,
+                "address": pharmacy.address,
+                "phone_number": "555-123-4567",
+                "license_number": pharmacy.license_number,
+            }
+            for pharmacy in PharmacyFactory.build_batch(count)
+        ]
+
+    def test_unauthorized(self):
+        """
+        Test unauthenticated request.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.client.post(reverse("pharmacy-bulk"), [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_create_json(self):
+        """
+        Test creating pharmacies from a JSON array.
+        """
+        items = self.build_items(3)
+        response = self.client.post(reverse("pharmacy-bulk"), items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual([result["status"] for result in response.data["results"]], ["created"] * 3)
+        for item, result in zip(items, response.data["results"]):
+            self.assertEqual(Pharmacy.objects.get(pk=result["id"]).license_number, item["license_number"])
+
+    def test_bulk_create_ndjson(self):
+        """
+        Test creating pharmacies from NDJSON lines.
+        """
+        items = self.build_items(2)
+        body = "\n".join(
+            '{{"name": "{name}", "address": "{address}", "phone_number": "{phone_number}", '
+            '"license_number": "{license_number}"}}'.format(**item)
+            for item in items
+        )
+        response = self.client.post(reverse("pharmacy-bulk"), body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+
+    def test_bulk_invalid_item_does_not_abort(self):
+        """
+        Test invalid items are reported while the valid items are created.
+        """
+        items = self.build_items(2)
+        items.insert(1, {"name": "New Pharmacy"})
+        response = self.client.post(reverse("pharmacy-bulk"), items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertEqual(response.data["results"][1]["status"], "failed")
+        self.assertIn("address", response.data["results"][1]["errors"])
+        self.assertEqual(Pharmacy.objects.count(), 2)
+
+    def test_bulk_duplicate_license_number(self):
+        """
+        Test items with an existing license number fail without upsert.
+        """
+        pharmacy = PharmacyFactory()
+        items = self.build_items(1)
+        items[0]["license_number"] = pharmacy.license_number
+        response = self.client.post(reverse("pharmacy-bulk"), items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertEqual(response.data["results"][0]["errors"]["license_number"][0].code, "unique")
+
+    def test_bulk_upsert(self):
+        """
+        Test upserting updates the pharmacies whose license number exists and creates the others.
+        """
+        pharmacy = PharmacyFactory()
+        items = self.build_items(2)
+        items[0]["license_number"] = pharmacy.license_number
+        items[0]["name"] = "Updated Pharmacy"
+        response = self.client.post(reverse("pharmacy-bulk") + "?upsert=true", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["results"][0]["id"], pharmacy.pk)
+        pharmacy.refresh_from_db()
+        self.assertEqual(pharmacy.name, "Updated Pharmacy")
+
+    def test_bulk_not_a_list(self):
+        """
+        Test a body that is not a list.
+        """
+        response = self.client.post(reverse("pharmacy-bulk"), {"name": "New Pharmacy"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(PHARMACY_BULK_MAX_ITEMS=2)
+    def test_bulk_too_many_items(self):
+        """
+        Test a body with more items than allowed.
+        """
+        response = self.client.post(reverse("pharmacy-bulk"), self.build_items(3), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(PHARMACY_BULK_BATCH_SIZE=2)
+    def test_bulk_batches(self):
+        """
+        Test items are written across several batches with distinct ids.
+        """
+        response = self.client.post(reverse("pharmacy-bulk"), self.build_items(5), format="json")
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(len({result["id"] for result in response.data["results"]}), 5)
+        self.assertEqual(Pharmacy.objects.count(), 5)
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.changes import decode_change_token, encode_change_token
+from pharmacy.models import PharmacyTombstone
+from pharmacy.repositories import PharmacyRepository
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+@override_settings(PHARMACY_CHANGES_DELAY=0)
+class TestPharmacyChangesAPI(AuthenticatedTestCase):
+    url = reverse("pharmacy-changes")
+
+    def get_changes(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_change_token(self):
+        """
+        Test change tokens round trip their position at millisecond precision.
+        """
+        time = datetime(2024, 1, 15, 10, 30, 0, 123000)
+        self.assertEqual(decode_change_token(encode_change_token(time, 42)), (time, 42))
+        with self.assertRaises(ValueError):
+            decode_change_token("not a token")
+
+    def test_initial_sync(self):
+        """
+        Test a sync without a token reads every pharmacy in change order.
+        """
+        pharmacies = [PharmacyFactory() for _ in range(3)]
+        data = self.get_changes()
+        self.assertEqual([change["id"] for change in data["results"]], [pharmacy.pk for pharmacy in pharmacies])
+        self.assertEqual({change["operation"] for change in data["results"]}, {"upsert"})
+        self.assertEqual(data["results"][0]["pharmacy"]["name"], pharmacies[0].name)
+        self.assertFalse(data["has_more"])
+
+    def test_incremental_sync(self):
+        """
+        Test a sync from a token reads only the pharmacies updated, created or deleted after it.
+        """
+        updated, deleted, unchanged = PharmacyFactory(), PharmacyFactory(), PharmacyFactory()
+        token = self.get_changes()["next"]
+        self.assertEqual(self.get_changes(token)["results"], [])
+
+        self.client.put(reverse("pharmacy-detail", kwargs={"pk": updated.pk}), {"name": "Updated"}, format="json")
+        self.client.delete(reverse("pharmacy-detail", kwargs={"pk": deleted.pk}))
+        created = PharmacyFactory()
+
+        data = self.get_changes(token)
+        self.assertEqual(
+            [(change["id"], change["operation"]) for change in data["results"]],
+            [(updated.pk, "upsert"), (deleted.pk, "delete"), (created.pk, "upsert")],
+        )
+        self.assertEqual(data["results"][0]["pharmacy"]["name"], "Updated")
+        self.assertEqual(data["results"][0]["pharmacy"]["version"], 2)
+        self.assertIsNone(data["results"][1]["pharmacy"])
+        self.assertNotIn(unchanged.pk, [change["id"] for change in data["results"]])
+        self.assertEqual(self.get_changes(data["next"])["results"], [])
+
+    def test_pages(self):
+        """
+        Test the changes are paged by token without skipping or repeating any.
+        """
+        pharmacies = [PharmacyFactory() for _ in range(5)]
+        data = self.get_changes(limit=2)
+        ids = [change["id"] for change in data["results"]]
+        while data["has_more"]:
+            data = self.get_changes(data["next"], limit=2)
+            ids.extend(change["id"] for change in data["results"])
+        self.assertEqual(ids, [pharmacy.pk for pharmacy in pharmacies])
+
+    @override_settings(PHARMACY_CHANGES_DELAY=60)
+    def test_delay(self):
+        """
+        Test the changes of the last `PHARMACY_CHANGES_DELAY` seconds are held back.
+        """
+        PharmacyFactory()
+        data = self.get_changes()
+        self.assertEqual(data["results"], [])
+        self.assertFalse(data["has_more"])
+
+    def test_invalid_parameters(self):
+        """
+        Test invalid tokens and limits are rejected.
+        """
+        for params in ({"since": "not a token"}, {"limit": 0}, {"limit": 1001}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_token(self):
+        """
+        Test tokens older than the tombstone retention ask for a full sync, and expired tombstones are left to the TTL
+        index.
+        """
+        expired = datetime.utcnow() - timedelta(days=31)
+        response = self.client.get(self.url, {"since": encode_change_token(expired, 1)})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+        repository = PharmacyRepository()
+        ttl_index = repository.tombstones.index_information()["tombstone_deleted_at_ttl"]
+        self.assertEqual(ttl_index["key"], [("deleted_at", 1)])
+        self.assertEqual(ttl_index["expireAfterSeconds"], 30 * 24 * 3600)
+
+        # Deletes only write their tombstone, without pruning.
+        with patch.object(type(repository.tombstones), "delete_many") as delete_many:
+            repository.add_tombstone(2)
+        delete_many.assert_not_called()
+        self.assertEqual(list(PharmacyTombstone.objects.values_list("pharmacy_id", flat=True)), [2])
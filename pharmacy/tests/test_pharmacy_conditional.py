@@ -0,0 +1,162 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+
+from pharmacy.models import Pharmacy
+from pharmacy.repositories import PharmacyRepository
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+from pharmacy.views import PharmacyViewSet
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyConditionalAPI(AuthenticatedTestCase):
+    def test_retrieve_validators(self):
+        """
+        Test the retrieve sends the ETag and Last-Modified of the pharmacy version.
+        """
+        pharmacy = PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        self.assertEqual(response["ETag"], f'"{pharmacy.pk}.1"')
+        self.assertEqual(response["Last-Modified"], http_date(pharmacy.updated_at.timestamp()))
+        self.assertEqual(response.data["version"], 1)
+
+        response = self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}) + "?fields=id,name")
+        self.assertEqual(response["ETag"], f'"{pharmacy.pk}.1.id-name"')
+
+    def test_retrieve_not_modified(self):
+        """
+        Test If-None-Match and If-Modified-Since are answered with 304, with and without the response cache.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        etag = self.client.get(url)["ETag"]
+        for cache in (True, False):
+            with self.subTest(cache=cache), override_settings(PHARMACY_RESPONSE_CACHE=cache):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response["ETag"], etag)
+                self.assertEqual(response.content, b"")
+
+                last_modified = response["Last-Modified"]
+                response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(PHARMACY_RESPONSE_CACHE=False)
+    def test_retrieve_not_modified_skips_document(self):
+        """
+        Test a 304 is answered from the version lookup without reading the document.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        with patch.object(PharmacyViewSet, "get_obj_by_pk", side_effect=AssertionError) as get_obj_by_pk:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"{pharmacy.pk}.1"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        get_obj_by_pk.assert_not_called()
+
+    def test_retrieve_modified(self):
+        """
+        Test an update bumps the version, so the previous ETag gets the new representation.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        etag = self.client.get(url)["ETag"]
+        response = self.client.put(url, {"name": "Updated Pharmacy"}, format="json")
+        self.assertEqual(response.data["version"], 2)
+        self.assertEqual(response["ETag"], f'"{pharmacy.pk}.2"')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Updated Pharmacy")
+        self.assertEqual(response["ETag"], f'"{pharmacy.pk}.2"')
+
+    def test_list_not_modified(self):
+        """
+        Test list pages have a weak ETag answered with 304 until the page changes.
+        """
+        PharmacyFactory()
+        url = reverse("pharmacy-list")
+        etag = self.client.get(url)["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        for cache in (True, False):
+            with self.subTest(cache=cache), override_settings(PHARMACY_RESPONSE_CACHE=cache):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        data = {"name": "New", "address": "1 St", "phone_number": "555", "license_number": "NEW-1"}
+        self.client.post(url, data, format="json")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_update_if_match(self):
+        """
+        Test an update with the current ETag in If-Match applies, and one with a stale ETag fails with 412.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        response = self.client.put(url, {"name": "First"}, format="json", HTTP_IF_MATCH=f'"{pharmacy.pk}.1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.put(url, {"name": "Second"}, format="json", HTTP_IF_MATCH=f'"{pharmacy.pk}.1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Pharmacy.objects.get(pk=pharmacy.pk).name, "First")
+
+        for if_match in (f'"{pharmacy.pk}.2.id-name"', "*"):
+            response = self.client.put(url, {"name": "Third"}, format="json", HTTP_IF_MATCH=if_match)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Pharmacy.objects.get(pk=pharmacy.pk).version, 4)
+
+    def test_update_if_match_errors(self):
+        """
+        Test a missing pharmacy is reported before a failed If-Match, and a failed If-Match before invalid data.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        for pk, data, expected in (
+            (999, {"name": "x" * 200}, status.HTTP_404_NOT_FOUND),
+            (pharmacy.pk, {"name": "x" * 200}, status.HTTP_412_PRECONDITION_FAILED),
+            (pharmacy.pk, {"name": "Valid"}, status.HTTP_412_PRECONDITION_FAILED),
+        ):
+            url = reverse("pharmacy-detail", kwargs={"pk": pk})
+            response = self.client.put(url, data, format="json", HTTP_IF_MATCH=f'"{pk}.2"')
+            self.assertEqual(response.status_code, expected)
+        response = self.client.put(url, {"name": "x" * 200}, format="json", HTTP_IF_MATCH=f'"{pharmacy.pk}.1"')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_if_match_concurrent_write(self):
+        """
+        Test the If-Match version is checked atomically with the write.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        update_one = PharmacyRepository.update_one
+
+        def concurrent_update_then_update(repository, *args, **kwargs):
+            # Another client updates the pharmacy right before this request writes it.
+            Pharmacy.objects.filter(pk=pharmacy.pk).update(name="Concurrent", version=2)
+            return update_one(repository, *args, **kwargs)
+
+        with patch.object(PharmacyRepository, "update_one", concurrent_update_then_update):
+            response = self.client.put(url, {"name": "Stale"}, format="json", HTTP_IF_MATCH=f'"{pharmacy.pk}.1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Pharmacy.objects.get(pk=pharmacy.pk).name, "Concurrent")
+
+    def test_writes_bump_version(self):
+        """
+        Test bulk upserts bump the version and the update time of the pharmacies.
+        """
+        pharmacy = PharmacyFactory()
+        data = {
+            "name": "Upserted",
+            "address": pharmacy.address,
+            "phone_number": "555",
+            "license_number": pharmacy.license_number,
+        }
+        self.client.post(reverse("pharmacy-bulk") + "?upsert=true", [data], format="json")
+        updated = Pharmacy.objects.get(pk=pharmacy.pk)
+        self.assertEqual(updated.version, 2)
+        self.assertGreaterEqual(updated.updated_at, pharmacy.updated_at)
@@ -20,7 +20,7 @@ class TestPharmacyCreateAPI(AuthenticatedTestCase):
         """
         Test creating a new pharmacy with valid data.
         """
-        pharmacy = PharmacyFactory()
+        pharmacy = PharmacyFactory.build()
         data = pharmacy.__dict__
         data.pop("_state")
         response = self.client.post(reverse("pharmacy-list"), data, format="json")
@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
 from django.urls import reverse
 from rest_framework import status
 
+from pharmacy.models import Pharmacy, PharmacyTombstone
+from pharmacy.repositories import PharmacyRepository
 from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
 
 from .authenticated_test_case import AuthenticatedTestCase
@@ -26,6 +30,21 @@ class TestPharmacyDeleteAPI(AuthenticatedTestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+    def test_delete_pharmacy_single_command(self):
+        """
+        Test deleting a pharmacy removes it and records its tombstone without reading it first.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        with patch.object(PharmacyRepository, "get_version", side_effect=AssertionError), patch.object(
+            Pharmacy.objects, "get", side_effect=AssertionError
+        ):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(Pharmacy.objects.filter(pk=pharmacy.pk).count(), 0)
+        self.assertEqual(PharmacyTombstone.objects.filter(pk=pharmacy.pk).count(), 1)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+
     def test_delete_pharmacy_invalid_pk(self):
         """
         Test deleting pharmacy with non-existent primary key.
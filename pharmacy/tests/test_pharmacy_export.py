@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyExportAPI(AuthenticatedTestCase):
+    def get_content(self, response):
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_unauthorized(self):
+        """
+        Test unauthenticated request.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.client.get(reverse("pharmacy-export"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_ndjson(self):
+        """
+        Test exporting all pharmacies as NDJSON by default.
+        """
+        factories = PharmacyFactory.create_batch(3)
+        response = self.client.get(reverse("pharmacy-export"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        rows = [json.loads(line) for line in self.get_content(response).splitlines()]
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "id": pharmacy.pk,
+                    "name": pharmacy.name,
+                    "address": pharmacy.address,
+                    "phone_number": pharmacy.phone_number,
+                    "license_number": pharmacy.license_number,
+                    "location": None,
+                    "updated_at": pharmacy.updated_at.isoformat().replace("+00:00", "Z"),
+                    "version": 1,
+                }
+                for pharmacy in factories
+            ],
+        )
+
+    def test_export_csv(self):
+        """
+        Test exporting all pharmacies as CSV.
+        """
+        factories = PharmacyFactory.create_batch(2)
+        response = self.client.get(reverse("pharmacy-export") + "?format=csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="pharmacies.csv"')
+        reader = csv.DictReader(io.StringIO(self.get_content(response)))
+        rows = list(reader)
+        self.assertEqual(
+            reader.fieldnames,
+            ["id", "name", "address", "phone_number", "license_number", "location", "updated_at", "version"],
+        )
+        self.assertEqual([int(row["id"]) for row in rows], [pharmacy.pk for pharmacy in factories])
+        self.assertEqual(rows[0]["license_number"], factories[0].license_number)
+
+    def test_export_filter_by_name(self):
+        """
+        Test exporting the pharmacies with a name.
+        """
+        pharmacy = PharmacyFactory(name="Test Pharmacy")
+        PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-export") + "?name=Test Pharmacy")
+        rows = [json.loads(line) for line in self.get_content(response).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [pharmacy.pk])
+
+    @override_settings(PHARMACY_READ_BACKEND="orm", PHARMACY_EXPORT_BATCH_SIZE=2)
+    def test_export_orm_backend(self):
+        """
+        Test exporting through the ORM read backend.
+        """
+        factories = PharmacyFactory.create_batch(3)
+        response = self.client.get(reverse("pharmacy-export"))
+        rows = [json.loads(line) for line in self.get_content(response).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [pharmacy.pk for pharmacy in factories])
+
+    def test_export_unsupported_format(self):
+        """
+        Test exporting in an unsupported format.
+        """
+        response = self.client.get(reverse("pharmacy-export") + "?format=xml")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,56 @@
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from pharmacy.models import Pharmacy
+from pharmacy.repositories import PharmacyRepository
+from pharmacy.serializers import PharmacyFastSerializer, PharmacySerializer
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyFastSerializer(AuthenticatedTestCase):
+    def assertRendersLikePharmacySerializer(self, instances, many=True):
+        renderer = JSONRenderer()
+        expected = renderer.render(PharmacySerializer(instances, many=many).data)
+        self.assertEqual(renderer.render(PharmacyFastSerializer(instances, many=many).data), expected)
+
+    def test_parity_with_model_instances(self):
+        """
+        Test the fast serializer renders model instances byte for byte like PharmacySerializer.
+        """
+        [PharmacyFactory() for _ in range(5)]
+        pharmacies = list(Pharmacy.objects.order_by("id"))
+        self.assertRendersLikePharmacySerializer(pharmacies)
+        self.assertRendersLikePharmacySerializer(pharmacies[0], many=False)
+
+    def test_parity_with_documents(self):
+        """
+        Test the fast serializer renders raw Mongo documents and values() rows like PharmacySerializer.
+        """
+        [PharmacyFactory(name='Pharmacy éè "quoted"') for _ in range(5)]
+        documents = list(PharmacyRepository().all())
+        self.assertRendersLikePharmacySerializer(documents)
+        self.assertRendersLikePharmacySerializer(documents[0], many=False)
+        self.assertRendersLikePharmacySerializer(list(Pharmacy.objects.order_by("id").values()))
+
+    def test_list_and_retrieve_responses(self):
+        """
+        Test the list and retrieve responses are unchanged by the fast serializer.
+        """
+        pharmacy = PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertEqual(response.data["results"], PharmacySerializer([pharmacy], many=True).data)
+
+        response = self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        self.assertEqual(response.content, JSONRenderer().render(PharmacySerializer(pharmacy).data))
+
+    def test_field_order(self):
+        """
+        Test pharmacies are rendered with their fields in the order of the model.
+        """
+        pharmacy = PharmacyFactory()
+        fields = ["id", "name", "address", "phone_number", "license_number", "location", "updated_at", "version"]
+        self.assertEqual(list(PharmacySerializer(pharmacy).data), fields)
+        self.assertEqual(list(PharmacyFastSerializer(pharmacy).data), fields)
+        self.assertEqual(list(self.client.get(reverse("pharmacy-list")).json()["results"][0]), fields)
@@ -0,0 +1,98 @@
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.caching import PharmacyResponseCache
+from pharmacy.repositories import PharmacyRepository
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyFieldsAPI(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        PharmacyResponseCache().invalidate()
+
+    def test_list_fields(self):
+        """
+        Test the list renders only the requested fields, in the serializer order.
+        """
+        factories = PharmacyFactory.create_batch(3)
+        response = self.client.get(reverse("pharmacy-list") + "?fields=name,id")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            response.data["results"], [{"id": pharmacy.pk, "name": pharmacy.name} for pharmacy in factories]
+        )
+        self.assertEqual(list(response.data["results"][0]), ["id", "name"])
+
+    def test_list_fields_with_orm_backend(self):
+        """
+        Test the ORM read backend renders the same sparse fields.
+        """
+        pharmacy = PharmacyFactory()
+        with override_settings(PHARMACY_READ_BACKEND="orm"):
+            response = self.client.get(reverse("pharmacy-list") + "?fields=name")
+        self.assertEqual(response.data["results"], [{"name": pharmacy.name}])
+
+    def test_list_fields_cache(self):
+        """
+        Test sparse and full list pages are cached separately.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-list")
+        self.assertEqual(self.client.get(url + "?fields=id").data["results"], [{"id": pharmacy.pk}])
+        self.assertEqual(self.client.get(url).data["results"][0]["address"], pharmacy.address)
+        self.assertEqual(self.client.get(url + "?fields=id").data["results"], [{"id": pharmacy.pk}])
+
+    def test_list_fields_cursor_pagination(self):
+        """
+        Test cursor pages of fields without the primary key still link to the next page.
+        """
+        factories = PharmacyFactory.create_batch(11)
+        response = self.client.get(reverse("pharmacy-list") + "?pagination=cursor&fields=name")
+        self.assertEqual(response.data["results"], [{"name": pharmacy.name} for pharmacy in factories[:10]])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"], [{"name": factories[10].name}])
+
+    def test_unknown_fields(self):
+        """
+        Test unknown fields are rejected.
+        """
+        pharmacy = PharmacyFactory()
+        for url in (reverse("pharmacy-list"), reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})):
+            response = self.client.get(url + "?fields=id,secret")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("secret", response.data["fields"][0])
+
+    def test_retrieve_fields(self):
+        """
+        Test the retrieve renders only the requested fields and does not change the cached detail.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        self.client.get(url)
+        response = self.client.get(url + "?fields=phone_number")
+        self.assertEqual(response.data, {"phone_number": pharmacy.phone_number})
+        self.assertEqual(json.loads(self.client.get(url).content)["address"], pharmacy.address)
+
+    def test_export_fields(self):
+        """
+        Test the export writes only the requested fields.
+        """
+        pharmacy = PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-export") + "?fields=id,license_number")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(rows, [{"id": pharmacy.pk, "license_number": pharmacy.license_number}])
+
+    def test_repository_projection(self):
+        """
+        Test the requested fields are pushed down to the query projection.
+        """
+        pharmacy = PharmacyFactory()
+        repository = PharmacyRepository()
+        self.assertEqual(list(repository.find(fields=["id", "name"])), [{"id": pharmacy.pk, "name": pharmacy.name}])
+        self.assertEqual(repository.find_one(pharmacy.pk, fields=["id"]), {"id": pharmacy.pk})
@@ -0,0 +1,52 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.models import PharmacyTombstone
+from pharmacy.mongo import get_collection
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyIndexes(AuthenticatedTestCase):
+    def test_indexes_created(self):
+        """
+        Test the migrations create the declared indexes on the collection.
+        """
+        indexes = get_collection().index_information()
+        self.assertEqual(indexes["pharmacy_name_id_idx"]["key"], [("name", 1), ("id", 1)])
+        self.assertEqual(indexes["__primary_key__"]["key"], [("id", 1)])
+        license_indexes = [index for index in indexes.values() if index["key"] == [("license_number", 1)]]
+        self.assertEqual(len(license_indexes), 1)
+        self.assertTrue(license_indexes[0]["unique"])
+        self.assertEqual(indexes["pharmacy_updated_at_id_idx"]["key"], [("updated_at", 1), ("id", 1)])
+
+        tombstone_indexes = get_collection(PharmacyTombstone).index_information()
+        self.assertEqual(
+            tombstone_indexes["tombstone_deleted_at_id_idx"]["key"], [("deleted_at", 1), ("pharmacy_id", 1)]
+        )
+
+    def test_create_duplicate_license_number(self):
+        """
+        Test creating pharmacy with an existing license number.
+        """
+        pharmacy = PharmacyFactory()
+        data = {"name": "New Pharmacy", "address": "555 Elm St", "phone_number": "555-123-4567"}
+        data["license_number"] = pharmacy.license_number
+        response = self.client.post(reverse("pharmacy-list"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual("unique", response.data["license_number"][0].code)
+
+    def test_index_stats_command(self):
+        """
+        Test the index stats command reports the list index after a filtered list request.
+        """
+        PharmacyFactory(name="Test Pharmacy")
+        self.client.get(reverse("pharmacy-list") + "?name=Test Pharmacy")
+        out = StringIO()
+        call_command("pharmacy_index_stats", stdout=out)
+        self.assertIn("pharmacy_name_id_idx (name: 1, id: 1)", out.getvalue())
+        self.assertIn("__primary_key__ (id: 1)", out.getvalue())
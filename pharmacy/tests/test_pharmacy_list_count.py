@@ -0,0 +1,79 @@
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyListCountAPI(AuthenticatedTestCase):
+    def test_unfiltered_count_is_estimated(self):
+        """
+        Test the unfiltered list count comes from the collection estimate.
+        """
+        factories = [PharmacyFactory() for _ in range(3)]
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], len(factories))
+        self.assertFalse(response.data["count_exact"])
+
+    def test_filtered_count_is_exact(self):
+        """
+        Test the list count filtered by name is exact.
+        """
+        common_name = "Common Pharmacy"
+        factories = [PharmacyFactory(name=common_name) for _ in range(2)]
+        PharmacyFactory(name="Other Pharmacy")
+        response = self.client.get(reverse("pharmacy-list") + f"?name={common_name}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], len(factories))
+        self.assertTrue(response.data["count_exact"])
+
+    def test_create_adjusts_cached_count(self):
+        """
+        Test creating a pharmacy adjusts the cached count of its name.
+        """
+        common_name = "Common Pharmacy"
+        PharmacyFactory(name=common_name)
+        url = reverse("pharmacy-list") + f"?name={common_name}"
+        self.assertEqual(self.client.get(url).data["count"], 1)
+
+        data = {
+            "name": common_name,
+            "address": "555 Elm St",
+            "phone_number": "555-123-4567",
+            "license_number": "XYZ987",
+        }
+        response = self.client.post(reverse("pharmacy-list"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(url).data["count"], 2)
+
+    def test_delete_adjusts_cached_count(self):
+        """
+        Test deleting a pharmacy adjusts the cached count of its name.
+        """
+        common_name = "Common Pharmacy"
+        pharmacy = PharmacyFactory(name=common_name)
+        PharmacyFactory(name=common_name)
+        url = reverse("pharmacy-list") + f"?name={common_name}"
+        self.assertEqual(self.client.get(url).data["count"], 2)
+
+        response = self.client.delete(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(url).data["count"], 1)
+
+    def test_update_name_adjusts_cached_counts(self):
+        """
+        Test renaming a pharmacy moves it between the cached counts of both names.
+        """
+        pharmacy = PharmacyFactory(name="Old Pharmacy")
+        old_url = reverse("pharmacy-list") + "?name=Old Pharmacy"
+        new_url = reverse("pharmacy-list") + "?name=New Pharmacy"
+        self.assertEqual(self.client.get(old_url).data["count"], 1)
+        self.assertEqual(self.client.get(new_url).data["count"], 0)
+
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        response = self.client.put(url, {"name": "New Pharmacy"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(old_url).data["count"], 0)
+        self.assertEqual(self.client.get(new_url).data["count"], 1)
@@ -0,0 +1,67 @@
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyCursorListAPI(AuthenticatedTestCase):
+    def test_cursor_first_page(self):
+        """
+        Test the first cursor page has no count and links to the next page.
+        """
+        factories = [PharmacyFactory() for _ in range(12)]
+        url = reverse("pharmacy-list") + "?pagination=cursor"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.json())
+        self.assertIsNone(response.json()["previous"])
+        self.assertIsNotNone(response.json()["next"])
+        self.assertEqual([item["id"] for item in response.json()["results"]], [f.pk for f in factories[:10]])
+
+    def test_cursor_next_and_previous(self):
+        """
+        Test following the next cursor and then the previous cursor back.
+        """
+        factories = [PharmacyFactory() for _ in range(12)]
+        response = self.client.get(reverse("pharmacy-list") + "?pagination=cursor")
+
+        response = self.client.get(response.json()["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.json()["next"])
+        self.assertEqual([item["id"] for item in response.json()["results"]], [f.pk for f in factories[10:]])
+
+        response = self.client.get(response.json()["previous"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.json()["previous"])
+        self.assertEqual([item["id"] for item in response.json()["results"]], [f.pk for f in factories[:10]])
+
+    def test_cursor_filter_by_name(self):
+        """
+        Test cursor pagination keeps the name filter.
+        """
+        common_name = "Common Pharmacy"
+        factories = [PharmacyFactory(name=common_name) for _ in range(3)]
+        PharmacyFactory(name="Other Pharmacy")
+        url = reverse("pharmacy-list") + f"?pagination=cursor&name={common_name}"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.json()["results"]], [f.pk for f in factories])
+
+    def test_invalid_cursor(self):
+        """
+        Test an invalid cursor value.
+        """
+        url = reverse("pharmacy-list") + "?cursor=invalid"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_by_default(self):
+        """
+        Test the page-number response is kept when no cursor is requested.
+        """
+        PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
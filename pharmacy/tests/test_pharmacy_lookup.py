@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.repositories import PharmacyRepository
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyLookupAPI(AuthenticatedTestCase):
+    url = reverse("pharmacy-lookup")
+
+    def lookup(self, ids, query=""):
+        return self.client.post(self.url + query, {"ids": ids}, format="json")
+
+    def test_lookup_in_request_order(self):
+        """
+        Test the lookup returns a result per requested id, in order, marking the missing pharmacies.
+        """
+        first, second = PharmacyFactory(), PharmacyFactory()
+        missing = second.pk + 100
+        with patch.object(
+            PharmacyRepository, "find_many", autospec=True, side_effect=PharmacyRepository.find_many
+        ) as find:
+            response = self.lookup([second.pk, missing, first.pk, second.pk])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        find.assert_called_once()
+
+        results = response.data["results"]
+        self.assertEqual([result["id"] for result in results], [second.pk, missing, first.pk, second.pk])
+        self.assertEqual([result["found"] for result in results], [True, False, True, True])
+        self.assertEqual(results[0]["pharmacy"]["name"], second.name)
+        self.assertEqual(results[0]["pharmacy"], results[3]["pharmacy"])
+        self.assertIsNone(results[1]["pharmacy"])
+        self.assertEqual(results[2]["pharmacy"]["license_number"], first.license_number)
+        self.assertEqual(response.data["not_found"], [missing])
+
+    def test_lookup_fields(self):
+        """
+        Test the lookup renders only the requested fields.
+        """
+        pharmacy = PharmacyFactory()
+        response = self.lookup([pharmacy.pk], "?fields=name")
+        self.assertEqual(
+            response.data["results"], [{"id": pharmacy.pk, "found": True, "pharmacy": {"name": pharmacy.name}}]
+        )
+
+    @override_settings(PHARMACY_LOOKUP_MAX_IDS=3)
+    def test_lookup_invalid(self):
+        """
+        Test the lookup rejects missing, empty, invalid and too many ids.
+        """
+        for data in ({}, {"ids": []}, {"ids": ["one"]}, {"ids": [1, 2, 3, 4]}):
+            response = self.client.post(self.url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("ids", response.data)
+        self.assertEqual(self.lookup([1, 2, 3]).status_code, status.HTTP_200_OK)
+
+    def test_lookup_unauthenticated(self):
+        """
+        Test the lookup requires authentication.
+        """
+        self.client.credentials()
+        self.assertEqual(self.lookup([1]).status_code, status.HTTP_401_UNAUTHORIZED)
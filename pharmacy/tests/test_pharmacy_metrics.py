@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+from django.test import override_settings
+from django.urls import reverse
+
+from pharmacy.metrics import Histogram, MongoCommandListener, RequestMetrics, current_request, registry
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyMetrics(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    def get_count(self, histogram, route, method="GET"):
+        sample = histogram.samples.get((route, method))
+        return sum(sample[:-1]) if sample else 0
+
+    def test_histogram_exposition(self):
+        """
+        Test histograms are exposed with cumulative buckets, a sum and a count per label set.
+        """
+        histogram = Histogram("test_seconds", "Test durations.", (0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(("pharmacy-list", "GET"), value)
+        self.assertEqual(
+            histogram.expose(),
+            [
+                "# HELP test_seconds Test durations.",
+                "# TYPE test_seconds histogram",
+                'test_seconds_bucket{route="pharmacy-list",method="GET",le="0.1"} 1',
+                'test_seconds_bucket{route="pharmacy-list",method="GET",le="1.0"} 2',
+                'test_seconds_bucket{route="pharmacy-list",method="GET",le="+Inf"} 3',
+                'test_seconds_sum{route="pharmacy-list",method="GET"} 5.55',
+                'test_seconds_count{route="pharmacy-list",method="GET"} 3',
+            ],
+        )
+
+    def test_command_listener(self):
+        """
+        Test MongoDB commands are added to the metrics of the current request only.
+        """
+        listener = MongoCommandListener()
+        event = SimpleNamespace(duration_micros=1500)
+        listener.succeeded(event)
+
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        try:
+            listener.succeeded(event)
+            listener.failed(event)
+        finally:
+            current_request.reset(token)
+        self.assertEqual(metrics.mongo_commands, 2)
+        self.assertAlmostEqual(metrics.mongo_seconds, 0.003)
+
+    def test_request_metrics(self):
+        """
+        Test requests are recorded by route and method, and timed in a Server-Timing header.
+        """
+        pharmacy = PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ commands", serialize;dur=[\d.]+, total;dur=[\d.]+$'
+        )
+        self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+
+        self.assertEqual(self.get_count(registry.duration, "pharmacy-list"), 1)
+        self.assertEqual(self.get_count(registry.duration, "pharmacy-detail"), 2)
+        sizes = registry.response_size.samples[("pharmacy-list", "GET")]
+        self.assertEqual(sizes[-1], len(response.content))
+        self.assertGreater(registry.serializer_duration.samples[("pharmacy-list", "GET")][-1], 0)
+
+    def test_streamed_response_size(self):
+        """
+        Test the size of a streamed response is recorded once it is consumed.
+        """
+        PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-export"))
+        content = b"".join(response.streaming_content)
+        self.assertEqual(registry.response_size.samples[("pharmacy-export", "GET")][-1], len(content))
+
+    def test_metrics_endpoint(self):
+        """
+        Test the metrics are exposed in the Prometheus text format.
+        """
+        self.client.get(reverse("pharmacy-list"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        body = response.content.decode()
+        self.assertIn("# TYPE pharmacy_request_duration_seconds histogram", body)
+        self.assertIn('pharmacy_request_duration_seconds_count{route="pharmacy-list",method="GET"} 1', body)
+        self.assertIn('pharmacy_request_mongo_commands_bucket{route="pharmacy-list",method="GET",le="+Inf"} 1', body)
+
+    @override_settings(PHARMACY_SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        """
+        Test the Server-Timing header can be disabled while the metrics are still recorded.
+        """
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(self.get_count(registry.duration, "pharmacy-list"), 1)
+
+    @override_settings(PHARMACY_METRICS=False)
+    def test_metrics_disabled(self):
+        """
+        Test no metrics are recorded when they are disabled.
+        """
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(registry.duration.samples, {})
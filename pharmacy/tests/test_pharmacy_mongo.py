@@ -0,0 +1,115 @@
+import sys
+from unittest.mock import patch
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.test import override_settings
+from django.urls import reverse
+from pymongo import ReadPreference
+from pymongo.errors import ServerSelectionTimeoutError
+from rest_framework import status
+
+from pharmacy.checks import check_async_api
+from pharmacy.mongo import check_api_mode, get_collection, warm_up, warm_up_worker, with_read_preference
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+from pharmacy.views import PharmacyViewSet
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyMongoClient(AuthenticatedTestCase):
+    def test_with_read_preference(self):
+        """
+        Test collections read from the members of the read preference, the client's by default.
+        """
+        collection = get_collection()
+        self.assertIs(with_read_preference(collection), collection)
+        self.assertIs(with_read_preference(collection, "primary"), collection)
+        self.assertEqual(
+            with_read_preference(collection, "secondaryPreferred").read_preference, ReadPreference.SECONDARY_PREFERRED
+        )
+
+    @override_settings(PHARMACY_READ_PREFERENCE="secondaryPreferred")
+    def test_reads_use_read_preference(self):
+        """
+        Test list and retrieve read through a collection with `PHARMACY_READ_PREFERENCE`.
+        """
+        pharmacy = PharmacyFactory()
+        get_read_repository = PharmacyViewSet.get_read_repository
+        read_preferences = []
+
+        def record_read_repository(view):
+            repository = get_read_repository(view)
+            read_preferences.append(repository.collection.read_preference)
+            return repository
+
+        with patch.object(PharmacyViewSet, "get_read_repository", record_read_repository):
+            response = self.client.get(reverse("pharmacy-list"))
+            self.assertEqual(response.data["results"][0]["id"], pharmacy.pk)
+            response = self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(read_preferences, [ReadPreference.SECONDARY_PREFERRED] * 2)
+
+    @override_settings(PHARMACY_READ_PREFERENCE="secondaryPreferred", PHARMACY_RESPONSE_CACHE=True)
+    def test_secondary_reads_not_cached(self):
+        """
+        Test secondary reads are never cached, and conditional requests check versions on the primary.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        with patch("pharmacy.views.PharmacyResponseCache.set_list") as set_list:
+            self.assertEqual(self.client.get(reverse("pharmacy-list")).status_code, status.HTTP_200_OK)
+        set_list.assert_not_called()
+        with patch("pharmacy.views.PharmacyResponseCache.set_detail") as set_detail:
+            response = self.client.get(url)
+        set_detail.assert_not_called()
+
+        get_version = PharmacyViewSet.repository_class.get_version
+        read_preferences = []
+
+        def record_get_version(repository, pk):
+            read_preferences.append(repository.collection.read_preference)
+            return get_version(repository, pk)
+
+        with patch.object(PharmacyViewSet.repository_class, "get_version", record_get_version):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(read_preferences, [ReadPreference.PRIMARY])
+
+    def test_warm_up(self):
+        """
+        Test the warm-up of a worker connects the client only when enabled, and logs an unreachable server.
+        """
+        warm_up()
+
+        with patch("pharmacy.mongo.warm_up") as mongo_warm_up:
+            warm_up_worker()
+            mongo_warm_up.assert_not_called()
+            with override_settings(PHARMACY_MONGO_WARM_UP=True):
+                warm_up_worker()
+            mongo_warm_up.assert_called_once_with(DEFAULT_DB_ALIAS)
+
+        with override_settings(PHARMACY_MONGO_WARM_UP=True):
+            with patch("pharmacy.mongo.get_database", side_effect=ServerSelectionTimeoutError("unreachable")):
+                with self.assertLogs("pharmacy.mongo", "WARNING") as logs:
+                    warm_up_worker()
+        self.assertIn("unreachable", logs.output[0])
+
+        # Loading the app (as every management command does) never connects.
+        with override_settings(PHARMACY_MONGO_WARM_UP=True), patch("pharmacy.mongo.warm_up") as mongo_warm_up:
+            apps.get_app_config("pharmacy").ready()
+        mongo_warm_up.assert_not_called()
+
+    def test_async_mode_without_motor(self):
+        """
+        Test the async API refuses to start, and fails the system checks, when Motor cannot be imported.
+        """
+        # A None entry makes importing the module raise ImportError.
+        with patch.dict(sys.modules, {"motor": None}):
+            check_api_mode()
+            self.assertEqual(check_async_api(None), [])
+            with override_settings(PHARMACY_API_MODE="async"):
+                with self.assertRaisesMessage(ImproperlyConfigured, "Python 3.10 or older"):
+                    check_api_mode()
+                self.assertEqual([error.id for error in check_async_api(None)], ["pharmacy.E001"])
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.geocoding import BaseGeocoder, GeocodingError
+from pharmacy.models import Pharmacy
+from pharmacy.mongo import get_collection
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+def point(longitude, latitude):
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
+
+class FakeGeocoder(BaseGeocoder):
+    """Geocodes a few known addresses without calling any service."""
+
+    locations = {
+        "1 Tahrir Square": (31.2357, 30.0444),
+        "2 Zamalek Street": (31.2243, 30.0609),
+    }
+
+    def geocode(self, address):
+        if address == "Unreachable":
+            raise GeocodingError("Service unavailable.")
+        return self.locations.get(address)
+
+
+class TestPharmacyNearbyAPI(AuthenticatedTestCase):
+    def test_location_index_created(self):
+        """
+        Test the migrations create the 2dsphere index on the location.
+        """
+        indexes = get_collection().index_information()
+        self.assertEqual(indexes["pharmacy_location_2dsphere"]["key"], [("location", "2dsphere")])
+
+    def test_create_with_location(self):
+        """
+        Test creating a pharmacy with a GeoJSON location, and rejecting invalid ones.
+        """
+        data = {"name": "Nile Pharmacy", "address": "1 Tahrir Square", "phone_number": "555", "license_number": "GEO-1"}
+        response = self.client.post(
+            reverse("pharmacy-list"), dict(data, location=point(31.2357, 30.0444)), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["location"], point(31.2357, 30.0444))
+        pharmacy = Pharmacy.objects.get(pk=response.data["id"])
+        self.assertEqual(pharmacy.location, point(31.2357, 30.0444))
+
+        response = self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        self.assertEqual(response.data["location"], point(31.2357, 30.0444))
+
+        for location in ({"type": "Point", "coordinates": [31.2]}, point(31.2, 91), {"type": "Polygon"}, [31.2, 30.0]):
+            data["license_number"] += "0"
+            response = self.client.post(reverse("pharmacy-list"), dict(data, location=location), format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("location", response.data)
+
+    def test_nearby(self):
+        """
+        Test the nearby pharmacies are the located ones within the radius, nearest first.
+        """
+        far = PharmacyFactory(location=point(31.2243, 30.0609))
+        near = PharmacyFactory(location=point(31.2360, 30.0446))
+        PharmacyFactory(location=point(29.9187, 31.2001))
+        PharmacyFactory()
+        url = reverse("pharmacy-nearby")
+
+        response = self.client.get(url + "?lat=30.0444&lng=31.2357&radius=5000")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([item["id"] for item in response.data["results"]], [near.pk, far.pk])
+        self.assertEqual(response.data["results"][0]["location"], near.location)
+        self.assertLess(response.data["results"][0]["distance"], 100)
+        self.assertGreater(response.data["results"][1]["distance"], 1000)
+
+        response = self.client.get(url + "?lat=30.0444&lng=31.2357&limit=1")
+        self.assertEqual([item["id"] for item in response.data["results"]], [near.pk])
+
+    def test_nearby_invalid_parameters(self):
+        """
+        Test the nearby pharmacies need a valid point, radius and limit.
+        """
+        url = reverse("pharmacy-nearby")
+        for query in ("?lat=30", "?lat=91&lng=31", "?lat=30&lng=31&radius=1000000", "?lat=30&lng=31&limit=0"):
+            response = self.client.get(url + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_csv_location(self):
+        """
+        Test the CSV export writes the location as JSON.
+        """
+        PharmacyFactory(location=point(31.2357, 30.0444))
+        response = self.client.get(reverse("pharmacy-export") + "?format=csv")
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(json.loads(rows[0]["location"]), point(31.2357, 30.0444))
+
+    @override_settings(PHARMACY_GEOCODER=f"{__name__}.FakeGeocoder")
+    def test_geocode_command(self):
+        """
+        Test the geocoding backfill sets the location of the pharmacies without one.
+        """
+        tahrir = PharmacyFactory(address="1 Tahrir Square")
+        zamalek = PharmacyFactory(address="2 Zamalek Street")
+        unknown = PharmacyFactory(address="Unknown Road")
+        unreachable = PharmacyFactory(address="Unreachable")
+        located = PharmacyFactory(address="1 Tahrir Square", location=point(1.0, 2.0))
+
+        out = StringIO()
+        call_command("pharmacy_geocode", dry_run=True, stdout=out, stderr=StringIO())
+        self.assertIn("Geocoded (dry run) 2 pharmacies, 1 addresses not found, 1 failed.", out.getvalue())
+        self.assertIsNone(Pharmacy.objects.get(pk=tahrir.pk).location)
+
+        out = StringIO()
+        call_command("pharmacy_geocode", batch_size=1, stdout=out, stderr=StringIO())
+        self.assertIn("Geocoded 2 pharmacies, 1 addresses not found, 1 failed.", out.getvalue())
+        self.assertEqual(Pharmacy.objects.get(pk=tahrir.pk).location, point(31.2357, 30.0444))
+        self.assertEqual(Pharmacy.objects.get(pk=zamalek.pk).location, point(31.2243, 30.0609))
+        self.assertIsNone(Pharmacy.objects.get(pk=unknown.pk).location)
+        self.assertIsNone(Pharmacy.objects.get(pk=unreachable.pk).location)
+        self.assertEqual(Pharmacy.objects.get(pk=located.pk).location, point(1.0, 2.0))
@@ -0,0 +1,207 @@
+from io import StringIO
+from types import SimpleNamespace
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from pharmacy.middleware import PharmacyQueryProfilerMiddleware
+from pharmacy.models import Pharmacy
+from pharmacy.profiling import (
+    QueryProfile,
+    QueryProfiler,
+    SlowQueryRecorder,
+    current_profile,
+    find_execution_stats,
+    get_plan_stages,
+    get_query_shape,
+    get_slow_query_collection,
+)
+from pharmacy.views import PharmacyViewSet
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+COLLSCAN_EXPLAIN = {
+    "queryPlanner": {
+        "winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}},
+        "rejectedPlans": [{"stage": "IXSCAN"}],
+    },
+    "executionStats": {"nReturned": 1, "totalKeysExamined": 0, "totalDocsExamined": 500},
+}
+
+
+def find_command(name):
+    return {
+        "find": "pharmacy_pharmacy",
+        "filter": {"name": name},
+        "sort": {"address": 1},
+        "lsid": {"id": "session"},
+        "$db": "pharmacies",
+    }
+
+
+def command_event(request_id, command=None, duration_micros=0):
+    return SimpleNamespace(
+        database_name="pharmacies",
+        command_name="find",
+        command=command,
+        request_id=request_id,
+        duration_micros=duration_micros,
+    )
+
+
+class TestPharmacyQueryProfiling(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recorder = SlowQueryRecorder()
+        self.recorder.explain = lambda database, command: COLLSCAN_EXPLAIN
+
+    def tearDown(self):
+        get_slow_query_collection().drop()
+        super().tearDown()
+
+    def test_plan_analysis(self):
+        """
+        Test the stages of the winning plan and the execution statistics are read from an explain output.
+        """
+        self.assertEqual(get_plan_stages(COLLSCAN_EXPLAIN), ["SORT", "COLLSCAN"])
+        self.assertEqual(find_execution_stats({"stages": [COLLSCAN_EXPLAIN]})["totalDocsExamined"], 500)
+        self.assertEqual(find_execution_stats({}), {})
+
+    def test_query_shape(self):
+        """
+        Test queries that only differ by their values have the same shape.
+        """
+        shape = get_query_shape("find", find_command("Nile"))
+        self.assertEqual(shape, get_query_shape("find", find_command("Delta")))
+        self.assertNotEqual(shape, get_query_shape("find", dict(find_command("Nile"), sort={"name": 1})))
+        self.assertEqual(
+            get_query_shape("find", {"find": "c", "filter": {"id": {"$in": [1, 2]}}}),
+            get_query_shape("find", {"find": "c", "filter": {"id": {"$in": [3]}}}),
+        )
+
+    @override_settings(PHARMACY_SLOW_QUERY_MS=50, PHARMACY_SLOW_QUERY_SAMPLE_RATE=0.0)
+    def test_profiler_captures_slow_commands(self):
+        """
+        Test the profiler captures the commands of profiled requests over the threshold, with their view and SQL.
+        """
+        captures = []
+        profiler = QueryProfiler(SimpleNamespace(submit=captures.append))
+        profiler.started(command_event(1, find_command("Nile")))
+        profiler.succeeded(command_event(1, duration_micros=80_000))
+        self.assertEqual(captures, [])
+
+        profile = QueryProfile("pharmacy.views.PharmacyViewSet.list")
+        sql = profile.sql = 'SELECT "pharmacy_pharmacy"."id" FROM "pharmacy_pharmacy"'
+        token = current_profile.set(profile)
+        try:
+            profiler.started(command_event(2, find_command("Nile")))
+            profiler.started(command_event(3, find_command("Delta")))
+            profiler.succeeded(command_event(2, duration_micros=80_000))
+            profiler.succeeded(command_event(3, duration_micros=10_000))
+            with override_settings(PHARMACY_SLOW_QUERY_SAMPLE_RATE=1.0):
+                profiler.started(command_event(4, find_command("Delta")))
+                profiler.failed(command_event(4, duration_micros=10_000))
+                # The commands on other collections, such as the token lookups, are never captured.
+                profiler.started(command_event(5, {"find": "authtoken_token", "filter": {"key": "secret"}}))
+                profiler.succeeded(command_event(5, duration_micros=80_000))
+        finally:
+            current_profile.reset(token)
+
+        self.assertEqual([capture["reason"] for capture in captures], ["slow", "sample"])
+        self.assertEqual(captures[0]["view"], "pharmacy.views.PharmacyViewSet.list")
+        self.assertEqual(captures[0]["sql"], sql)
+        self.assertEqual(captures[0]["duration_ms"], 80.0)
+        self.assertIsNone(captures[1]["sql"])
+
+    def test_recorder_stores_flagged_plans(self):
+        """
+        Test the recorder explains a capture, logs a warning for a collection scan and stores it.
+        """
+        capture = {
+            "reason": "slow",
+            "view": "pharmacy.views.PharmacyViewSet.list",
+            "sql": 'SELECT "pharmacy_pharmacy"."id" FROM "pharmacy_pharmacy"',
+            "database": "pharmacies",
+            "command_name": "find",
+            "command": find_command("Nile"),
+            "duration_ms": 80.0,
+        }
+        with self.assertLogs("pharmacy.profiling", "WARNING") as logs:
+            self.assertTrue(self.recorder.submit(capture))
+            self.recorder.join()
+        self.assertIn("COLLSCAN/SORT", logs.output[0])
+        self.assertIn("PharmacyViewSet.list", logs.output[0])
+        self.assertNotIn("Nile", logs.output[0])
+
+        record = get_slow_query_collection().find_one()
+        self.assertEqual(record["flags"], ["COLLSCAN", "SORT"])
+        self.assertEqual(record["collection"], "pharmacy_pharmacy")
+        self.assertEqual(record["docs_examined"], 500)
+        self.assertEqual(record["sql"], capture["sql"])
+        self.assertNotIn("lsid", record["command"])
+        # Only the shape of the command is stored, without its literal values.
+        self.assertEqual(record["command"], get_query_shape("find", find_command("Delta")))
+
+    @override_settings(PHARMACY_SLOW_QUERY_MS=50)
+    def test_middleware_records_view_and_sql(self):
+        """
+        Test the middleware profiles a request with the name of its view and the SQL djongo received.
+        """
+        profiles = []
+        view = PharmacyViewSet.as_view({"get": "list"})
+
+        def get_response(request):
+            # Django's handler calls process_view once the URL is resolved.
+            middleware.process_view(request, view, (), {})
+            Pharmacy.objects.filter(name="Nile").count()
+            profiles.append(current_profile.get())
+            return HttpResponse()
+
+        middleware = PharmacyQueryProfilerMiddleware(get_response)
+        middleware(RequestFactory().get("/pharmacies/"))
+        self.assertEqual(profiles[0].view, "pharmacy.views.PharmacyViewSet.list")
+        self.assertIn('"pharmacy_pharmacy"', profiles[0].sql)
+        self.assertIsNone(current_profile.get())
+
+    def test_slow_queries_command(self):
+        """
+        Test the command reports the captured queries grouped by shape, flagged shapes first, and clears them.
+        """
+        for name, duration in (("Nile", 80.0), ("Delta", 40.0)):
+            self.recorder.process(
+                {
+                    "reason": "slow",
+                    "view": "pharmacy.views.PharmacyViewSet.list",
+                    "sql": None,
+                    "database": "pharmacies",
+                    "command_name": "find",
+                    "command": find_command(name),
+                    "duration_ms": duration,
+                }
+            )
+        self.recorder.explain = lambda database, command: {"queryPlanner": {"winningPlan": {"stage": "IXSCAN"}}}
+        self.recorder.process(
+            {
+                "reason": "sample",
+                "view": "pharmacy.views.PharmacyViewSet.retrieve",
+                "sql": None,
+                "database": "pharmacies",
+                "command_name": "find",
+                "command": {"find": "pharmacy_pharmacy", "filter": {"id": 1}},
+                "duration_ms": 500.0,
+            }
+        )
+
+        out = StringIO()
+        call_command("pharmacy_slow_queries", stdout=out)
+        output = out.getvalue()
+        self.assertIn("Top 2 captured query shapes", output)
+        self.assertIn("x2: max 80.0 ms, avg 60.0 ms, 500 docs examined, flags: COLLSCAN, SORT", output)
+        self.assertLess(output.index("PharmacyViewSet.list"), output.index("PharmacyViewSet.retrieve"))
+
+        out = StringIO()
+        call_command("pharmacy_slow_queries", flagged=True, clear=True, stdout=out)
+        self.assertIn("Top 1 captured query shapes", out.getvalue())
+        self.assertIn("Deleted 3 captured queries.", out.getvalue())
+        self.assertEqual(get_slow_query_collection().count_documents({}), 0)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.repositories import PharmacyRepository
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyReadBackendParity(AuthenticatedTestCase):
+    def get_with_backends(self, url):
+        responses = []
+        for backend in ("orm", "mongo"):
+            cache.clear()
+            with override_settings(PHARMACY_READ_BACKEND=backend):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            responses.append(response.json())
+        return responses
+
+    def test_list_parity(self):
+        """
+        Test the native list returns the same page as the ORM list.
+        """
+        PharmacyFactory.create_batch(12)
+        orm_data, mongo_data = self.get_with_backends(reverse("pharmacy-list") + "?page=2")
+        self.assertEqual(orm_data["results"], mongo_data["results"])
+        self.assertEqual(orm_data["next"], mongo_data["next"])
+        self.assertEqual(orm_data["previous"], mongo_data["previous"])
+
+    def test_list_filter_by_name_parity(self):
+        """
+        Test the native list filtered by name returns the same results as the ORM list.
+        """
+        common_name = "Common Pharmacy"
+        PharmacyFactory.create_batch(3, name=common_name)
+        PharmacyFactory()
+        orm_data, mongo_data = self.get_with_backends(reverse("pharmacy-list") + f"?name={common_name}")
+        self.assertEqual(orm_data, mongo_data)
+
+    def test_cursor_list_parity(self):
+        """
+        Test the native cursor list returns the same page as the ORM cursor list.
+        """
+        PharmacyFactory.create_batch(12)
+        orm_data, mongo_data = self.get_with_backends(reverse("pharmacy-list") + "?pagination=cursor")
+        self.assertEqual(orm_data, mongo_data)
+
+    def test_retrieve_parity(self):
+        """
+        Test the native retrieve returns the same pharmacy as the ORM retrieve.
+        """
+        pharmacy = PharmacyFactory()
+        orm_data, mongo_data = self.get_with_backends(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        self.assertEqual(orm_data, mongo_data)
+
+    def test_repository_find_one(self):
+        """
+        Test the repository returns plain documents and `None` for missing or invalid keys.
+        """
+        pharmacy = PharmacyFactory()
+        repository = PharmacyRepository()
+        self.assertEqual(
+            repository.find_one(pharmacy.pk),
+            {
+                "id": pharmacy.pk,
+                "name": pharmacy.name,
+                "address": pharmacy.address,
+                "phone_number": pharmacy.phone_number,
+                "license_number": pharmacy.license_number,
+                "location": None,
+                "updated_at": pharmacy.updated_at.replace(tzinfo=None),
+                "version": 1,
+            },
+        )
+        self.assertIsNone(repository.find_one(999))
+        self.assertIsNone(repository.find_one("abcdef"))
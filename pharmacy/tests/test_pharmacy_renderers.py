@@ -0,0 +1,59 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from pharmacy.renderers import EncodedJSON, ORJSONRenderer
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestORJSONRenderer(AuthenticatedTestCase):
+    def test_parity_with_json_renderer(self):
+        """
+        Test the orjson renderer encodes like DRF's JSONRenderer.
+        """
+        data = {
+            "id": 1,
+            "name": 'Pharmacie éè "quoted" \u2028\u2029',
+            "nested": [{"a": None, "b": True, "c": 1.5}],
+            "decimal": Decimal("1.25"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "date": datetime.datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=datetime.timezone.utc),
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_encoded_json_rendered_as_is(self):
+        """
+        Test pre-encoded JSON is returned without being encoded again.
+        """
+        self.assertEqual(ORJSONRenderer().render(EncodedJSON(b'{"id":1}')), b'{"id":1}')
+
+    def test_indented_output(self):
+        """
+        Test indented output falls back to DRF's JSONRenderer.
+        """
+        data = {"id": 1}
+        context = {"indent": 4}
+        self.assertEqual(
+            ORJSONRenderer().render(data, renderer_context=context),
+            JSONRenderer().render(data, renderer_context=context),
+        )
+
+    def test_default_renderer(self):
+        """
+        Test API responses are rendered by the orjson renderer.
+        """
+        pharmacy = PharmacyFactory()
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        first_response = self.client.get(url)
+        second_response = self.client.get(url)
+        self.assertIsInstance(second_response.data, EncodedJSON)
+        self.assertEqual(second_response.content, JSONRenderer().render(first_response.data))
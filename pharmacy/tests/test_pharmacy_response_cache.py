@@ -0,0 +1,100 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.caching import PharmacyResponseCache
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyResponseCache(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        PharmacyResponseCache.reset_stats()
+
+    def test_retrieve_cached(self):
+        """
+        Test the second retrieve of a pharmacy is served from the cache.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        first_response = self.client.get(url)
+        second_response = self.client.get(url)
+        self.assertEqual(second_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(first_response.content, second_response.content)
+        self.assertEqual(PharmacyResponseCache.get_stats()["detail"], {"hits": 1, "misses": 1})
+
+    def test_update_invalidates_detail(self):
+        """
+        Test updating a pharmacy invalidates its cached detail.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        self.client.get(url)
+        self.client.put(url, {"name": "Updated Pharmacy"}, format="json")
+        response = self.client.get(url)
+        self.assertEqual(response.data["name"], "Updated Pharmacy")
+
+    def test_delete_invalidates_detail(self):
+        """
+        Test deleting a pharmacy invalidates its cached detail.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        self.client.get(url)
+        self.client.delete(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_cached_per_page(self):
+        """
+        Test list pages are cached per name, page and page size.
+        """
+        PharmacyFactory.create_batch(3)
+        url = reverse("pharmacy-list")
+        self.client.get(url + "?page_size=2")
+        response = self.client.get(url + "?page_size=2")
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(url + "?page_size=2&page=2")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(PharmacyResponseCache.get_stats()["list"], {"hits": 1, "misses": 2})
+
+    def test_create_invalidates_list(self):
+        """
+        Test creating a pharmacy invalidates the cached list pages.
+        """
+        PharmacyFactory()
+        url = reverse("pharmacy-list")
+        self.assertEqual(len(self.client.get(url).data["results"]), 1)
+
+        data = {
+            "name": "New Pharmacy",
+            "address": "555 Elm St",
+            "phone_number": "555-123-4567",
+            "license_number": "XYZ987",
+        }
+        self.client.post(url, data, format="json")
+        self.assertEqual(len(self.client.get(url).data["results"]), 2)
+
+    def test_cache_stats(self):
+        """
+        Test the cache stats endpoint reports the counters.
+        """
+        pharmacy = PharmacyFactory()
+        self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        response = self.client.get(reverse("pharmacy-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["detail"], {"hits": 0, "misses": 1})
+        self.assertEqual(response.data["list"], {"hits": 0, "misses": 0})
+
+    @override_settings(PHARMACY_RESPONSE_CACHE=False)
+    def test_cache_disabled(self):
+        """
+        Test nothing is cached when the response cache is disabled.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(PharmacyResponseCache.get_stats()["detail"], {"hits": 0, "misses": 0})
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy import schema
+from pharmacy.benchmarks.imports import group_by_package, parse_import_times
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+IMPORT_TIMES = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   django.utils
+import time:       300 |        420 | django
+import time:       200 |        200 |   pharmacy.models
+import time:        50 |        250 | pharmacy
+"""
+
+
+class TestPharmacySchema(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "openapi.json")
+        settings_override = override_settings(PHARMACY_SCHEMA_FILE=self.path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        schema.schemas.clear()
+        self.addCleanup(schema.schemas.clear)
+
+    def test_schema_command(self):
+        """
+        Test the command writes the schema file, then checks whether it is up to date.
+        """
+        with self.assertRaisesMessage(CommandError, "does not exist"):
+            call_command("pharmacy_schema", check=True, stdout=StringIO())
+
+        call_command("pharmacy_schema", stdout=StringIO())
+        with open(self.path) as schema_file:
+            document = json.load(schema_file)
+        self.assertIn("/pharmacies/", document["paths"])
+        self.assertIn("/pharmacies/lookup/", document["paths"])
+        out = StringIO()
+        call_command("pharmacy_schema", check=True, stdout=out)
+        self.assertIn("up to date", out.getvalue())
+
+        with open(self.path, "w") as schema_file:
+            schema_file.write("{}")
+        with self.assertRaisesMessage(CommandError, "is outdated"):
+            call_command("pharmacy_schema", check=True, stdout=StringIO())
+
+    def test_schema_served_from_memory(self):
+        """
+        Test the schema file is read once and served from memory.
+        """
+        with open(self.path, "w") as schema_file:
+            schema_file.write('{"openapi": "3.0.3"}')
+        response = self.client.get(reverse("schema"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], schema.SCHEMA_CONTENT_TYPE)
+        self.assertEqual(response.content, b'{"openapi": "3.0.3"}')
+
+        os.remove(self.path)
+        with patch.object(schema, "generate_schema", side_effect=AssertionError):
+            self.assertEqual(self.client.get(reverse("schema")).content, b'{"openapi": "3.0.3"}')
+        self.assertEqual(self.client.post(reverse("schema")).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_schema_generated_without_file(self):
+        """
+        Test the schema is generated once when its file is missing.
+        """
+        with self.assertLogs("pharmacy.schema", "WARNING"):
+            response = self.client.get(reverse("schema"))
+        self.assertIn("/pharmacies/{id}/", json.loads(response.content)["paths"])
+        with patch.object(schema, "generate_schema", side_effect=AssertionError):
+            self.assertEqual(self.client.get(reverse("schema")).content, response.content)
+
+    @override_settings(DEBUG=True)
+    def test_schema_dynamic_in_debug(self):
+        """
+        Test the schema is generated on every request in DEBUG, ignoring the schema file.
+        """
+        with open(self.path, "w") as schema_file:
+            schema_file.write('{"openapi": "3.0.3"}')
+        response = self.client.get(reverse("schema") + "?format=json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("/pharmacies/", response.json()["paths"])
+
+    def test_documentation_views(self):
+        """
+        Test the Swagger and Redoc views, imported on their first request, point to the schema.
+        """
+        for name in ("swagger-ui", "redoc"):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertContains(response, reverse("schema"))
+
+    def test_import_times(self):
+        """
+        Test the import time report is parsed and grouped by top-level package.
+        """
+        imports = parse_import_times(IMPORT_TIMES.splitlines())
+        self.assertEqual(imports[0], ("django.utils", 120, 120))
+        self.assertEqual(len(imports), 4)
+        self.assertEqual(group_by_package(imports), [("django", 420, 2), ("pharmacy", 250, 2)])
+
+        result = {"wall_ms": 12.5, "wall_runs_ms": [12.5], "imports": imports}
+        out = StringIO()
+        with patch("pharmacy.management.commands.pharmacy_import_time.measure_imports", return_value=result):
+            call_command("pharmacy_import_time", top=1, stdout=out)
+        self.assertIn("import pharmacies.wsgi: 12.5 ms median", out.getvalue())
+        self.assertIn("django: 0.4 ms, 2 modules", out.getvalue())
+        self.assertIn("django: 0.4 ms\n", out.getvalue())
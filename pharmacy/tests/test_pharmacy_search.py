@@ -0,0 +1,87 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.mongo import get_collection
+from pharmacy.repositories import NAME_FILTERS_ERROR, PharmacyRepository
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacySearchAPI(AuthenticatedTestCase):
+    def test_search_indexes_created(self):
+        """
+        Test the migrations create the text and case-insensitive name indexes.
+        """
+        indexes = get_collection().index_information()
+        self.assertIn("pharmacy_name_address_text", indexes)
+        self.assertIn("pharmacy_name_ci_idx", indexes)
+
+    def test_search_name_and_address(self):
+        """
+        Test searching words in the name and address, ordered by relevance.
+        """
+        name_match = PharmacyFactory(name="Nile Pharmacy", address="1 Main St")
+        address_match = PharmacyFactory(name="Corner Drugs", address="5 Nile Road")
+        PharmacyFactory(name="Delta Pharmacy", address="3 Cairo Street")
+        url = reverse("pharmacy-list")
+        self.assertEqual(self.client.get(url).data["count"], 3)
+
+        response = self.client.get(url + "?q=nile")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertTrue(response.data["count_exact"])
+        self.assertEqual([item["id"] for item in response.data["results"]], [name_match.pk, address_match.pk])
+        self.assertNotIn("score", response.data["results"][0])
+
+    @override_settings(PHARMACY_READ_BACKEND="orm")
+    def test_search_with_orm_backend(self):
+        """
+        Test searches go through the repository with the ORM read backend.
+        """
+        pharmacy = PharmacyFactory(name="Delta Pharmacy", address="3 Cairo Street")
+        PharmacyFactory(name="Nile Pharmacy", address="1 Main St")
+        response = self.client.get(reverse("pharmacy-list") + "?q=cairo")
+        self.assertEqual([item["id"] for item in response.data["results"]], [pharmacy.pk])
+
+    def test_name_prefix_ignores_case(self):
+        """
+        Test the name prefix filter ignores case and orders by name.
+        """
+        second = PharmacyFactory(name="cairo Pharmacy")
+        first = PharmacyFactory(name="Cairo Central")
+        PharmacyFactory(name="Alexandria Pharmacy")
+        response = self.client.get(reverse("pharmacy-list") + "?name__startswith=CAI")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([item["id"] for item in response.data["results"]], [first.pk, second.pk])
+
+    def test_name_prefix_with_name(self):
+        """
+        Test the name prefix filter cannot be combined with an exact name, which its collation would make
+        case-insensitive.
+        """
+        PharmacyFactory(name="Cairo Central")
+        for url in (reverse("pharmacy-list"), reverse("pharmacy-export")):
+            response = self.client.get(url + "?name=cairo%20central&name__startswith=CAI")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data, {"name__startswith": [NAME_FILTERS_ERROR]})
+
+        documents = PharmacyRepository(get_collection()).all()
+        with self.assertRaises(ValueError):
+            documents.filter(name="Cairo Central", name__istartswith="cai")
+        with self.assertRaises(ValueError):
+            documents.filter(name__istartswith="cai").filter(name="Cairo Central")
+        self.assertEqual(len(list(documents.filter(name__istartswith="cai", address="x"))), 0)
+
+    def test_name_prefix_and_search_export(self):
+        """
+        Test the export applies the search parameters.
+        """
+        pharmacy = PharmacyFactory(name="Cairo Central")
+        PharmacyFactory(name="Alexandria Pharmacy")
+        response = self.client.get(reverse("pharmacy-export") + "?name__startswith=cai")
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertEqual(len(content.splitlines()), 1)
+        self.assertIn(pharmacy.license_number, content)
@@ -0,0 +1,91 @@
+from base64 import b64encode
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+from pharmacy.throttling import TokenBucket, get_limiter, parse_rate
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyThrottling(AuthenticatedTestCase):
+    def test_token_bucket(self):
+        """
+        Test a bucket allows a burst of its capacity, then refills at its rate.
+        """
+        bucket = TokenBucket(cache, *parse_rate("3/min"))
+        self.assertEqual([bucket.consume("bucket", now=100) for _ in range(3)], [0, 0, 0])
+        self.assertEqual(bucket.consume("bucket", now=100), 20)
+        self.assertEqual(bucket.consume("bucket", now=110), 10)
+        self.assertEqual(bucket.consume("bucket", now=120), 0)
+        self.assertEqual(bucket.consume("bucket", now=120), 20)
+        # A bucket never holds more than its capacity.
+        self.assertEqual([bucket.consume("bucket", now=1000) for _ in range(4)], [0, 0, 0, 20])
+        self.assertIsNone(parse_rate(""))
+
+    @override_settings(PHARMACY_THROTTLE_READ_RATE="2/min", PHARMACY_THROTTLE_WRITE_RATE="1/hour")
+    def test_rates(self):
+        """
+        Test reads and writes are throttled separately, per user, with a Retry-After header.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", args=[pharmacy.pk])
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+
+        self.assertEqual(self.client.patch(url, {"name": "Renamed"}).status_code, status.HTTP_200_OK)
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "3600")
+
+        User.objects.create_user(username="other_user", password="other_password")
+        self.client.credentials(HTTP_AUTHORIZATION="Basic " + b64encode(b"other_user:other_password").decode())
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    @override_settings(PHARMACY_MAX_CONCURRENT_READS=2, PHARMACY_ADMISSION_TIMEOUT=0)
+    def test_concurrency_limit(self):
+        """
+        Test reads beyond the concurrency limit are shed with a 503, while writes are still served.
+        """
+        limiter = get_limiter("read")
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        # The slot of every request is released once it is served.
+        self.assertTrue(limiter.acquire() and limiter.acquire())
+        self.addCleanup(limiter.release)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(response.json(), {"detail": "The server is overloaded, retry later."})
+        response = self.client.patch(reverse("pharmacy-detail", args=[pharmacy.pk]), {"name": "Renamed"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        limiter.release()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    @override_settings(PHARMACY_MAX_CONCURRENT_READS=1, PHARMACY_ADMISSION_TIMEOUT=0)
+    def test_concurrency_limit_export(self):
+        """
+        Test an export holds its concurrency slot until its stream is consumed, or closed unread.
+        """
+        PharmacyFactory.create_batch(3)
+        url = reverse("pharmacy-list")
+        response = self.client.get(reverse("pharmacy-export"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 3)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("pharmacy-export"))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        response.close()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
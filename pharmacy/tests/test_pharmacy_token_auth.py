@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
+
+from .authenticated_test_case import AuthenticatedTestCase
+
+
+class TestPharmacyTokenAuthAPI(AuthenticatedTestCase):
+    def get_token(self):
+        response = self.client.post(
+            reverse("api-token"), {"username": self.username, "password": self.password}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["token"]
+
+    def test_retrieve_with_token(self):
+        """
+        Test retrieving pharmacy with token authentication.
+        """
+        pharmacy = PharmacyFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.get_token()}")
+        response = self.client.get(reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], pharmacy.pk)
+
+    def test_invalid_token(self):
+        """
+        Test request with an invalid token.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_lookup_cached(self):
+        """
+        Test the token is looked up in the database only once.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.get_token()}")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token(self):
+        """
+        Test a deleted token is not accepted anymore.
+        """
+        key = self.get_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        self.assertEqual(self.client.get(reverse("pharmacy-list")).status_code, status.HTTP_200_OK)
+        Token.objects.get(key=key).delete()
+        self.assertEqual(self.client.get(reverse("pharmacy-list")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(PHARMACY_BASIC_AUTHENTICATION=False)
+    def test_basic_authentication_disabled(self):
+        """
+        Test basic authentication is refused when it is disabled.
+        """
+        response = self.client.get(reverse("pharmacy-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_auth_benchmark_command(self):
+        """
+        Test the authentication benchmark reports both schemes.
+        """
+        out = StringIO()
+        call_command("pharmacy_auth_benchmark", requests=2, stdout=out)
+        self.assertIn("basic:", out.getvalue())
+        self.assertIn("token:", out.getvalue())
@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
 from django.urls import reverse
 from rest_framework import status
 
+from pharmacy.models import Pharmacy
+from pharmacy.repositories import PharmacyRepository
 from pharmacy.tests.factories.pharmacy_factory import PharmacyFactory
 
 from .authenticated_test_case import AuthenticatedTestCase
@@ -42,3 +46,26 @@ class TestPharmacyUpdateAPI(AuthenticatedTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual("max_length", response.data["phone_number"][0].code)
         self.assertIn("has no more than", response.data["phone_number"][0])
+
+    def test_update_single_command(self):
+        """
+        Test a partial update is written with a single command, without reading the pharmacy first.
+        """
+        pharmacy = PharmacyFactory()
+        url = reverse("pharmacy-detail", kwargs={"pk": pharmacy.pk})
+        with patch.object(PharmacyRepository, "get_version", side_effect=AssertionError), patch.object(
+            Pharmacy.objects, "get", side_effect=AssertionError
+        ):
+            response = self.client.patch(url, {"phone_number": "555-000"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["phone_number"], "555-000")
+        self.assertEqual(response.data["name"], pharmacy.name)
+        self.assertEqual(response.data["version"], 2)
+
+    def test_update_missing(self):
+        """
+        Test updating a missing pharmacy returns 404, even with invalid data.
+        """
+        for pk, data in ((999, {"name": "Valid"}), (999, {"name": "x" * 200}), ("abc", {"name": "Valid"})):
+            response = self.client.put(reverse("pharmacy-detail", kwargs={"pk": pk}), data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,228 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+# Viewset actions writing pharmacies; the other actions (including the POST lookup) read them.
+WRITE_ACTIONS = {"create", "update", "partial_update", "destroy", "bulk"}
+
+# Seconds of the periods of a rate, by their first letter.
+RATE_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The server is overloaded, retry later."
+    default_code = "overloaded"
+
+    def __init__(self, wait, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+def get_scope(request, view):
+    """Get the limit scope of a request: `"write"` for the actions writing pharmacies, `"read"` otherwise.
+
+    Views without actions (the async views) are scoped by the request method.
+    """
+
+    action = getattr(view, "action", None)
+    if action is None:
+        return "read" if request.method in SAFE_METHODS else "write"
+    return "write" if action in WRITE_ACTIONS else "read"
+
+
+def parse_rate(rate):
+    """Parse a rate such as `"100/min"`, in the format of DRF's throttle rates.
+
+    Returns:
+    - tuple: The number of requests and the period in seconds, or `None` if the rate is empty.
+    """
+
+    if not rate:
+        return None
+    requests, period = rate.split("/")
+    return int(requests), RATE_PERIODS[period[0]]
+
+
+class TokenBucket:
+    """Token buckets kept in a cache, one per key.
+
+    A bucket holds up to `capacity` tokens and is refilled continuously at
+    `capacity / period` tokens per second, so a client can burst up to `capacity`
+    requests, then is held to the rate. Reading and updating a bucket are not atomic,
+    so concurrent requests of a same client may overdraw it slightly, as with DRF's
+    throttles.
+
+    Parameters:
+    - cache (BaseCache): The cache storing the buckets.
+    - capacity (int): The maximum number of tokens.
+    - period (float): The seconds to refill an empty bucket.
+    """
+
+    def __init__(self, cache, capacity, period):
+        self.cache = cache
+        self.capacity = capacity
+        self.refill_rate = capacity / period
+        # A bucket left untouched for a whole period is full again, like a missing one.
+        self.timeout = math.ceil(period)
+
+    def consume(self, key, now=None):
+        """Take a token from a bucket.
+
+        Parameters:
+        - key (str): The cache key of the bucket.
+        - now (float): The current time, in seconds since the epoch.
+
+        Returns:
+        - float: `0` if a token was taken, otherwise the seconds until the next token.
+        """
+
+        # Wall-clock time, comparable between the processes and hosts sharing the cache (a monotonic clock is not).
+        now = time.time() if now is None else now
+        tokens, updated = self.cache.get(key) or (self.capacity, now)
+        tokens = min(self.capacity, tokens + (now - updated) * self.refill_rate)
+        if tokens < 1:
+            return (1 - tokens) / self.refill_rate
+        self.cache.set(key, (tokens - 1, now), self.timeout)
+        return 0
+
+
+class PharmacyRateThrottle(BaseThrottle):
+    """Limit the requests of every user with a token bucket, reads and writes separately.
+
+    The rates are `PHARMACY_THROTTLE_READ_RATE` and `PHARMACY_THROTTLE_WRITE_RATE`
+    (e.g. `"600/min"`, unlimited when empty); the buckets are kept in the
+    `PHARMACY_THROTTLE_CACHE_ALIAS` cache, so a shared cache applies them across processes.
+    """
+
+    key_prefix = "pharmacy:throttle:"
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_cache_key(self, request, scope):
+        user = request.user
+        ident = f"user:{user.pk}" if user is not None and user.is_authenticated else f"ip:{self.get_ident(request)}"
+        return f"{self.key_prefix}{scope}:{ident}"
+
+    def allow_request(self, request, view):
+        scope = get_scope(request, view)
+        rate = parse_rate(getattr(settings, f"PHARMACY_THROTTLE_{scope.upper()}_RATE"))
+        if rate is None:
+            return True
+        bucket = TokenBucket(caches[settings.PHARMACY_THROTTLE_CACHE_ALIAS], *rate)
+        self.wait_seconds = bucket.consume(self.get_cache_key(request, scope))
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ConcurrencyLimiter:
+    """Limit the number of requests of a scope served at the same time by the process.
+
+    Parameters:
+    - limit (int): The maximum number of concurrent requests.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.semaphore = threading.BoundedSemaphore(limit)
+
+    def acquire(self, timeout=0):
+        """Take a slot, waiting at most `timeout` seconds for one.
+
+        Returns:
+        - bool: Whether a slot was taken.
+        """
+
+        if not timeout:
+            return self.semaphore.acquire(blocking=False)
+        return self.semaphore.acquire(timeout=timeout)
+
+    def release(self):
+        self.semaphore.release()
+
+
+class AdmittedStream:
+    """Iterate the content of a streaming response, holding the concurrency slot of its request until it ends.
+
+    The slot is released when the content is exhausted or closed (by the server, once the
+    response is sent or the client goes away), even if it was never iterated.
+
+    Parameters:
+    - content (iterable): The streaming content of the response.
+    - limiter (ConcurrencyLimiter): The limiter of the slot to release.
+    """
+
+    def __init__(self, content, limiter):
+        self.content = iter(content)
+        self.limiter = limiter
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.content)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        limiter, self.limiter = self.limiter, None
+        if limiter is not None:
+            limiter.release()
+
+
+# The limiters of the process, by scope and limit.
+limiters = {}
+limiters_lock = threading.Lock()
+
+
+def get_limiter(scope):
+    """Get the concurrency limiter of a scope, from `PHARMACY_MAX_CONCURRENT_READS` or `..._WRITES`.
+
+    Returns:
+    - ConcurrencyLimiter: The limiter, or `None` if the scope is unlimited.
+    """
+
+    limit = getattr(settings, f"PHARMACY_MAX_CONCURRENT_{scope.upper()}S")
+    if not limit:
+        return None
+    with limiters_lock:
+        if (scope, limit) not in limiters:
+            limiters[(scope, limit)] = ConcurrencyLimiter(limit)
+        return limiters[(scope, limit)]
+
+
+def admit(scope, timeout=None):
+    """Admit a request, or shed it if the process already serves as many requests of its scope as allowed.
+
+    Excess requests wait at most `timeout` seconds (`PHARMACY_ADMISSION_TIMEOUT` by
+    default) for a slot instead of queuing for a database connection without bound.
+
+    Parameters:
+    - scope (str): `"read"` or `"write"`.
+    - timeout (float): The seconds to wait for a slot.
+
+    Returns:
+    - ConcurrencyLimiter: The limiter to release once the request is served, or `None` if the scope is unlimited.
+
+    Raises:
+    - Overloaded: If no slot was free in time.
+    """
+
+    limiter = get_limiter(scope)
+    if limiter is None:
+        return None
+    if not limiter.acquire(settings.PHARMACY_ADMISSION_TIMEOUT if timeout is None else timeout):
+        raise Overloaded(settings.PHARMACY_OVERLOAD_RETRY_AFTER)
+    return limiter
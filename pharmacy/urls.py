@@ -1,8 +1,37 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework import routers
 
+from pharmacy.async_views import AsyncPharmacyDetailView, AsyncPharmacyListView
 from pharmacy.views import PharmacyViewSet
 
 router = routers.DefaultRouter()
 router.register(r"pharmacies", PharmacyViewSet, basename="pharmacy")
 
-urlpatterns = router.urls
+async_urlpatterns = [
+    path("pharmacies/", AsyncPharmacyListView.as_view(), name="pharmacy-list"),
+    path("pharmacies/<str:pk>/", AsyncPharmacyDetailView.as_view(), name="pharmacy-detail"),
+]
+
+
+def get_urlpatterns(api_mode):
+    """Get the URL patterns of the pharmacy API.
+
+    In `"async"` mode the list and detail routes are served by the async views and
+    the other routes (bulk, export, ...) stay on `PharmacyViewSet`.
+
+    Parameters:
+    - api_mode (str): `"sync"` or `"async"`.
+
+    Returns:
+    - list: The URL patterns.
+    """
+
+    if api_mode != "async":
+        return router.urls
+
+    async_names = {pattern.name for pattern in async_urlpatterns}
+    return [pattern for pattern in router.urls if pattern.name not in async_names] + async_urlpatterns
+
+
+urlpatterns = get_urlpatterns(settings.PHARMACY_API_MODE)
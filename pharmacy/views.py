@@ -1,12 +1,48 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from pymongo.errors import DuplicateKeyError
 from rest_framework import status
 from rest_framework.authentication import BasicAuthentication
-from rest_framework.exceptions import NotFound
+from rest_framework.decorators import action
+from rest_framework.exceptions import ErrorDetail, NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
 
+from .authentication import CachedTokenAuthentication
+from .caching import PharmacyResponseCache
+from .changes import ChangesExpired, encode_change_token
+from .conditional import (
+    PreconditionFailed,
+    evaluate_preconditions,
+    get_if_match_versions,
+    get_list_etag,
+    get_validators,
+    set_validators,
+)
+from .counts import PharmacyCountProvider
+from .fields import bson_now
 from .models import Pharmacy
-from .serializers import PharmacySerializer
+from .mongo import DUPLICATE_KEY_ERROR_CODE, get_collection, is_primary_read_preference
+from .pagination import PharmacyCursorPagination
+from .parsers import NDJSONParser
+from .renderers import CSVRenderer, NDJSONRenderer
+from .repositories import NAME_FILTERS_ERROR, PharmacyRepository
+from .serializers import (
+    PharmacyBulkSerializer,
+    PharmacyChangesQuerySerializer,
+    PharmacyFastSerializer,
+    PharmacyLookupSerializer,
+    PharmacyNearbyQuerySerializer,
+    PharmacySerializer,
+    UTCDateTimeField,
+)
+from .throttling import AdmittedStream, PharmacyRateThrottle, admit, get_scope
 
 
 class PharmacyViewSet(ModelViewSet):
@@ -20,34 +56,263 @@ class PharmacyViewSet(ModelViewSet):
     * `retrieve(request, pk)`: Get a specific pharmacy by primary key or name (GET /pharmacies/{pk}/).
     * `update(request, pk)`: Update an existing pharmacy (PUT/PATCH /pharmacies/{pk}/).
     * `destroy(request, pk)`: Delete a pharmacy (DELETE /pharmacies/{pk}/).
+    * `bulk(request)`: Create or upsert many pharmacies at once (POST /pharmacies/bulk/).
+    * `export(request)`: Stream all pharmacies as NDJSON or CSV (GET /pharmacies/export/).
+    * `nearby(request)`: Get the pharmacies closest to a point (GET /pharmacies/nearby/).
+    * `lookup(request)`: Get many pharmacies by id in a single query (POST /pharmacies/lookup/).
+    * `changes(request)`: Get the pharmacies written or deleted since a change token (GET /pharmacies/changes/).
+    * `cache_stats(request)`: Get the response cache hit/miss counters (GET /pharmacies/cache-stats/).
 
     **Authentication:**
 
-    This viewset requires basic authentication for all actions.
+    This viewset requires token authentication (`Authorization: Token <key>`, see `POST /api/token/`)
+    or, unless `PHARMACY_BASIC_AUTHENTICATION` is disabled, basic authentication for all actions.
 
     **Permissions:**
 
     * `IsAuthenticated`: All actions require authenticated users.
+
+    **Throttling:**
+
+    * `PharmacyRateThrottle`: Every user is limited to `PHARMACY_THROTTLE_READ_RATE` reads and
+      `PHARMACY_THROTTLE_WRITE_RATE` writes (429 with `Retry-After` beyond).
+    * At most `PHARMACY_MAX_CONCURRENT_READS` reads and `PHARMACY_MAX_CONCURRENT_WRITES` writes are
+      served at once by a process; excess requests are shed (503 with `Retry-After`).
     """
 
     queryset = Pharmacy.objects.order_by("id")
     serializer_class = PharmacySerializer
-    authentication_classes = [BasicAuthentication]
+    read_serializer_class = PharmacyFastSerializer
+    authentication_classes = [BasicAuthentication, CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [PharmacyRateThrottle]
+    cursor_pagination_class = PharmacyCursorPagination
+    count_provider_class = PharmacyCountProvider
+    repository_class = PharmacyRepository
+    response_cache_class = PharmacyResponseCache
+    read_actions = ("list", "retrieve", "export", "lookup")
+    # Fields always read with the requested `fields`, to compute the ETag and Last-Modified of a pharmacy.
+    validator_fields = ("version", "updated_at")
+
+    def get_authenticators(self):
+        """Instantiate the authenticators, leaving basic authentication out when it is disabled.
+
+        Returns:
+        - list: The authenticators of the viewset.
+        """
+
+        authenticators = super().get_authenticators()
+        if not settings.PHARMACY_BASIC_AUTHENTICATION:
+            authenticators = [
+                authenticator for authenticator in authenticators if not isinstance(authenticator, BasicAuthentication)
+            ]
+        return authenticators
+
+    def initial(self, request, *args, **kwargs):
+        """Authenticate, check permissions and throttle the request, then admit it under the concurrency limits.
+
+        Raises:
+        - Overloaded: If the process already serves as many requests of the scope (read or write) as allowed.
+        """
+
+        super().initial(request, *args, **kwargs)
+        self.admission = admit(get_scope(request, self))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Release the concurrency slot of the request, if it was admitted under a limit.
+
+        The slot of a streaming response (the export) is held until its content is sent.
+        """
+
+        admission = getattr(self, "admission", None)
+        if admission is not None:
+            self.admission = None
+            if response.streaming:
+                response.streaming_content = AdmittedStream(response.streaming_content, admission)
+            else:
+                admission.release()
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    @property
+    def paginator(self):
+        """The paginator instance for the current request, or `None`."""
+
+        if not hasattr(self, "_paginator"):
+            pagination_class = self.get_pagination_class()
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
+
+    def get_pagination_class(self):
+        """Get the pagination class for the current request.
+
+        Cursor pagination is opt-in: it is used when the client asks for it with
+        `?pagination=cursor` or follows a cursor link (`?cursor=...`); otherwise
+        the default page-number pagination is used.
+
+        Returns:
+        - type: The pagination class to use, or `None` to disable pagination.
+        """
+
+        params = self.request.query_params
+        cursor_class = self.cursor_pagination_class
+        if cursor_class is not None and (
+            params.get("pagination") == "cursor" or cursor_class.cursor_query_param in params
+        ):
+            return cursor_class
+        return self.pagination_class
 
     def get_queryset(self):
         """Get the queryset of Pharmacy objects.
 
+        Read actions (list, retrieve, export, lookup) go through the native PyMongo repository unless the
+        `PHARMACY_READ_BACKEND` setting is `"orm"`; write actions always use the ORM. Searches
+        (`q`, `name__startswith`) always go through the repository, as djongo cannot translate them
+        into index-backed queries. The `fields` of read actions are pushed down to the query as a
+        projection (or `.only()`), so the other fields are neither read nor sent by MongoDB.
+
         Returns:
-        - QuerySet: The queryset of Pharmacy objects and filter by name if it exists.
+        - QuerySet | PharmacyDocumentSet: The Pharmacy objects (or documents), filtered by the
+          `name`, `name__startswith` and `q` parameters if they exist.
+
+        Raises:
+        - ValidationError: If both `name` and `name__startswith` are given.
         """
 
+        params = self.request.query_params
+        if params.get("name") and params.get("name__startswith"):
+            raise ValidationError({"name__startswith": [NAME_FILTERS_ERROR]})
+        fields = self.get_requested_fields()
+        sources = [*self.read_serializer_class.get_sources(fields), *self.validator_fields] if fields else None
+        if self.uses_native_reads():
+            return self.get_read_repository().find(
+                name=params.get("name"),
+                name_prefix=params.get("name__startswith"),
+                search=params.get("q"),
+                fields=sources,
+            )
+
         queryset = super(__class__, self).get_queryset()
-        name = self.request.query_params.get("name")
+        name = params.get("name")
         if name:
             queryset = queryset.filter(name=name)
+        if sources:
+            queryset = queryset.only(*sources)
         return queryset
 
+    def get_requested_fields(self):
+        """Get the fields requested by the `fields` parameter of a read action (e.g. `?fields=id,name`).
+
+        Returns:
+        - list: The names of the fields to render, or `None` for all the fields.
+
+        Raises:
+        - ValidationError: If a requested field does not exist.
+        """
+
+        if self.action not in self.read_actions:
+            return None
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = self.read_serializer_class.parse_fields(self.request.query_params.get("fields"))
+        return self._requested_fields
+
+    def get_read_repository(self):
+        """Get the repository of the list, retrieve, export and lookup reads, on the `PHARMACY_READ_PREFERENCE` members.
+
+        Returns:
+        - PharmacyRepository: The repository.
+        """
+
+        model = self.repository_class.model
+        return self.repository_class(get_collection(model, read_preference=settings.PHARMACY_READ_PREFERENCE))
+
+    def uses_native_reads(self):
+        """Check whether the current action reads through the native PyMongo repository.
+
+        Returns:
+        - bool: `True` for read actions when `PHARMACY_READ_BACKEND` is `"mongo"` or the request is a search.
+        """
+
+        if self.action not in self.read_actions:
+            return False
+        return settings.PHARMACY_READ_BACKEND == "mongo" or self.is_search()
+
+    def is_search(self):
+        """Check whether the request searches pharmacies (`q` or `name__startswith`)."""
+
+        params = self.request.query_params
+        return bool(params.get("q") or params.get("name__startswith"))
+
+    def get_count_provider(self):
+        """Get the provider of the total counts reported by paginated list responses.
+
+        Returns:
+        - PharmacyCountProvider: The count provider of this viewset.
+        """
+
+        return self.count_provider_class()
+
+    def get_response_cache(self):
+        """Get the cache of serialized responses.
+
+        Returns:
+        - PharmacyResponseCache: The response cache, or `None` if `PHARMACY_RESPONSE_CACHE` is disabled.
+        """
+
+        if self.response_cache_class is None or not settings.PHARMACY_RESPONSE_CACHE:
+            return None
+        return self.response_cache_class()
+
+    def caches_reads(self):
+        """Check whether the reads of the current action may populate the response cache.
+
+        Reads from secondaries can lag behind a write that just invalidated the cache, and
+        would keep stale responses there until they expire, so only primary reads are cached.
+
+        Returns:
+        - bool: `True` unless the action reads through the native repository from non-primary members.
+        """
+
+        return not self.uses_native_reads() or is_primary_read_preference(settings.PHARMACY_READ_PREFERENCE)
+
+    def get_list_cache_params(self):
+        """Get the parameters identifying the requested list page in the response cache.
+
+        Only page-number pages are cached; the host is part of the key because the
+        `next`/`previous` links of a page are absolute URLs.
+
+        Returns:
+        - dict: The cache parameters of the page, or `None` if the page is not cacheable.
+        """
+
+        paginator = self.paginator
+        if not isinstance(paginator, PageNumberPagination):
+            return None
+        page_number = self.request.query_params.get(paginator.page_query_param, "1")
+        if not page_number.isdigit():
+            return None
+        return {
+            "base_url": self.request.build_absolute_uri(self.request.path),
+            "name": self.request.query_params.get("name", ""),
+            "name_prefix": self.request.query_params.get("name__startswith", ""),
+            "search": self.request.query_params.get("q", ""),
+            "fields": ",".join(self.get_requested_fields() or ()),
+            "page": int(page_number),
+            "page_size": paginator.get_page_size(self.request),
+        }
+
+    def get_read_serializer(self, *args, **kwargs):
+        """Get the serializer rendering the responses of the list and retrieve actions.
+
+        It renders the same output as `serializer_class` without building DRF fields per instance,
+        restricted to the requested `fields`.
+
+        Returns:
+        - PharmacyFastSerializer: The read serializer.
+        """
+
+        kwargs.setdefault("fields", self.get_requested_fields())
+        return self.read_serializer_class(*args, **kwargs)
+
     def get_obj_by_pk(self, pk=None):
         """Retrieve a specific pharmacy by primary key.
 
@@ -67,12 +332,59 @@ class PharmacyViewSet(ModelViewSet):
 
         return pharmacy_object
 
+    def get_pk(self, pk):
+        """Convert the primary key of the URL of a write.
+
+        Returns:
+        - int: The primary key.
+
+        Raises:
+        - NotFound: If the primary key is not an integer.
+        """
+
+        pk = self.get_cache_pk(pk)
+        if pk is None:
+            raise NotFound
+        return pk
+
+    def check_version(self, repository, pk, versions):
+        """Check a pharmacy exists and has one of the `If-Match` versions, after a write did not apply.
+
+        Writes match the pharmacy and its version in their own command, so this extra
+        lookup only runs when they fail, to report why.
+
+        Parameters:
+        - repository (PharmacyRepository): The repository of the write.
+        - pk (int): The primary key of the pharmacy.
+        - versions (set): The `If-Match` versions, or `None` if any version is accepted.
+
+        Raises:
+        - NotFound: If the pharmacy does not exist.
+        - PreconditionFailed: If the pharmacy has none of the versions.
+        """
+
+        current = repository.get_version(pk)
+        if current is None:
+            raise NotFound
+        if versions is not None and current["version"] not in versions:
+            raise PreconditionFailed()
+
     def list(self, request):
         """List all pharmacies or filter by name.
 
         **Request Parameters:**
 
         - `name` (optional, string): Filter pharmacies by name (exact match).
+        - `name__startswith` (optional, string): Filter pharmacies whose name starts with a prefix,
+          ignoring case; results are ordered by name. It cannot be combined with `name`.
+        - `q` (optional, string): Search words in the name and address (MongoDB text search: stemmed
+          words, `"exact phrases"`, `-excluded` words); results are ordered by relevance.
+        - `page` (optional, integer): Page number when using page-number pagination (default).
+        - `fields` (optional, string): Comma-separated fields to return (e.g. `id,name`), all by default;
+          only these fields are read from the database.
+        - `page_size` (optional, integer): Number of results per page, up to 100 (default 10).
+        - `pagination` (optional, string): Set to `cursor` to use cursor pagination instead of page numbers.
+        - `cursor` (optional, string): Opaque cursor taken from the `next`/`previous` links of a cursor page.
 
         **Response:**
 
@@ -80,6 +392,7 @@ class PharmacyViewSet(ModelViewSet):
             ```json
             {
             "count": 17,
+            "count_exact": false,
             "next": "http://127.0.0.1:8000/pharmacies/?page=2",
             "previous": null,
             "results": [
@@ -88,24 +401,53 @@ class PharmacyViewSet(ModelViewSet):
                             "name": "Pharmacy 1",
                             "address": "123 Main St",
                             "phone_number": "123-456-7890",
-                            "license_number": "ABC123"
+                            "license_number": "ABC123",
+                            "location": null,
+                            "updated_at": "2024-01-15T12:30:00+02:00",
+                            "version": 3
                         },
                         ...
                     ]
             }
             ```
-        - **400 BAD_REQUEST:** Invalid request parameters.
+          `count` is estimated from the collection metadata for unfiltered lists (`count_exact` is `false`)
+          and exact, cached for a short time, when filtering or searching (`count_exact` is `true`).
+        - **200 OK** (`?pagination=cursor`): Same results without the `count`; deep pages cost the same as the first.
+            ```json
+            {
+            "next": "http://127.0.0.1:8000/pharmacies/?cursor=cD0xMA%3D%3D&pagination=cursor",
+            "previous": null,
+            "results": [...]
+            }
+            ```
+          Responses carry a weak `ETag` of their content; send it back in `If-None-Match` to get a
+          **304 NOT MODIFIED** without a body while the page is unchanged.
+        - **400 BAD_REQUEST:** Invalid request parameters (e.g. both `name` and `name__startswith`).
+        - **404 NOT_FOUND:** Invalid page number or cursor.
         """
 
+        response_cache = self.get_response_cache()
+        cache_params = self.get_list_cache_params() if response_cache is not None else None
+        if cache_params is not None:
+            cached = response_cache.get_list(**cache_params)
+            if cached is not None:
+                data, etag = cached
+                return evaluate_preconditions(request, etag) or set_validators(Response(data), etag)
+
         queryset = self.get_queryset()
 
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            serializer = self.get_read_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_read_serializer(queryset, many=True)
+            response = Response(serializer.data)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        etag = get_list_etag(response.data)
+        if cache_params is not None and self.caches_reads():
+            response_cache.set_list(response.data, etag=etag, **cache_params)
+        return evaluate_preconditions(request, etag) or set_validators(response, etag)
 
     def create(self, request):
         """Create a new pharmacy.
@@ -130,16 +472,24 @@ class PharmacyViewSet(ModelViewSet):
                 "name": "New Pharmacy",
                 "address": "555 Elm St",
                 "phone_number": "555-123-4567",
-                "license_number": "XYZ987"
+                "license_number": "XYZ987",
+                "location": null,
+                "updated_at": "2024-01-15T12:30:00+02:00",
+                "version": 1
             }
             ```
+          With the `ETag` and `Last-Modified` headers of the new pharmacy.
         - **400 BAD_REQUEST:** Invalid serializer data.
         """
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        self.get_count_provider().adjust(serializer.instance.name, 1)
+        self.invalidate_response_cache()
+        return set_validators(
+            Response(serializer.data, status=status.HTTP_201_CREATED), *get_validators(serializer.instance)
+        )
 
     def retrieve(self, request, pk=None):
         """Retrieve a specific pharmacy by primary key.
@@ -148,31 +498,85 @@ class PharmacyViewSet(ModelViewSet):
 
         - `pk` (integer): Primary key of the pharmacy to retrieve.
 
+        **Request Parameters:**
+
+        - `fields` (optional, string): Comma-separated fields to return (e.g. `id,name`), all by default.
+
+        **Request Headers:**
+
+        - `If-None-Match` (optional): The `ETag` of a previous response.
+        - `If-Modified-Since` (optional): The `Last-Modified` date of a previous response.
+
         **Response:**
 
-        - **200 OK:**
+        - **200 OK:** With the `ETag` (`"<pk>.<version>"`) and `Last-Modified` headers of the pharmacy.
             ```json
             {
                 "id": 1,
                 "name": "Pharmacy 1",
                 "address": "123 Main St",
                 "phone_number": "123-456-7890",
-                "license_number": "ABC123"
+                "license_number": "ABC123",
+                "location": null,
+                "updated_at": "2024-01-15T12:30:00+02:00",
+                "version": 3
             }
             ```
+        - **304 NOT MODIFIED:** The pharmacy did not change since the `If-None-Match`/`If-Modified-Since` headers;
+          answered from its version alone, without reading the document.
+        - **400 BAD_REQUEST:** Unknown fields.
         - **404 NOT_FOUND:** Pharmacy not found.
         """
 
-        serializer = self.get_serializer(self.get_obj_by_pk(pk))
-        return Response(serializer.data)
-
-    def update(self, request, pk=None):
+        fields = self.get_requested_fields()
+        # Cached details hold every field; sparse details are cheap to read with their projection.
+        response_cache = self.get_response_cache() if not fields else None
+        cache_pk = self.get_cache_pk(pk) if response_cache is not None else None
+        if cache_pk is not None:
+            cached = response_cache.get_detail(cache_pk)
+            if cached is not None:
+                body, etag, last_modified = cached
+                return evaluate_preconditions(request, etag, last_modified) or set_validators(
+                    Response(body), etag, last_modified
+                )
+
+        lookup_pk = self.get_cache_pk(pk)
+        if lookup_pk is not None and self.is_conditional_request():
+            # Answer unchanged pharmacies from their version alone, without reading or serializing them. The
+            # version is read from the primary, as a lagging secondary would answer 304 for a changed pharmacy.
+            current = self.repository_class().get_version(lookup_pk)
+            if current is not None:
+                not_modified = evaluate_preconditions(request, *get_validators(current, fields))
+                if not_modified is not None:
+                    return not_modified
+
+        pharmacy = self.get_obj_by_pk(pk)
+        serializer = self.get_read_serializer(pharmacy)
+        etag, last_modified = get_validators(pharmacy, fields)
+        if cache_pk is not None and self.caches_reads():
+            response_cache.set_detail(cache_pk, serializer.data, etag, last_modified)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+    def is_conditional_request(self):
+        """Check whether the request has an `If-None-Match` or `If-Modified-Since` header."""
+
+        return "HTTP_IF_NONE_MATCH" in self.request.META or "HTTP_IF_MODIFIED_SINCE" in self.request.META
+
+    def update(self, request, pk=None, **kwargs):
         """Update an existing pharmacy.
 
+        PUT and PATCH both update only the fields in the body, with a single atomic `$set`
+        command (also checking the `If-Match` version), without reading the pharmacy first.
+
         **Path Parameters:**
 
         - `pk` (integer): Primary key of the pharmacy to update.
 
+        **Request Headers:**
+
+        - `If-Match` (optional): The `ETag` of the pharmacy version the update is based on; the update only
+          applies if the pharmacy still has that version.
+
         **Request Body:**
 
         ```json
@@ -191,21 +595,49 @@ class PharmacyViewSet(ModelViewSet):
                 "name": "Updated Pharmacy Name",
                 "address": "123 Main St",
                 "phone_number": "987-654-3210",
-                "license_number": "ABC123"
+                "license_number": "ABC123",
+                "location": null,
+                "updated_at": "2024-01-15T12:45:00+02:00",
+                "version": 4
             }
             ```
+          With the `ETag` and `Last-Modified` headers of the new version.
         - **400 BAD_REQUEST:** Invalid serializer data.
         - **404 NOT_FOUND:** Pharmacy not found.
+        - **412 PRECONDITION_FAILED:** The pharmacy no longer has the `If-Match` version.
         """
 
-        serializer = self.get_serializer(self.get_obj_by_pk(pk), data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data)
+        pk = self.get_pk(pk)
+        repository = self.repository_class()
+        versions = get_if_match_versions(request, pk)
+        serializer = self.get_serializer(data=request.data, partial=True)
+        if not serializer.is_valid():
+            # A missing pharmacy, then a failed If-Match, are reported before invalid data.
+            self.check_version(repository, pk, versions)
+            raise ValidationError(serializer.errors)
+
+        try:
+            previous, document = repository.update_one(pk, serializer.validated_data, expected_versions=versions)
+        except DuplicateKeyError:
+            message = PharmacySerializer.default_error_messages["duplicate_license_number"]
+            raise ValidationError({"license_number": [message]}, code="unique")
+        if document is None:
+            self.check_version(repository, pk, versions)
+            # The pharmacy changed (or was deleted) since the update missed it.
+            raise PreconditionFailed() if versions is not None else NotFound()
+
+        if document["name"] != previous["name"]:
+            count_provider = self.get_count_provider()
+            count_provider.adjust(previous["name"], -1)
+            count_provider.adjust(document["name"], 1)
+        self.invalidate_response_cache(pk)
+        return set_validators(Response(self.get_read_serializer(document).data), *get_validators(document))
 
     def destroy(self, request, pk=None):
         """Delete a pharmacy.
 
+        The pharmacy is deleted with a single command, without reading it first.
+
         **Path Parameters:**
 
         - `pk` (integer): Primary key of the pharmacy to delete.
@@ -216,5 +648,364 @@ class PharmacyViewSet(ModelViewSet):
         - **404 NOT_FOUND:** Pharmacy not found.
         """
 
-        self.get_obj_by_pk(pk).delete()
+        pk = self.get_pk(pk)
+        document = self.repository_class().delete_one(pk)
+        if document is None:
+            raise NotFound()
+
+        self.get_count_provider().adjust(document["name"], -1)
+        self.invalidate_response_cache(pk)
         return Response({"message": "Pharmacy object deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        parser_classes=[JSONParser, NDJSONParser],
+        serializer_class=PharmacyBulkSerializer,
+    )
+    def bulk(self, request):
+        """Create, or upsert by license number, many pharmacies at once.
+
+        Every item is validated on its own, so invalid items are reported without
+        aborting the others, and valid items are written in batches of
+        `PHARMACY_BULK_BATCH_SIZE` with a single database command per batch.
+
+        **Request Parameters:**
+
+        - `upsert` (optional, boolean): Update the pharmacies whose `license_number` already exists instead of
+          failing them.
+
+        **Request Body:**
+
+        A JSON array (`application/json`) or one JSON object per line (`application/x-ndjson`) of up to
+        `PHARMACY_BULK_MAX_ITEMS` pharmacies:
+
+        ```json
+        [
+            {
+                "name": "New Pharmacy",
+                "address": "555 Elm St",
+                "phone_number": "555-123-4567",
+                "license_number": "XYZ987"
+            },
+            ...
+        ]
+        ```
+
+        **Response:**
+
+        - **200 OK:**
+            ```json
+            {
+                "created": 1,
+                "updated": 0,
+                "failed": 1,
+                "results": [
+                    {"index": 0, "status": "created", "id": 18},
+                    {"index": 1, "status": "failed", "errors": {"address": ["This field is required."]}}
+                ]
+            }
+            ```
+        - **400 BAD_REQUEST:** The body is not a list or has too many items.
+        """
+
+        serializer = self.get_serializer(data=request.data, many=True, max_length=settings.PHARMACY_BULK_MAX_ITEMS)
+        serializer.is_valid(raise_exception=True)
+        upsert = request.query_params.get("upsert", "").lower() in ("1", "true")
+        repository = self.repository_class()
+        write = repository.upsert_many if upsert else repository.insert_many
+
+        results = [
+            {"index": index, "status": "failed", "errors": errors} if errors else None
+            for index, errors in enumerate(serializer.item_errors)
+        ]
+        valid_indexes = [index for index, errors in enumerate(serializer.item_errors) if not errors]
+        batch_size = settings.PHARMACY_BULK_BATCH_SIZE
+        count_provider = self.get_count_provider()
+        updated_pks = []
+        for start in range(0, len(valid_indexes), batch_size):
+            batch = valid_indexes[start : start + batch_size]
+            batch_results = write([serializer.validated_data[index] for index in batch])
+            for index, result in zip(batch, batch_results):
+                name = serializer.validated_data[index]["name"]
+                if result["status"] == "failed":
+                    results[index] = {
+                        "index": index,
+                        "status": "failed",
+                        "errors": self.get_write_errors(result["error"]),
+                    }
+                    continue
+
+                results[index] = {"index": index, "status": result["status"], "id": result["id"]}
+                if result["status"] == "updated":
+                    updated_pks.append(result["id"])
+                    if result["previous_name"] != name:
+                        count_provider.adjust(result["previous_name"], -1)
+                        count_provider.adjust(name, 1)
+                else:
+                    count_provider.adjust(name, 1)
+
+        self.invalidate_response_cache(*updated_pks)
+        summary = {status_name: 0 for status_name in ("created", "updated", "failed")}
+        for result in results:
+            summary[result["status"]] += 1
+        return Response(dict(summary, results=results))
+
+    def get_write_errors(self, write_error):
+        """Convert a MongoDB write error of a bulk item into serializer-like errors.
+
+        Parameters:
+        - write_error (dict): The write error reported by MongoDB.
+
+        Returns:
+        - dict: The errors of the item by field.
+        """
+
+        if write_error["code"] == DUPLICATE_KEY_ERROR_CODE:
+            message = PharmacySerializer.default_error_messages["duplicate_license_number"]
+            return {"license_number": [ErrorDetail(message, code="unique")]}
+        return {api_settings.NON_FIELD_ERRORS_KEY: [ErrorDetail(write_error["errmsg"], code="error")]}
+
+    @action(detail=False, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """Export all pharmacies, or the pharmacies with a name, as a stream.
+
+        The rows are read through a server-side cursor in batches of `PHARMACY_EXPORT_BATCH_SIZE`
+        and streamed as they are read, so memory stays flat whatever the size of the collection.
+
+        **Request Parameters:**
+
+        - `format` (optional, string): `ndjson` (default) or `csv`; an `Accept: text/csv` header works as well.
+        - `name` (optional, string): Filter pharmacies by name (exact match).
+        - `name__startswith` (optional, string): Filter pharmacies whose name starts with a prefix,
+          ignoring case; results are ordered by name. It cannot be combined with `name`.
+        - `q` (optional, string): Search words in the name and address (MongoDB text search: stemmed
+          words, `"exact phrases"`, `-excluded` words); results are ordered by relevance.
+        - `fields` (optional, string): Comma-separated fields (columns) to export, all by default.
+
+        **Response:**
+
+        - **200 OK:** An attachment with a JSON object per line (`ndjson`) or a header and a row per pharmacy (`csv`):
+            ```
+            {"id": 1, "name": "Pharmacy 1", "address": "123 Main St", "phone_number": "123-456-7890", ...}
+            {"id": 2, "name": "Pharmacy 2", "address": "456 Oak St", "phone_number": "123-456-7891", ...}
+            ```
+        - **400 BAD_REQUEST:** Unknown fields, or both `name` and `name__startswith`.
+        - **404 NOT_FOUND:** Unsupported format.
+        """
+
+        fields = self.get_requested_fields() or list(self.get_serializer().fields)
+        rows = self.get_queryset().values(*fields).iterator(chunk_size=settings.PHARMACY_EXPORT_BATCH_SIZE)
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.iter_render(rows, fields), content_type=f"{renderer.media_type}; charset={renderer.charset}"
+        )
+        response["Content-Disposition"] = f'attachment; filename="pharmacies.{renderer.format}"'
+        return response
+
+    @action(detail=False, methods=["get"])
+    def nearby(self, request):
+        """Get the pharmacies closest to a point, nearest first.
+
+        The search runs a `$geoNear` aggregation on the `2dsphere` index of `location`;
+        pharmacies without a location (see the `pharmacy_geocode` command) are not found.
+
+        **Request Parameters:**
+
+        - `lat` (number): Latitude of the point, in degrees.
+        - `lng` (number): Longitude of the point, in degrees.
+        - `radius` (optional, number): Maximum distance from the point, in meters (default 5000, up to 100000).
+        - `limit` (optional, integer): Maximum number of pharmacies (default 10, up to 100).
+
+        **Response:**
+
+        - **200 OK:** The pharmacies with their `distance` from the point, in meters:
+            ```json
+            {
+            "count": 1,
+            "results": [
+                        {
+                            "id": 1,
+                            "name": "Pharmacy 1",
+                            "address": "123 Main St",
+                            "phone_number": "123-456-7890",
+                            "license_number": "ABC123",
+                            "location": {"type": "Point", "coordinates": [31.2357, 30.0444]},
+                            "distance": 412.7
+                        }
+                    ]
+            }
+            ```
+        - **400 BAD_REQUEST:** Missing or invalid request parameters.
+        """
+
+        params = PharmacyNearbyQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        documents = self.repository_class().near(
+            params.validated_data["lng"],
+            params.validated_data["lat"],
+            max_distance=params.validated_data["radius"],
+            limit=params.validated_data["limit"],
+        )
+        results = [
+            dict(representation, distance=round(document["distance"], 1))
+            for document, representation in zip(documents, self.get_read_serializer(documents, many=True).data)
+        ]
+        return Response({"count": len(results), "results": results})
+
+    @action(detail=False, methods=["post"], serializer_class=PharmacyLookupSerializer)
+    def lookup(self, request):
+        """Get many pharmacies by id, in the order of the ids, with a single database query.
+
+        The pharmacies are read with one `$in` query on the `id` index, instead of a
+        request per pharmacy.
+
+        **Request Parameters:**
+
+        - `fields` (optional, string): Comma-separated fields to return (e.g. `id,name`), all by default.
+
+        **Request Body:**
+
+        ```json
+        {"ids": [1, 2, 3]}
+        ```
+
+        Up to `PHARMACY_LOOKUP_MAX_IDS` ids (200 by default).
+
+        **Response:**
+
+        - **200 OK:** A result per requested id, in the requested order, with `found` false and a null
+          `pharmacy` for the ids of missing pharmacies:
+            ```json
+            {
+                "results": [
+                    {"id": 1, "found": true, "pharmacy": {"id": 1, "name": "Pharmacy 1", ...}},
+                    {"id": 3, "found": false, "pharmacy": null}
+                ],
+                "not_found": [3]
+            }
+            ```
+        - **400 BAD_REQUEST:** The ids are missing, invalid or too many.
+        """
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        fields = self.get_requested_fields()
+        sources = self.read_serializer_class.get_sources(fields) if fields else None
+        documents = self.get_read_repository().find_many(ids, fields=sources)
+        found = list(documents.values())
+        representations = dict(zip(documents, self.get_read_serializer(found, many=True).data))
+        results = [{"id": pk, "found": pk in documents, "pharmacy": representations.get(pk)} for pk in ids]
+        return Response({"results": results, "not_found": [pk for pk in ids if pk not in documents]})
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """Get the pharmacies created, updated or deleted since a change token, oldest change first.
+
+        Partners sync incrementally: the first request (without `since`) reads every pharmacy, and every
+        following request passes the `next` token of the previous one to read only what changed since.
+        Changes are read by range on the `updated_at` index and on the tombstones of deleted pharmacies,
+        so the cost of a sync depends on the number of changes, not on the size of the collection.
+
+        A pharmacy appears once, at its latest change. The feed lags `PHARMACY_CHANGES_DELAY` seconds
+        behind the current time so writes still in flight are not skipped, and deletions are kept for
+        `PHARMACY_CHANGES_RETENTION_DAYS` days.
+
+        **Request Parameters:**
+
+        - `since` (optional, string): The `next` token of a previous response.
+        - `limit` (optional, integer): Maximum number of changes (default 100, up to 1000).
+
+        **Response:**
+
+        - **200 OK:** The changes, with the token to pass as `since` next and whether more changes follow it:
+            ```json
+            {
+                "results": [
+                    {
+                        "id": 1,
+                        "operation": "upsert",
+                        "changed_at": "2024-01-15T12:30:00+02:00",
+                        "pharmacy": {"id": 1, "name": "Pharmacy 1", "address": "123 Main St", ...}
+                    },
+                    {"id": 2, "operation": "delete", "changed_at": "2024-01-15T12:31:00+02:00", "pharmacy": null}
+                ],
+                "next": "MTcwNTMxNTA2MDAwMC4y",
+                "has_more": false
+            }
+            ```
+        - **400 BAD_REQUEST:** Invalid request parameters.
+        - **410 GONE:** The `since` token is older than the retained deletions; sync again from the start.
+        """
+
+        params = PharmacyChangesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data.get("since")
+        limit = params.validated_data["limit"]
+        # Positions are compared with the naive UTC times PyMongo reads.
+        now = bson_now().replace(tzinfo=None)
+        if since is not None and since[0] < self.repository_class.get_tombstone_retention_start(now):
+            raise ChangesExpired()
+
+        until = now - timedelta(seconds=settings.PHARMACY_CHANGES_DELAY)
+        changes = self.repository_class().changes(since=since, until=until, limit=limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        representations = iter(
+            self.get_read_serializer([document for _, _, document in changes if document is not None], many=True).data
+        )
+        changed_at = UTCDateTimeField()
+        results = [
+            {
+                "id": pk,
+                "operation": "upsert" if document is not None else "delete",
+                "changed_at": changed_at.to_representation(time),
+                "pharmacy": next(representations) if document is not None else None,
+            }
+            for time, pk, document in changes
+        ]
+        # Without changes, the position moves up to the end of the read range.
+        position = changes[-1][:2] if changes else since or (until, 0)
+        return Response({"results": results, "next": encode_change_token(*position), "has_more": has_more})
+
+    @action(detail=False, methods=["get"], url_path="cache-stats")
+    def cache_stats(self, request):
+        """Get the response cache hit/miss counters of the serving process.
+
+        **Response:**
+
+        - **200 OK:**
+            ```json
+            {
+                "detail": {"hits": 120, "misses": 8},
+                "list": {"hits": 45, "misses": 12}
+            }
+            ```
+        """
+
+        return Response(self.response_cache_class.get_stats())
+
+    def get_cache_pk(self, pk):
+        """Normalize a primary key from the URL for the response cache.
+
+        Returns:
+        - int: The primary key, or `None` if it is not a valid integer.
+        """
+
+        try:
+            return int(pk)
+        except (TypeError, ValueError):
+            return None
+
+    def invalidate_response_cache(self, *pks):
+        """Invalidate the cached responses affected by a write.
+
+        Parameters:
+        - *pks (int): The primary keys of the updated or deleted pharmacies, if any.
+        """
+
+        response_cache = self.get_response_cache()
+        if response_cache is not None:
+            cache_pks = [self.get_cache_pk(pk) for pk in pks]
+            response_cache.invalidate(*[pk for pk in cache_pks if pk is not None])